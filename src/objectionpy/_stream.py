@@ -0,0 +1,208 @@
+"""Incremental reading and writing of .objection files, without holding the whole file in memory."""
+
+from binascii import a2b_base64, b2a_base64
+from codecs import BOM_UTF8, getincrementaldecoder
+from io import TextIOBase
+from json import JSONDecoder, JSONDecodeError
+from typing import IO, Any, Iterator, Optional
+
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\r\n"
+
+
+def _stripBOM(chunk: Any) -> Any:
+    """Remove a UTF-8 byte order mark from the start of a str or bytes chunk."""
+    if isinstance(chunk, str):
+        return chunk[1:] if chunk[:1] == "\ufeff" else chunk
+    return chunk[len(BOM_UTF8):] if chunk[:len(BOM_UTF8)] == BOM_UTF8 else chunk
+
+
+def _isBase64(chunk: Any) -> Optional[bool]:
+    """Whether contents starting with a str or bytes chunk are base64-encoded rather than raw JSON, or None if the chunk is only whitespace."""
+    stripped = chunk.lstrip()
+    if not stripped:
+        return None
+    return stripped[:1] not in ("{", b"{")
+
+
+def _textChunks(fp: IO, chunkSize: int = CHUNK_SIZE) -> Iterator[str]:
+    """Read JSON text from a file object of base64-encoded or raw JSON, opened in text or binary mode."""
+    utf8 = getincrementaldecoder("utf-8")()
+    isBase64 = None
+    pending = b""
+    chunk = _stripBOM(fp.read(chunkSize))
+    while True:
+        if isBase64 is None:
+            isBase64 = _isBase64(chunk)
+            if isBase64 is None and not chunk:
+                return
+
+        if isBase64 is None:
+            pass  # Leading whitespace
+        elif not isBase64:
+            if not chunk:
+                break
+            yield chunk if isinstance(chunk, str) else utf8.decode(chunk)
+        else:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("ascii")
+            pending += chunk.translate(None, b" \t\r\n")
+            if chunk:
+                usable = len(pending) - len(pending) % 4
+            else:
+                pending += b"=" * (-len(pending) % 4)
+                usable = len(pending)
+            if usable:
+                yield utf8.decode(a2b_base64(pending[:usable]))
+                pending = pending[usable:]
+            if not chunk:
+                break
+        chunk = fp.read(chunkSize)
+
+    tail = utf8.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+class JSONReader:
+    """
+    Pull parser over a stream of JSON text chunks.
+
+    Objects and arrays can be walked one member at a time with items() and elements(), while complete values are parsed with value().
+    """
+
+    def __init__(self, chunks: Iterator[str]) -> None:
+        self._chunks = chunks
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        keys: dict[str, str] = {}
+        # Share key strings across values, like a single json.loads call would
+        self._decoder = JSONDecoder(
+            object_pairs_hook=lambda pairs: {keys.setdefault(key, key): value for key, value in pairs}
+        )
+
+    @classmethod
+    def fromFile(cls, fp: IO, chunkSize: int = CHUNK_SIZE) -> "JSONReader":
+        return cls(_textChunks(fp, chunkSize))
+
+    def _fill(self, minimum: int) -> bool:
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        parts = [self._buffer]
+        added = 0
+        while added < minimum:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                break
+            parts.append(chunk)
+            added += len(chunk)
+        self._buffer = "".join(parts)
+        return added > 0
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill(1):
+                raise JSONDecodeError("Unexpected end of data", self._buffer, self._pos)
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise JSONDecodeError("Expecting '" + char + "'", self._buffer, self._pos)
+        self._pos += 1
+
+    def _next(self, closing: str) -> bool:
+        char = self._peek()
+        self._pos += 1
+        if char == closing:
+            return False
+        if char != ",":
+            raise JSONDecodeError("Expecting ',' delimiter", self._buffer, self._pos - 1)
+        return True
+
+    def value(self) -> Any:
+        """Parse the next complete value."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number ending at the end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill(len(self._buffer) - self._pos)  # Doubles the pending data on each retry
+
+    def items(self) -> Iterator[str]:
+        """Iterate the keys of the next object. Each key's value must be read before continuing."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self._peek() != '"':
+                raise JSONDecodeError("Expecting property name", self._buffer, self._pos)
+            key = self.value()
+            self._expect(":")
+            yield key
+            if not self._next("}"):
+                return
+
+    def elements(self) -> Iterator[None]:
+        """Iterate the elements of the next array. Each element must be read before continuing."""
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            if not self._next("]"):
+                return
+
+
+class TextWriter:
+    """
+    Writes JSON text to a file object opened in text or binary mode, base64-encoded unless raw.
+
+    Text is buffered until at least chunkSize characters are pending. close() must be called to write the rest.
+    """
+
+    def __init__(self, fp: IO, raw: bool = False, chunkSize: int = CHUNK_SIZE) -> None:
+        self._fp = fp
+        self._raw = raw
+        self._text = isinstance(fp, TextIOBase)
+        self._chunkSize = chunkSize
+        self._parts: list[str] = []
+        self._pending = 0
+        self._remainder = b""  # Encoded bytes past the last multiple of 3, for base64
+
+    def write(self, text: str):
+        self._parts.append(text)
+        self._pending += len(text)
+        if self._pending >= self._chunkSize:
+            self._flush(False)
+
+    def _flush(self, final: bool):
+        data = "".join(self._parts)
+        self._parts = []
+        self._pending = 0
+        if self._raw:
+            self._fp.write(data if self._text else data.encode("utf-8"))
+            return
+        data = self._remainder + data.encode("utf-8")
+        usable = len(data) if final else len(data) - len(data) % 3
+        self._remainder = data[usable:]
+        encoded = b2a_base64(data[:usable], newline=False)
+        self._fp.write(encoded.decode("ascii") if self._text else encoded)
+
+    def close(self):
+        self._flush(True)
@@ -1,6 +1,8 @@
 """Utility functions used across other files."""
 
-from typing import Any, Iterable, Optional
+from collections import deque
+from typing import Any, Callable, Hashable, Iterable, Optional
+from weakref import ref
 
 
 def _reprFunc(obj, attributes: Iterable) -> str:
@@ -16,7 +18,79 @@ def _maxIndex(list: list) -> int:
     return list.index(max(list))
 
 def _tupleMapGet(list: list[tuple[Any, Any]], firstValue):
+    if isinstance(list, _TupleMap):
+        return list.get(firstValue)
     for tuple in list:
         if tuple[0] == firstValue:
             return tuple[1]
-    raise KeyError(repr(firstValue) + ' is not in tuple map')
+    # The value itself is passed so it's only repr'd if displayed, as asset reprs may request asset data
+    raise KeyError(firstValue)
+
+
+class _TupleMap:
+    """
+    List of (key, value) tuples looked up by key equality like _tupleMapGet, without scanning every tuple.
+
+    Tuples are bucketed by a hint of their key, which must be equal for equal keys. Only keys with the same hint are compared.
+    """
+
+    def __init__(self, hint: Callable[[Any], Hashable]) -> None:
+        self._tuples = deque()
+        self._buckets = {}
+        self._hint = hint
+
+    def append(self, tuple: tuple[Any, Any]):
+        self._tuples.append(tuple)
+        self._buckets.setdefault(self._hint(tuple[0]), deque()).append(tuple)
+
+    def popleft(self) -> tuple[Any, Any]:
+        tuple = self._tuples.popleft()
+        hint = self._hint(tuple[0])
+        bucket = self._buckets[hint]
+        bucket.popleft()  # The oldest tuple is also the oldest of its bucket
+        if not bucket:
+            del self._buckets[hint]
+        return tuple
+
+    def get(self, firstValue):
+        for tuple in self._buckets.get(self._hint(firstValue), ()):
+            if tuple[0] == firstValue:
+                return tuple[1]
+        raise KeyError(firstValue)
+
+    def __contains__(self, firstValue) -> bool:
+        return any(
+            tuple[0] is firstValue or tuple[0] == firstValue
+            for tuple in self._buckets.get(self._hint(firstValue), ())
+        )
+
+    def __iter__(self):
+        return iter(self._tuples)
+
+    def __len__(self) -> int:
+        return len(self._tuples)
+
+    def __getitem__(self, index: int) -> tuple[Any, Any]:
+        return self._tuples[index]
+
+
+class _LiveIdentityMap:
+    """Maps objects to values by identity, for as long as the objects are alive."""
+
+    def __init__(self) -> None:
+        self._entries = {}
+
+    def setdefault(self, key, value):
+        entryId = id(key)
+        if entryId not in self._entries:
+            self._entries[entryId] = (ref(key, lambda _: self._entries.pop(entryId, None)), value)
+        return self._entries[entryId][1]
+
+    def get(self, key):
+        entry = self._entries.get(id(key))
+        if entry is None or entry[0]() is not key:
+            raise KeyError(key)
+        return entry[1]
+
+    def __len__(self) -> int:
+        return len(self._entries)
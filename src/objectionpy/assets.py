@@ -4,15 +4,36 @@ Module for working with objection.lol assets.
 Each asset can be obtained using its id. Also includes the AssetBank class - a container for organizing project assets.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import cache, lru_cache
 import re
 from warnings import warn
-from typing import Optional
+from typing import Iterable, Optional
+from weakref import WeakValueDictionary
 from requests import post, get
 from json import JSONDecodeError
 from . import enums, _utils
 
 
+_offline: ContextVar[bool] = ContextVar('_offline', default=False)
+
+
+@contextmanager
+def offline():
+    """
+    Context manager within which accessing the data of an asset that isn't loaded raises an AssetOfflineError, instead of requesting it.
+
+    Already loaded assets and asset IDs can be accessed as usual.
+    """
+    token = _offline.set(True)
+    try:
+        yield
+    finally:
+        _offline.reset(token)
+
+
 class AssetBank:
     """Container for organizing project assets."""
     chars: dict[str, 'Character']
@@ -86,11 +107,38 @@ class AssetBank:
             targetDict[name] = assetType(id)
 
 
-class _Asset:
+class _AssetMeta(type):
+    """
+    Gives each asset type an identity map, so that creating an asset with an ID already in use returns the existing instance.
+
+    Instances are held weakly. Extra arguments (such as the loaded state of presets) only initialize a new instance. If the ID is already in use, they're applied to the existing instance with `_reinit()` instead.
+    """
+
+    def __init__(cls, *args) -> None:
+        super().__init__(*args)
+        cls._instances = WeakValueDictionary()
+        cls._lazyKeys = frozenset(getattr(cls, '_assetKeys', ()) + ('exists',))
+
+    def __call__(cls, id, *args, **kwargs):
+        try:
+            instance = cls._instances.get(id)
+        except TypeError:  # Unhashable ID
+            return super().__call__(id, *args, **kwargs)
+        if instance is None:
+            instance = super().__call__(id, *args, **kwargs)
+            cls._instances[id] = instance
+        elif args or kwargs:
+            instance._reinit(*args, **kwargs)
+        return instance
+
+
+class _Asset(metaclass=_AssetMeta):
     """
     An objection.lol asset, created by ID.
 
     By default, it simply acts as a representation. If any of the asset data is accessed, though, it will request it using the objection.lol API.
+
+    Assets of the same type and ID share one instance, so the data of each asset is only requested and stored once.
     """
     id: int
     exists: bool = True
@@ -100,17 +148,33 @@ class _Asset:
     def __init__(self, id):
         self.id = id
 
+    def _reinit(self):
+        """Apply the extra constructor arguments given when the asset's ID was already in use."""
+
     def __getattribute__(self, __name: str):
-        if __name != '_assetKeys' and __name in self._assetKeys + ('exists',) and not self._loaded:
+        if __name in type(self)._lazyKeys and not object.__getattribute__(self, '_loaded'):
+            if _offline.get():
+                raise AssetOfflineError(self)
             self._loaded = True
-            assetExists, characterData = type(self)._requestData(self.id)
-            self.exists = assetExists
-            if assetExists:
-                for key, value in characterData.items():
-                    setattr(self, key, value)
+            self._setData(*type(self)._requestData(self.id))
         return object.__getattribute__(self, __name)
 
+    def _setData(self, assetExists: bool, assetData: Optional[dict]):
+        self._loaded = True
+        self.exists = assetExists
+        if assetExists:
+            for key, value in assetData.items():
+                setattr(self, key, value)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
     def __repr__(self) -> str:
+        if not self._loaded and _offline.get():
+            return _utils._reprFunc(self, ('id',))
         if self.exists:
             return _utils._reprFunc(self, self._reprKeys)
         else:
@@ -121,6 +185,13 @@ class _Asset:
         raise NotImplementedError(
             "_requestData must be implemented by " + cls.__name__ + " subclasses")
 
+    @classmethod
+    def _requestDataBatch(cls, ids: list, maxWorkers: int) -> list[tuple[bool, dict]]:
+        if len(ids) == 1:
+            return [cls._requestData(ids[0])]
+        with ThreadPoolExecutor(min(maxWorkers, len(ids))) as executor:
+            return list(executor.map(cls._requestData, ids))
+
 
 class _GetAsset(_Asset):
     _getUrl: str
@@ -134,7 +205,15 @@ class _GetAsset(_Asset):
         request = get(
             url=cls._getUrl + str(id)
         )
-        return True, request.json()
+        try:
+            json = request.json()
+        except JSONDecodeError:
+            json = None
+        if isinstance(json, dict):
+            return True, json
+        else:
+            AssetWarning.warn(id)
+            return False, None
 
     def __init__(self, id):
         super().__init__(id)
@@ -164,6 +243,37 @@ class _PostAsset(_Asset):
             AssetWarning.warn(id)
             return False, None
 
+    @classmethod
+    def _requestDataBatch(cls, ids: list, maxWorkers: int) -> list[tuple[bool, dict]]:
+        if len(ids) == 1:
+            return [cls._requestData(ids[0])]
+        request = post(
+            url=cls._postUrl,
+            json={
+                "ids": ids
+            }
+        )
+        try:
+            json = request.json()
+        except JSONDecodeError:
+            json = []
+        if not isinstance(json, list):
+            json = []
+
+        byId = {item['id']: item for item in json if isinstance(item, dict) and 'id' in item}
+        if len(byId) < len(json) and len(json) == len(ids):
+            # Response items without IDs are matched by position
+            byId = dict(zip(ids, json))
+
+        results = []
+        for id in ids:
+            if id in byId:
+                results.append((True, byId[id]))
+            else:
+                AssetWarning.warn(id)
+                results.append((False, None))
+        return results
+
 
 class Background(_PostAsset):
     _postUrl = 'https://api.objection.lol/assets/background/getbackgrounds'
@@ -196,6 +306,9 @@ class Character(_PostAsset):
         self.bubbles = []
         self.poses = []
         super().__init__(id)
+        self._reinit(_loaded)
+
+    def _reinit(self, _loaded=False):
         if _loaded:
             self._loaded = True
             self.exists = True
@@ -308,6 +421,39 @@ class Sound(_GetAsset):
     _tag = 'bgs'
 
 
+def prefetch(assets: Iterable[_Asset], maxWorkers: int = 8):
+    """
+    Request the data of all given assets that aren't loaded yet, instead of one at a time on first access.
+
+    Assets of each POST type (backgrounds, characters, popups) are requested in a single request, while the others are requested concurrently.
+
+    Args:
+        - `assets : Iterable[_Asset]`
+            - The assets to load. Already loaded assets and assets without an ID are skipped.
+        - `maxWorkers : int`
+            - The maximum number of concurrent requests per asset type.
+    """
+    pending: dict[type, dict] = {}
+    for asset in assets:
+        if asset._loaded or asset.id is None:
+            continue
+        pending.setdefault(type(asset), {}).setdefault(asset.id, []).append(asset)
+
+    for assetType, assetsById in pending.items():
+        ids = list(assetsById.keys())
+        for id, data in zip(ids, assetType._requestDataBatch(ids, maxWorkers)):
+            for asset in assetsById[id]:
+                asset._setData(*data)
+
+
+class AssetOfflineError(Exception):
+    """Raised when the data of an asset that isn't loaded is accessed in offline mode."""
+
+    def __init__(self, asset: _Asset) -> None:
+        super().__init__(type(asset).__name__ + ' ' + str(asset.id) + ' is not loaded and offline mode forbids requesting it')
+        self.asset = asset
+
+
 class AssetWarning(Warning):
     @classmethod
     def warn(cls, id):
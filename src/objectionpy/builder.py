@@ -0,0 +1,243 @@
+"""
+Module for generating large scenes from tabular data, such as chat logs.
+
+A SceneBuilder stores rows of (speaker, pose, text, flags) as columns, and compiles them straight into frame dictionaries without creating Frame objects. Speaker data and pose lookups are resolved once per distinct speaker and pose.
+"""
+
+from contextlib import nullcontext
+from typing import Iterable, Optional, Union
+from . import assets, enums, frames
+from .objection import Options, Scene
+
+_Pose = Union[int, str]
+
+
+class SceneBuilder:
+    """
+    Builder of scenes of single-character frames, given as rows or columns.
+
+    Each row is a frame of:
+        - `speaker : Optional[assets.Character]`
+            - The displayed character. None displays no character, and ignores the pose and the FLIP flag.
+        - `pose : int | str`
+            - The pose's ID, or a substring to look it up by as in FrameCharacter.poseSubstr.
+        - `text : str`
+            - The displayed text.
+        - `flags : FrameFlag`
+            - The frame's boolean attributes.
+
+    Compiling a builder gives the same result as compiling the scene `toScene()` returns.
+
+    Attributes:
+        - `options : Options`
+            - Default objection options.
+        - `aliases : dict[str, str]`
+            - Dictionary of aliases, mapping original name to alias.
+    """
+
+    def __init__(self, options: Optional[Options] = None) -> None:
+        self.options = options if options is not None else Options()
+        self.aliases = {}
+        self._speakers: list[Optional[assets.Character]] = []
+        self._poses: list[_Pose] = []
+        self._texts: list[str] = []
+        self._flags: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def addRows(self, rows: Iterable[tuple]):
+        """
+        Add frames from rows.
+
+        Args:
+            - `rows : Iterable[tuple[Optional[Character], int | str, str, FrameFlag]]`
+                - Rows of (speaker, pose, text, flags).
+        """
+        speakers, poses, texts, flags = self._speakers, self._poses, self._texts, self._flags
+        for speaker, pose, text, rowFlags in rows:
+            speakers.append(speaker)
+            poses.append(pose)
+            texts.append(text)
+            flags.append(rowFlags)
+
+    def addColumns(
+        self,
+        speakers: Iterable[Optional[assets.Character]],
+        poses: Iterable[_Pose],
+        texts: Iterable[str],
+        flags: Optional[Iterable[enums.FrameFlag]] = None,
+    ):
+        """
+        Add frames from columns.
+
+        Args:
+            - `speakers : Iterable[Optional[Character]]`
+            - `poses : Iterable[int | str]`
+            - `texts : Iterable[str]`
+            - `flags : Optional[Iterable[FrameFlag]]`
+                - No flags are set if None.
+
+        Raises:
+            - `ValueError`
+                - The columns have different lengths. Nothing is added.
+        """
+        speakers, poses, texts = list(speakers), list(poses), list(texts)
+        flags = list(flags) if flags is not None else [0] * len(texts)
+        if not len(speakers) == len(poses) == len(texts) == len(flags):
+            raise ValueError(
+                "Columns have different lengths ("
+                + ", ".join(str(len(column)) for column in (speakers, poses, texts, flags))
+                + ")"
+            )
+        self._speakers += speakers
+        self._poses += poses
+        self._texts += texts
+        self._flags += flags
+
+    def toScene(self) -> Scene:
+        """
+        Create the scene the builder's frames describe, to edit it further.
+
+        Returns:
+            The Scene.
+        """
+        scene = Scene(self.options)
+        scene.aliases = dict(self.aliases)
+        FrameFlag = enums.FrameFlag
+        for speaker, pose, text, flags in zip(self._speakers, self._poses, self._texts, self._flags):
+            char = None
+            if speaker is not None:
+                char = frames.FrameCharacter(
+                    speaker,
+                    poseId=pose if not isinstance(pose, str) else None,
+                    poseSubstr=pose if isinstance(pose, str) else None,
+                    flip=bool(flags & FrameFlag.FLIP),
+                )
+            scene.frames.append(
+                frames.Frame(
+                    char=char,
+                    text=text,
+                    talk=not flags & FrameFlag.NO_TALK,
+                    poseAnim=not flags & FrameFlag.NO_POSE_ANIM,
+                    goNext=bool(flags & FrameFlag.GO_NEXT),
+                    merge=bool(flags & FrameFlag.MERGE),
+                    offScreen=bool(flags & FrameFlag.OFF_SCREEN),
+                    centerText=bool(flags & FrameFlag.CENTER_TEXT),
+                    hidden=bool(flags & FrameFlag.HIDDEN),
+                )
+            )
+        return scene
+
+    def compile(self, offline: bool = False, fallbackBackground: Optional[assets.Background] = None) -> dict:
+        """
+        Compile the builder's frames into a scene.
+
+        Args:
+            - `offline : bool`
+                - Compile without requesting any asset data, as in `Scene.compile()`.
+            - `fallbackBackground : Optional[Background]`
+                - In offline mode, the background of frames whose speaker isn't loaded.
+
+        Raises:
+            - `AssetOfflineError`
+                - In offline mode, a speaker isn't loaded and no fallback was given, or a pose substring can't be looked up.
+
+        Returns:
+            JSON-serializable dictionary in the .objection format.
+        """
+        FrameFlag = enums.FrameFlag
+        hiddenFlag = FrameFlag.HIDDEN.value
+        visibleSpeakers = {
+            id(speaker): speaker
+            for speaker, flags in zip(self._speakers, self._flags)
+            if speaker is not None and not flags & hiddenFlag
+        }
+        if not offline:
+            assets.prefetch(speaker for speaker in visibleSpeakers.values() if speaker.id is not None)
+        elif fallbackBackground is None:
+            for speaker in visibleSpeakers.values():
+                if not speaker._loaded and speaker.id is not None:
+                    raise assets.AssetOfflineError(speaker)
+
+        scene = Scene(self.options)
+        scene.aliases = self.aliases
+        objectionDict = scene.compile()  # The objection's envelope, without frames
+        with assets.offline() if offline else nullcontext():
+            frameDicts = self._compileFrames(visibleSpeakers, fallbackBackground if offline else None)
+        objectionDict["groups"][0]["frames"] = frameDicts
+        scene._checkLimits(objectionDict)
+        return objectionDict
+
+    def _compileFrames(self, speakers: dict[int, assets.Character], fallbackBackground: Optional[assets.Background]) -> list[dict]:
+        # Character ID and background ID by speaker, as Scene._compileFrame would find them
+        speakerIds = {id(None): (None, 0)}
+        for key, speaker in speakers.items():
+            backgroundId = (
+                fallbackBackground.id
+                if fallbackBackground is not None and not speaker._loaded
+                else speaker.backgroundId
+            )
+            speakerIds[key] = (speaker.id if not speaker.isPreset else None, backgroundId)
+        poseIds = {}
+
+        flipFlag = enums.FrameFlag.FLIP.value
+        noTalkFlag = enums.FrameFlag.NO_TALK.value
+        noPoseAnimFlag = enums.FrameFlag.NO_POSE_ANIM.value
+        goNextFlag = enums.FrameFlag.GO_NEXT.value
+        mergeFlag = enums.FrameFlag.MERGE.value
+        offScreenFlag = enums.FrameFlag.OFF_SCREEN.value
+        centerTextFlag = enums.FrameFlag.CENTER_TEXT.value
+        hiddenFlag = enums.FrameFlag.HIDDEN.value
+
+        frameDicts = []
+        iid = 1
+        for speaker, pose, text, flags in zip(self._speakers, self._poses, self._texts, self._flags):
+            if flags & hiddenFlag:
+                continue  # Hidden frames are never shown in scenes
+            characterId, backgroundId = speakerIds[id(speaker)]
+            if speaker is None:
+                poseId = 0
+                flipped = "000"
+            else:
+                if isinstance(pose, str):
+                    poseKey = (id(speaker), pose)
+                    poseId = poseIds.get(poseKey)
+                    if poseId is None:
+                        poseId = poseIds[poseKey] = speaker.lookupPoseSubstr(pose)
+                else:
+                    poseId = pose
+                flipped = "110" if flags & flipFlag else "000"  # Without a paired character, the background flips along
+
+            frameActions = []
+            if flags & offScreenFlag:
+                frameActions.append({"actionId": 6})
+            if flags & centerTextFlag:
+                frameActions.append({"actionId": 9})
+
+            frameDicts.append({
+                "id": -1,
+                "iid": iid,
+                "text": text,
+                "characterId": characterId,
+                "poseId": poseId,
+                "pairPoseId": 0,
+                "bubbleType": 0,
+                "username": "",
+                "mergeNext": bool(flags & mergeFlag),
+                "doNotTalk": bool(flags & noTalkFlag),
+                "goNext": bool(flags & goNextFlag),
+                "poseAnimation": not flags & noPoseAnimFlag,
+                "popupId": None,
+                "backgroundId": backgroundId,
+                "transition": {},
+                "filter": {},
+                "frameFades": [],
+                "frameActions": frameActions,
+                "caseAction": {},
+                "flipped": flipped,
+                "pairId": None,
+            })
+            iid += 1
+        return frameDicts
+
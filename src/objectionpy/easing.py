@@ -0,0 +1,171 @@
+"""
+Module for evaluating the easing curves of transitions and fades.
+
+Curves are evaluated over NumPy arrays when NumPy is installed, and with plain Python otherwise.
+"""
+
+import math
+from typing import Any, Callable, Iterable, Union
+from . import enums
+
+try:
+    import numpy
+except ImportError:  # Optional dependency
+    numpy = None
+
+
+class _ScalarMath:
+    sin = staticmethod(math.sin)
+    cos = staticmethod(math.cos)
+    sqrt = staticmethod(math.sqrt)
+    exp = staticmethod(math.exp)
+    maximum = staticmethod(max)
+
+    @staticmethod
+    def where(condition, a, b):
+        return a if condition else b
+
+
+class _ArrayMath:
+    def __getattr__(self, name: str):
+        return getattr(numpy, name)
+
+
+_BISECTION_STEPS = 24
+_SPRING_DAMPING = 6.0
+_SPRING_FREQUENCY = 12.0
+_SPRING_END = 1 - math.exp(-_SPRING_DAMPING) * math.cos(_SPRING_FREQUENCY)
+
+
+def _cubicBezier(x1: float, y1: float, x2: float, y2: float) -> Callable:
+    # CSS cubic-bezier(), solved for x by bisection so that it works the same over scalars and arrays
+    def curve(t, m):
+        def bezier(s, p1, p2):
+            return 3 * (1 - s) ** 2 * s * p1 + 3 * (1 - s) * s ** 2 * p2 + s ** 3
+
+        low = t * 0.0
+        high = low + 1.0
+        for _ in range(_BISECTION_STEPS):
+            middle = (low + high) / 2
+            below = bezier(middle, x1, x2) < t
+            low = m.where(below, middle, low)
+            high = m.where(below, high, middle)
+        return bezier((low + high) / 2, y1, y2)
+    return curve
+
+
+def _inOut(easeIn: Callable) -> Callable:
+    # Mirrors an ease-in curve into an ease-in-out curve
+    def curve(t, m):
+        return m.where(t < 0.5, easeIn(t * 2, m) / 2, 1 - easeIn(2 - t * 2, m) / 2)
+    return curve
+
+
+def _out(easeIn: Callable) -> Callable:
+    def curve(t, m):
+        return 1 - easeIn(1 - t, m)
+    return curve
+
+
+def _power(exponent: int) -> Callable:
+    def curve(t, m):
+        return t ** exponent
+    return curve
+
+
+def _sineIn(t, m):
+    return 1 - m.cos(t * math.pi / 2)
+
+
+def _exponentialIn(t, m):
+    return m.where(t <= 0, t * 0.0, 2 ** (10 * t - 10))
+
+
+def _circularIn(t, m):
+    return 1 - m.sqrt(m.maximum(1 - t * t, t * 0.0))
+
+
+def _spring(t, m):
+    # Underdamped spring, scaled to end exactly on 1. An approximation, as the exact spring parameters of objection.lol aren't documented.
+    return (1 - m.exp(-_SPRING_DAMPING * t) * m.cos(_SPRING_FREQUENCY * t)) / _SPRING_END
+
+
+_curves: dict[enums.Easing, Callable[[Any, Any], Any]] = {
+    enums.Easing.LINEAR: lambda t, m: t * 1.0,
+    enums.Easing.SPRING: _spring,
+    enums.Easing.EASE: _cubicBezier(0.25, 0.1, 0.25, 1.0),
+    enums.Easing.EASE_IN: _cubicBezier(0.42, 0.0, 1.0, 1.0),
+    enums.Easing.EASE_OUT: _cubicBezier(0.0, 0.0, 0.58, 1.0),
+    enums.Easing.EASE_IN_OUT: _cubicBezier(0.42, 0.0, 0.58, 1.0),
+    enums.Easing.EASE_IN_SINE: _sineIn,
+    enums.Easing.EASE_OUT_SINE: _out(_sineIn),
+    enums.Easing.EASE_IN_OUT_SINE: _inOut(_sineIn),
+    enums.Easing.EASE_IN_QUAD: _power(2),
+    enums.Easing.EASE_OUT_QUAD: _out(_power(2)),
+    enums.Easing.EASE_IN_OUT_QUAD: _inOut(_power(2)),
+    enums.Easing.EASE_IN_CUBIC: _power(3),
+    enums.Easing.EASE_OUT_CUBIC: _out(_power(3)),
+    enums.Easing.EASE_IN_OUT_CUBIC: _inOut(_power(3)),
+    enums.Easing.EASE_IN_QUART: _power(4),
+    enums.Easing.EASE_OUT_QUART: _out(_power(4)),
+    enums.Easing.EASE_IN_OUT_QUART: _inOut(_power(4)),
+    enums.Easing.EASE_IN_QUINT: _power(5),
+    enums.Easing.EASE_OUT_QUINT: _out(_power(5)),
+    enums.Easing.EASE_IN_OUT_QUINT: _inOut(_power(5)),
+    enums.Easing.EASE_IN_EXPONENTIAL: _exponentialIn,
+    enums.Easing.EASE_OUT_EXPONENTIAL: _out(_exponentialIn),
+    enums.Easing.EASE_IN_OUT_EXPONENTIAL: _inOut(_exponentialIn),
+    enums.Easing.EASE_IN_CIRCULAR: _circularIn,
+    enums.Easing.EASE_OUT_CIRCULAR: _out(_circularIn),
+    enums.Easing.EASE_IN_OUT_CIRCULAR: _inOut(_circularIn),
+}
+
+
+def evaluate(easing: enums.Easing, t: Union[float, Iterable[float], "numpy.ndarray"]) -> Any:
+    """
+    Evaluate an easing curve.
+
+    Args:
+        - `easing : Easing`
+            - The curve to evaluate.
+        - `t : float | Iterable[float] | numpy.ndarray`
+            - Progress of the animation, from 0 to 1.
+
+    Returns:
+        The eased progress, mostly ranging from 0 to 1. A float for a single value, a NumPy array for a NumPy array, and a list for other iterables.
+    """
+    curve = _curves[easing]
+    if numpy is not None and isinstance(t, numpy.ndarray):
+        return curve(t.astype(float, copy=False), _ArrayMath())
+    if isinstance(t, (int, float)):
+        return float(curve(float(t), _ScalarMath))
+    if numpy is not None:
+        return curve(numpy.asarray(t, dtype=float), _ArrayMath()).tolist()
+    return [float(curve(float(value), _ScalarMath)) for value in t]
+
+
+def sample(
+    easing: enums.Easing, duration: int, frameRate: float = 60, start: float = 0.0, end: float = 1.0
+) -> Union[list[float], "numpy.ndarray"]:
+    """
+    Sample the values of an eased animation at a fixed frame rate, such as a camera pan between `wideX` positions or a fade's opacity.
+
+    Args:
+        - `easing : Easing`
+            - The animation's curve.
+        - `duration : int`
+            - The animation's duration in milliseconds, like `Transition.duration` and `Fade.duration`.
+        - `frameRate : float`
+            - Samples per second. Defaults to 60.
+        - `start : float`
+            - The animated value at the start. Defaults to 0.
+        - `end : float`
+            - The animated value at the end. Defaults to 1.
+
+    Returns:
+        The value at each sample, including both ends. A NumPy array if NumPy is installed, otherwise a list.
+    """
+    count = max(int(duration * frameRate / 1000), 1) + 1
+    if numpy is not None:
+        return start + (end - start) * evaluate(easing, numpy.linspace(0.0, 1.0, count))
+    return [start + (end - start) * value for value in evaluate(easing, (i / (count - 1) for i in range(count)))]
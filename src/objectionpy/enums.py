@@ -1,6 +1,6 @@
 """Enums used by the library."""
 
-from enum import Enum
+from enum import Enum, IntFlag
 
 
 class CharacterLocation(Enum):
@@ -76,6 +76,19 @@ class FilterTarget(Enum):
     EVERYTHING = 2
 
 
+class FrameFlag(IntFlag):
+    """Boolean frame attributes for SceneBuilder rows, combined with `|`."""
+    NONE = 0
+    FLIP = 1
+    NO_TALK = 2
+    NO_POSE_ANIM = 4
+    GO_NEXT = 8
+    MERGE = 16
+    OFF_SCREEN = 32
+    CENTER_TEXT = 64
+    HIDDEN = 128
+
+
 class GroupType(Enum):
     """"""
     NORMAL = "n"
@@ -123,3 +136,32 @@ class RecordType(Enum):
     """"""
     EVIDENCE = 0
     PROFILE = 1
+
+
+class TextCommand(Enum):
+    """Commands of text markup tags, by their tag names."""
+    TEXT_SPEED = 'ts'
+    PAUSE = 'p'
+    FLASH = 'f'
+    FLASH_SMALL = 'fs'
+    FLASH_MEDIUM = 'fm'
+    FLASH_LARGE = 'fl'
+    SHAKE = 's'
+    SHAKE_SMALL = 'ss'
+    SHAKE_MEDIUM = 'sm'
+    SHAKE_LARGE = 'sl'
+    MUSIC = 'bgm'
+    MUSIC_STOP = 'bgms'
+    SOUND = 'bgs'
+    EVIDENCE = 'evd'
+    EVIDENCE_ICON = 'evdi'
+    EVIDENCE_HIDE = 'evdh'
+    COLOR = '/'
+    COLOR_END = '/#'
+
+
+_valueTables: dict[type, dict] = {
+    enum: {member.value: member for member in enum}
+    for enum in list(globals().values())
+    if isinstance(enum, type) and issubclass(enum, Enum) and enum not in (Enum, IntFlag)
+}  # Maps each enum above to a value -> member table, for decoding without scanning every member
@@ -0,0 +1,336 @@
+"""
+Module for exploring the branches of a case, to find frames that can't be reached and paths that go wrong.
+
+Exploration drives a CaseSimulator through every option of every prompt and cross-examination statement. Playthrough states are deduplicated by their position, variables, health and visibility, so each distinct state is only expanded once. Branches can be expanded across a process pool.
+"""
+
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional, Union
+from . import expressions
+from .objection import Case
+from .simulator import CaseSimulator, Press, Present, SimulationError, _Decision, _State, _PRESS
+
+
+@dataclass
+class ExplorationReport:
+    """
+    Findings of a case exploration.
+
+    Attributes:
+        - `frameCount : int`
+            - Number of frames in the case, including press, counsel and failure frames.
+        - `reachedFrames : set[int]`
+            - IIDs of the frames played by at least one branch.
+        - `unreachableFrames : list[int]`
+            - IIDs of the frames no explored branch played, in ascending order.
+        - `deadEnds : set[int]`
+            - IIDs of frames after which a branch stops without ending the case, either at the end of a normal group or at a prompt with nothing to answer it with.
+        - `loops : set[int]`
+            - IIDs of frames where a branch was still playing without asking for input after the segment step limit.
+        - `crashes : dict[int, str]`
+            - IIDs of frames where the simulation failed, such as by jumping to a missing frame, with the error message.
+        - `endings : Counter[str]`
+            - Number of branches per Playthrough end reason.
+        - `stateCount : int`
+            - Number of distinct states explored.
+        - `complete : bool`
+            - Whether every reachable state was explored. False if the state limit was hit or branches were sampled at random.
+    """
+    frameCount: int = 0
+    reachedFrames: set[int] = field(default_factory=set)
+    unreachableFrames: list[int] = field(default_factory=list)
+    deadEnds: set[int] = field(default_factory=set)
+    loops: set[int] = field(default_factory=set)
+    crashes: dict[int, str] = field(default_factory=dict)
+    endings: Counter = field(default_factory=Counter)
+    stateCount: int = 0
+    complete: bool = True
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of the case's frames that were reached."""
+        return len(self.reachedFrames) / self.frameCount if self.frameCount else 1.0
+
+    def _merge(self, other: "ExplorationReport") -> None:
+        self.reachedFrames |= other.reachedFrames
+        self.deadEnds |= other.deadEnds
+        self.loops |= other.loops
+        for iid, message in other.crashes.items():
+            self.crashes.setdefault(iid, message)
+        self.endings.update(other.endings)
+
+
+_defaultPromptValues = {"int": (0,), "word": ("",), "string": ("",)}
+
+
+def _stateKey(state: _State) -> tuple:
+    playthrough = state.playthrough
+    return (
+        state.sequenceKey,
+        state.index,
+        state.exact,
+        frozenset(state.hidden),
+        tuple(sorted(playthrough.variables.items())),
+        playthrough.health,
+        playthrough.flashingHealth,
+        frozenset(playthrough.hiddenRecordItems),
+        state.gameOverGroup,
+        state.failedStatement,
+    )
+
+
+def _presentable(simulator: CaseSimulator, state: _State, prefixes: str) -> list[Present]:
+    names = {}
+    for iid, (name, prefix) in simulator._recordItems.items():
+        if prefix in prefixes and iid not in state.playthrough.hiddenRecordItems:
+            names.setdefault(name, Present(name))
+    return list(names.values())
+
+
+def _options(simulator: CaseSimulator, state: _State, decision: _Decision, promptValues: dict[str, Iterable]) -> list:
+    actionId, value = decision.actionId, decision.value
+    if actionId == 9:
+        return list(range(len(value)))
+    if actionId == 8:
+        return _presentable(simulator, state, ("e-" if value["evidence"] else "") + ("p-" if value["profiles"] else ""))
+    if actionId == 12:
+        return list(promptValues.get(value["name"], _defaultPromptValues.get(value["type"], ("",))))
+    if actionId == 17:
+        options = [
+            (area["shape"]["left"] + area["shape"]["width"] / 2, area["shape"]["top"] + area["shape"]["height"] / 2)
+            for area in value["areas"]
+        ]
+        options.append((-1, -1))  # Pointing outside of every area
+        return options
+
+    # Cross-examination statement
+    options: list[Any] = [None]
+    if (_PRESS, state.sequenceKey[1], state.index) in simulator._sequences:
+        options.append(Press())
+    options.extend(_presentable(simulator, state, "e-p-"))
+    return options
+
+
+def _branches(
+    simulator: CaseSimulator, state: _State, decision: _Decision, promptValues: dict[str, Iterable], report: ExplorationReport
+) -> Iterable[_State]:
+    options = _options(simulator, state, decision, promptValues)
+    if not options:
+        report.deadEnds.add(decision.frame["iid"])
+        report.endings["waitingForInput"] += 1
+    for option in options:
+        branch = state.copy()
+        try:
+            followingDecision = simulator._answer(branch, decision, option)
+        except SimulationError as e:
+            report.crashes.setdefault(decision.frame["iid"], str(e))
+            continue
+        if followingDecision is None:
+            yield branch
+        else:
+            yield from _branches(simulator, branch, followingDecision, promptValues, report)
+
+
+def _playSegment(simulator: CaseSimulator, state: _State, segmentSteps: int, report: ExplorationReport) -> Optional[_Decision]:
+    # Plays a state up to its next decision, recording what happened on the way
+    path = state.playthrough.path
+    try:
+        decision = simulator._play(state, segmentSteps)
+    except (SimulationError, expressions.ExpressionError) as e:
+        if path:
+            report.crashes.setdefault(path[-1], str(e))
+        return None
+    finally:
+        report.reachedFrames.update(path)
+    if decision is None:
+        endReason = state.playthrough.endReason
+        report.endings[endReason] += 1
+        if path:
+            if endReason == "endOfGroup":
+                report.deadEnds.add(path[-1])
+            elif endReason == "maxSteps":
+                report.loops.add(path[-1])
+    return decision
+
+
+def _expand(
+    simulator: CaseSimulator, states: list[_State], promptValues: dict[str, Iterable], segmentSteps: int
+) -> tuple[ExplorationReport, list[tuple[tuple, _State]]]:
+    report = ExplorationReport()
+    children = []
+    for state in states:
+        decision = _playSegment(simulator, state, segmentSteps, report)
+        if decision is not None:
+            children.extend((_stateKey(branch), branch) for branch in _branches(simulator, state, decision, promptValues, report))
+    return report, children
+
+
+def _walk(
+    simulator: CaseSimulator, seed: int, walks: int, maxDecisions: int, promptValues: dict[str, Iterable], segmentSteps: int
+) -> tuple[ExplorationReport, set[tuple]]:
+    rng = random.Random(seed)
+    report = ExplorationReport()
+    keys = set()
+    for _ in range(walks):
+        state = simulator._initialState()
+        for _ in range(maxDecisions):
+            decision = _playSegment(simulator, state, segmentSteps, report)
+            if decision is None:
+                break
+            keys.add(_stateKey(state))
+            branches = list(_branches(simulator, state, decision, promptValues, report))
+            if not branches:
+                break
+            state = rng.choice(branches)
+    return report, keys
+
+
+_workerSimulator: Optional[CaseSimulator] = None
+
+
+def _initWorker(objectionDict: dict) -> None:
+    global _workerSimulator
+    _workerSimulator = CaseSimulator(objectionDict)
+
+
+def _expandInWorker(args: tuple) -> tuple[ExplorationReport, list[tuple[tuple, _State]]]:
+    return _expand(_workerSimulator, *args)
+
+
+def _walkInWorker(args: tuple) -> tuple[ExplorationReport, set[tuple]]:
+    return _walk(_workerSimulator, *args)
+
+
+def _chunks(items: list, count: int) -> list[list]:
+    size = max(-(-len(items) // count), 1)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _finishReport(report: ExplorationReport, simulator: CaseSimulator) -> ExplorationReport:
+    report.frameCount = len(simulator._locations)
+    report.unreachableFrames = sorted(set(simulator._locations) - report.reachedFrames)
+    return report
+
+
+def explore(
+    case: Union[Case, dict],
+    promptValues: Optional[dict[str, Iterable]] = None,
+    maxStates: int = 100000,
+    segmentSteps: int = 10000,
+    workers: Optional[int] = None,
+) -> ExplorationReport:
+    """
+    Explore every distinct state of a case, breadth first.
+
+    At each PromptChoice every choice is taken, at each PromptPresent every visible item of the allowed types is presented, and at each PromptCursor every area and a point outside of them is pointed at. At cross-examination statements, the statement is continued from, pressed and presented every visible item to.
+
+    Args:
+        - `case : Case | dict`
+            - The case, or its compiled dictionary.
+        - `promptValues : Optional[dict[str, Iterable]]`
+            - Values to enter into PromptInt and PromptStr actions, by variable name. Defaults to 0 for integers and an empty text otherwise.
+        - `maxStates : int`
+            - The maximum number of distinct states to explore.
+        - `segmentSteps : int`
+            - The maximum number of frames to play between two decisions, before counting the branch as an endless loop.
+        - `workers : Optional[int]`
+            - Number of processes to expand states with. Explores in the current process if None.
+
+    Returns:
+        The ExplorationReport.
+    """
+    objectionDict = case.compile() if isinstance(case, Case) else case
+    simulator = CaseSimulator(objectionDict)
+    promptValues = promptValues or {}
+    report = ExplorationReport()
+
+    initialState = simulator._initialState()
+    seen = {_stateKey(initialState)}
+    frontier = [initialState]
+    pool = ProcessPoolExecutor(workers, initializer=_initWorker, initargs=(objectionDict,)) if workers else None
+    try:
+        while frontier and report.complete:
+            if pool is not None and len(frontier) > 1:
+                results = pool.map(
+                    _expandInWorker, [(chunk, promptValues, segmentSteps) for chunk in _chunks(frontier, workers * 4)]
+                )
+            else:
+                results = [_expand(simulator, frontier, promptValues, segmentSteps)]
+
+            frontier = []
+            for partialReport, children in results:
+                if not report.complete:
+                    break
+                report._merge(partialReport)
+                for key, child in children:
+                    if key in seen:
+                        continue
+                    if len(seen) >= maxStates:
+                        report.complete = False
+                        break
+                    seen.add(key)
+                    frontier.append(child)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    report.stateCount = len(seen)
+    return _finishReport(report, simulator)
+
+
+def sample(
+    case: Union[Case, dict],
+    walks: int,
+    seed: Optional[int] = None,
+    promptValues: Optional[dict[str, Iterable]] = None,
+    maxDecisions: int = 1000,
+    segmentSteps: int = 10000,
+    workers: Optional[int] = None,
+) -> ExplorationReport:
+    """
+    Explore random playthroughs of a case, for cases with too many states to explore fully.
+
+    Each walk starts from the first frame and takes a random option at every decision, out of the options explore() would take.
+
+    Args:
+        - `case : Case | dict`
+            - The case, or its compiled dictionary.
+        - `walks : int`
+            - Number of playthroughs.
+        - `seed : Optional[int]`
+            - Seed of the random choices, for reproducible results.
+        - `promptValues : Optional[dict[str, Iterable]]`
+            - Values to enter into PromptInt and PromptStr actions, by variable name.
+        - `maxDecisions : int`
+            - The maximum number of decisions per playthrough.
+        - `segmentSteps : int`
+            - The maximum number of frames to play between two decisions, before counting the branch as an endless loop.
+        - `workers : Optional[int]`
+            - Number of processes to split the walks between. Walks in the current process if None.
+
+    Returns:
+        The ExplorationReport.
+    """
+    objectionDict = case.compile() if isinstance(case, Case) else case
+    simulator = CaseSimulator(objectionDict)
+    promptValues = promptValues or {}
+    rng = random.Random(seed)
+    report = ExplorationReport(complete=False)
+    keys = set()
+
+    if workers:
+        walkCounts = [len(chunk) for chunk in _chunks(range(walks), workers)]
+        tasks = [(rng.getrandbits(64), count, maxDecisions, promptValues, segmentSteps) for count in walkCounts]
+        with ProcessPoolExecutor(workers, initializer=_initWorker, initargs=(objectionDict,)) as pool:
+            results = list(pool.map(_walkInWorker, tasks))
+    else:
+        results = [_walk(simulator, rng.getrandbits(64), walks, maxDecisions, promptValues, segmentSteps)]
+
+    for partialReport, partialKeys in results:
+        report._merge(partialReport)
+        keys |= partialKeys
+    report.stateCount = len(keys)
+    return _finishReport(report, simulator)
@@ -0,0 +1,288 @@
+"""
+Module for parsing and evaluating the condition expressions of VarEval case actions.
+
+Expressions are compiled once into nested Python functions and cached by their text, so they can be evaluated repeatedly at little cost.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+
+EXPRESSION_CACHE_SIZE = 4096
+
+_tokenPattern = re.compile(
+    r'\s*(?:(\d+(?:\.\d+)?)|"([^"]*)"|\'([^\']*)\'|([A-Za-z_]\w*)|(&&|\|\||==|!=|>=|<=|[-+*/%<>!()]))'
+)
+_binaryOperatorLevels = (
+    ('||',),
+    ('&&',),
+    ('==', '!='),
+    ('>', '<', '>=', '<='),
+    ('+', '-'),
+    ('*', '/', '%'),
+)
+
+
+class ExpressionError(Exception):
+    """
+    Raised when an expression is malformed.
+
+    Attributes:
+        - `expression : str`
+            - The malformed expression.
+        - `position : int`
+            - Position of the problem within the expression.
+    """
+
+    def __init__(self, message: str, expression: str, position: int) -> None:
+        super().__init__(message + ' at position ' + str(position) + ' of expression "' + expression + '"')
+        self.expression = expression
+        self.position = position
+
+
+def _number(value) -> Any:
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            return float(value)
+        except ValueError:
+            return 0
+    return value
+
+
+def _equals(left, right) -> bool:
+    if isinstance(left, str) != isinstance(right, str):
+        try:
+            return float(left) == float(right)
+        except ValueError:
+            return str(left) == str(right)
+    return left == right
+
+
+def _add(left, right):
+    if isinstance(left, str) or isinstance(right, str):
+        return str(left) + str(right)
+    return left + right
+
+
+def _divide(left, right):
+    right = _number(right)
+    return _number(left) / right if right != 0 else 0
+
+
+def _modulo(left, right):
+    right = _number(right)
+    return _number(left) % right if right != 0 else 0
+
+
+_binaryOperators: dict[str, Callable[[Any, Any], Any]] = {
+    '==': _equals,
+    '!=': lambda left, right: not _equals(left, right),
+    '>': lambda left, right: _number(left) > _number(right),
+    '<': lambda left, right: _number(left) < _number(right),
+    '>=': lambda left, right: _number(left) >= _number(right),
+    '<=': lambda left, right: _number(left) <= _number(right),
+    '+': _add,
+    '-': lambda left, right: _number(left) - _number(right),
+    '*': lambda left, right: _number(left) * _number(right),
+    '/': _divide,
+    '%': _modulo,
+}
+
+
+class Expression:
+    """
+    A compiled expression. Create with compileExpression().
+
+    Attributes:
+        - `source : str`
+            - The expression's text.
+        - `variables : frozenset[str]`
+            - Names of the variables the expression reads.
+    """
+    __slots__ = ('source', 'variables', '_function')
+
+    def __init__(self, source: str, variables: frozenset, function: Callable[[dict], Any]) -> None:
+        self.source = source
+        self.variables = variables
+        self._function = function
+
+    def evaluate(self, variables: dict[str, Any]) -> Any:
+        """
+        Evaluate the expression.
+
+        Args:
+            - `variables : dict[str, Any]`
+                - Variable values. Missing variables count as 0.
+
+        Returns:
+            The result. Conditions are true if the result is truthy.
+        """
+        return self._function(variables)
+
+    def __repr__(self) -> str:
+        return 'Expression(' + repr(self.source) + ')'
+
+
+class _Parser:
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens: list[tuple[str, Any, int]] = []
+        self.variables = set()
+        self.index = 0
+
+        position = 0
+        end = len(expression.rstrip())
+        while position < end:
+            match = _tokenPattern.match(expression, position)
+            if match is None:
+                raise ExpressionError('Unexpected character', expression, position + len(expression[position:]) - len(expression[position:].lstrip()))
+            number, doubleQuoted, singleQuoted, name, operator = match.groups()
+            start = match.start(match.lastindex)
+            if number is not None:
+                self.tokens.append(('constant', float(number) if '.' in number else int(number), start))
+            elif doubleQuoted is not None or singleQuoted is not None:
+                self.tokens.append(('constant', doubleQuoted if doubleQuoted is not None else singleQuoted, start))
+            elif name is not None:
+                self.tokens.append(('variable', name, start))
+            else:
+                self.tokens.append(('operator', operator, start))
+            position = match.end()
+        self.tokens.append(('end', None, end))
+
+    def error(self, message: str):
+        raise ExpressionError(message, self.expression, self.tokens[self.index][2])
+
+    def parse(self) -> Callable[[dict], Any]:
+        if len(self.tokens) == 1:
+            self.error('Empty expression')
+        node = self.parseBinary(0)
+        if self.tokens[self.index][0] != 'end':
+            self.error('Unexpected "' + str(self.tokens[self.index][1]) + '"')
+        return _build(node)[0]
+
+    def parseBinary(self, level: int) -> tuple:
+        if level == len(_binaryOperatorLevels):
+            return self.parseUnary()
+        left = self.parseBinary(level + 1)
+        operators = _binaryOperatorLevels[level]
+        while self.tokens[self.index][0] == 'operator' and self.tokens[self.index][1] in operators:
+            operator = self.tokens[self.index][1]
+            self.index += 1
+            left = ('binary', operator, left, self.parseBinary(level + 1))
+        return left
+
+    def parseUnary(self) -> tuple:
+        kind, value, _ = self.tokens[self.index]
+        if kind == 'end':
+            self.error('Unexpected end of expression')
+        self.index += 1
+        if kind == 'constant':
+            return ('constant', value)
+        if kind == 'variable':
+            self.variables.add(value)
+            return ('variable', value)
+        if value == '!':
+            return ('not', self.parseUnary())
+        if value == '-':
+            return ('negate', self.parseUnary())
+        if value == '(':
+            node = self.parseBinary(0)
+            if self.tokens[self.index][1] != ')':
+                self.error('Expected ")"')
+            self.index += 1
+            return node
+        self.index -= 1
+        self.error('Unexpected "' + value + '"')
+
+
+def _build(node: tuple) -> tuple[Callable[[dict], Any], bool]:
+    # Turns a syntax tree node into a function of the variables, folding constant subtrees.
+    # Also returns whether the function is constant, so that folded subtrees fold their parents too.
+    kind = node[0]
+    if kind == 'constant':
+        value = node[1]
+        return (lambda variables: value), True
+    if kind == 'variable':
+        name = node[1]
+        return (lambda variables: variables.get(name, 0)), False
+
+    if kind in ('not', 'negate'):
+        operand, isConstant = _build(node[1])
+        if kind == 'not':
+            function = lambda variables: not operand(variables)
+        else:
+            function = lambda variables: -_number(operand(variables))
+        return _fold(function, isConstant)
+
+    operator = node[1]
+    left, leftConstant = _build(node[2])
+    right, rightConstant = _build(node[3])
+    if operator == '||':
+        function = lambda variables: left(variables) or right(variables)
+    elif operator == '&&':
+        function = lambda variables: left(variables) and right(variables)
+    else:
+        apply = _binaryOperators[operator]
+        function = lambda variables: apply(left(variables), right(variables))
+    return _fold(function, leftConstant and rightConstant)
+
+
+def _fold(function: Callable[[dict], Any], isConstant: bool) -> tuple[Callable[[dict], Any], bool]:
+    if isConstant:
+        value = function({})
+        return (lambda variables: value), True
+    return function, False
+
+
+@lru_cache(EXPRESSION_CACHE_SIZE)
+def compileExpression(expression: str) -> Expression:
+    """
+    Parse an expression. Results are cached by the expression's text.
+
+    Expressions can contain:
+        - Numbers, and strings in single or double quotes
+        - Variable names
+        - Math operators `+ - * / %`
+        - Comparisons `> < >= <= == !=`
+        - Logical operators `&& || !`
+        - Parentheses
+
+    Args:
+        - `expression : str`
+            - The expression's text.
+
+    Raises:
+        - `ExpressionError`
+            - The expression is malformed.
+
+    Returns:
+        The compiled Expression.
+    """
+    parser = _Parser(expression)
+    function = parser.parse()
+    return Expression(expression, frozenset(parser.variables), function)
+
+
+def evaluate(expression: str, variables: Optional[dict[str, Any]] = None) -> Any:
+    """
+    Compile and evaluate an expression.
+
+    Args:
+        - `expression : str`
+            - The expression's text.
+        - `variables : Optional[dict[str, Any]]`
+            - Variable values. Missing variables count as 0.
+
+    Raises:
+        - `ExpressionError`
+            - The expression is malformed.
+
+    Returns:
+        The result.
+    """
+    return compileExpression(expression).evaluate(variables if variables is not None else {})
@@ -0,0 +1,388 @@
+"""
+Module for checking objections for common mistakes before they're compiled or uploaded.
+
+Checks are rules in a registry. All selected rules share a single traversal over the groups, frames, counsel, failure and press sequences and case actions of an objection, so adding rules doesn't add passes. Custom rules can be added by subclassing Rule and decorating the subclass with register().
+
+Rules only check asset data that's already loaded, so linting never requests anything from objection.lol.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from os import PathLike
+from typing import Iterable, Optional, Union
+from . import expressions, frames, markup
+from .objection import Case, CEGroup, FrameLocation, Group, Scene, _ObjectionBase, _Frame, _ReferenceCollector, load
+
+
+@dataclass
+class LintIssue:
+    """
+    A problem found by a rule.
+
+    Attributes:
+        - `rule : str`
+            - Name of the rule that found the problem.
+        - `message : str`
+            - Description of the problem.
+        - `location : Optional[FrameLocation]`
+            - Location of the frame with the problem, if it's about a frame.
+    """
+    rule: str
+    message: str
+    location: Optional[FrameLocation] = None
+
+    def __str__(self) -> str:
+        return (str(self.location) + ": " if self.location is not None else "") + self.message + " [" + self.rule + "]"
+
+
+class Rule:
+    """
+    Base class of lint rules.
+
+    Subclasses override the visit methods they need, which are called during the shared traversal, and call report() for each problem. A new rule instance is created for each linted objection.
+
+    Attributes:
+        - `name : str`
+            - Unique name of the rule, used to select it and to label its issues.
+        - `objection : Scene | Case`
+            - The objection being linted.
+    """
+    name: str = ""
+
+    def __init__(self, objection: Union[Scene, Case], issues: list[LintIssue]) -> None:
+        self.objection = objection
+        self._issues = issues
+
+    def report(self, message: str, location: Optional[FrameLocation] = None):
+        """
+        Report a problem.
+
+        Args:
+            - `message : str`
+                - Description of the problem.
+            - `location : Optional[FrameLocation]`
+                - Location of the frame with the problem.
+        """
+        self._issues.append(LintIssue(self.name, message, location))
+
+    def visitGroup(self, groupIndex: int, group: Group):
+        """Called for each group, before its frames."""
+
+    def visitFrame(self, location: FrameLocation, group: Group, frame: _Frame):
+        """Called for each frame, including counsel, failure and press frames."""
+
+    def visitAction(self, location: FrameLocation, frame: _Frame, action: frames.CaseActions._CaseAction):
+        """Called for each frame with a case action, after visitFrame."""
+
+    def finish(self):
+        """Called after the traversal, for rules that report once everything was seen."""
+
+
+_rules: dict[str, type[Rule]] = {}
+
+
+def register(ruleClass: type[Rule]) -> type[Rule]:
+    """
+    Class decorator adding a rule to the registry, so that lint() runs it by default.
+
+    Args:
+        - `ruleClass : type[Rule]`
+            - The rule class. Its name must be unique.
+
+    Raises:
+        - `ValueError`
+            - A rule with the same name is already registered.
+
+    Returns:
+        The rule class.
+    """
+    if not ruleClass.name:
+        raise ValueError("Rule " + ruleClass.__name__ + " has no name")
+    if ruleClass.name in _rules:
+        raise ValueError('A rule named "' + ruleClass.name + '" is already registered')
+    _rules[ruleClass.name] = ruleClass
+    return ruleClass
+
+
+def ruleNames() -> list[str]:
+    """
+    Get the names of the registered rules.
+
+    Returns:
+        The rule names, in registration order.
+    """
+    return list(_rules)
+
+
+def _overrides(rule: Rule, methodName: str) -> bool:
+    return getattr(type(rule), methodName) is not getattr(Rule, methodName)
+
+
+def lint(objection: Union[Scene, Case], rules: Optional[Iterable[str]] = None) -> list[LintIssue]:
+    """
+    Check an objection with the registered rules, in a single traversal.
+
+    Frames of lazy loads are decoded.
+
+    Args:
+        - `objection : Scene | Case`
+            - The objection to check.
+        - `rules : Optional[Iterable[str]]`
+            - Names of the rules to run. Runs every registered rule if None.
+
+    Raises:
+        - `KeyError`
+            - A rule name isn't registered.
+
+    Returns:
+        List of LintIssue objects, in traversal order. Issues reported when finishing come last.
+    """
+    issues: list[LintIssue] = []
+    ruleClasses = _rules.values() if rules is None else [_rules[name] for name in rules]
+    instances = [ruleClass(objection, issues) for ruleClass in ruleClasses]
+    groupVisitors = [rule.visitGroup for rule in instances if _overrides(rule, "visitGroup")]
+    frameVisitors = [rule.visitFrame for rule in instances if _overrides(rule, "visitFrame")]
+    actionVisitors = [rule.visitAction for rule in instances if _overrides(rule, "visitAction")]
+
+    for groupIndex, group in enumerate(objection._groups):
+        for visit in groupVisitors:
+            visit(groupIndex, group)
+    for location, group, frame in objection._walkFrameLocations(decode=True):
+        for visit in frameVisitors:
+            visit(location, group, frame)
+        action = frame.caseAction
+        if action is not None:
+            for visit in actionVisitors:
+                visit(location, frame, action)
+
+    for rule in instances:
+        if _overrides(rule, "finish"):
+            rule.finish()
+    return issues
+
+
+def _lintFile(path: Union[str, PathLike], rules: Optional[list[str]]) -> list[LintIssue]:
+    try:
+        objection = load(path, suppressWarnings=True)
+    except Exception as e:
+        return [LintIssue("load", type(e).__name__ + ": " + str(e))]
+    return lint(objection, rules)
+
+
+def lintFiles(
+    paths: Iterable[Union[str, PathLike]], rules: Optional[Iterable[str]] = None, workers: Optional[int] = None
+) -> dict[Union[str, PathLike], list[LintIssue]]:
+    """
+    Check many .objection files, in parallel processes.
+
+    Files that fail to load get a single issue from the "load" rule.
+
+    Args:
+        - `paths : Iterable[str | PathLike]`
+            - Paths of the .objection files.
+        - `rules : Optional[Iterable[str]]`
+            - Names of the rules to run. Runs every registered rule if None. Custom rules must be registered on import of a module the worker processes import too.
+        - `workers : Optional[int]`
+            - The maximum number of processes. Defaults to the number of processors.
+
+    Returns:
+        Dictionary mapping each path to its issues, in the given order.
+    """
+    paths = list(paths)
+    rules = list(rules) if rules is not None else None
+    with ProcessPoolExecutor(workers) as executor:
+        results = executor.map(_lintFile, paths, [rules] * len(paths))
+        return dict(zip(paths, results))
+
+
+def _activeCharacter(frame: _Frame) -> frames.FrameCharacter:
+    activeChar, _ = _ObjectionBase._orderFrameChars(
+        (_ObjectionBase._verifyFrameChar(frame.char), _ObjectionBase._verifyFrameChar(frame.pairChar))
+    )
+    return activeChar
+
+
+@register
+class InvalidPoseRule(Rule):
+    """Frame characters whose pose isn't one of their character's poses."""
+    name = "invalid-pose"
+
+    def visitFrame(self, location, group, frame):
+        for char in frame.char, frame.pairChar:
+            if char is None or char.isNone:
+                continue
+            if char.poseId == -1:
+                self.report("No pose of character " + str(char.character.id) + " matches the pose lookup", location)
+            elif char.character._loaded and not any(pose["id"] == char.poseId for pose in char.character.poses):
+                self.report("Character " + str(char.character.id) + " has no pose " + str(char.poseId), location)
+
+
+@register
+class InvalidBubbleRule(Rule):
+    """Speech bubbles that aren't in the speaking character's bubble list."""
+    name = "invalid-bubble"
+
+    def visitFrame(self, location, group, frame):
+        if not frame.bubble:
+            return
+        character = _activeCharacter(frame).character
+        if character.id is not None and character._loaded and not any(
+            bubble["id"] == frame.bubble for bubble in character.bubbles
+        ):
+            self.report("Character " + str(character.id) + " has no speech bubble " + str(frame.bubble), location)
+
+
+@register
+class TransitionOnNarrowBackgroundRule(Rule):
+    """Transitions and camera offsets on backgrounds that aren't wide, where they have no effect."""
+    name = "transition-not-wide"
+
+    def visitFrame(self, location, group, frame):
+        background = frame.background
+        if (frame.transition is not None or frame.wideX is not None) and background is not None \
+                and background._loaded and background.exists and not background.isWide:
+            self.report("Transition on background " + str(background.id) + ", which isn't wide", location)
+
+
+@register
+class ChoiceCountRule(Rule):
+    """PromptChoice actions with no choices, or more than the 4 objection.lol shows."""
+    name = "choice-count"
+
+    def visitAction(self, location, frame, action):
+        if isinstance(action, frames.CaseActions.PromptChoice) and not 1 <= len(action.choices) <= 4:
+            self.report("PromptChoice has " + str(len(action.choices)) + " choices, must have 1 to 4", location)
+
+
+@register
+class EmptyPromptPresentRule(Rule):
+    """PromptPresent actions that allow presenting neither evidence nor profiles."""
+    name = "empty-present"
+
+    def visitAction(self, location, frame, action):
+        if isinstance(action, frames.CaseActions.PromptPresent) and not (action.presentEvidence or action.presentProfiles):
+            self.report("PromptPresent allows presenting neither evidence nor profiles", location)
+
+
+@register
+class CustomGalleryRule(Rule):
+    """Gallery assign modifiers with custom characters, which objection.lol doesn't support."""
+    name = "custom-gallery"
+
+    def visitFrame(self, location, group, frame):
+        for place, character in frame.options.galleryAssign.__dict__.items():
+            if character is not None and not character.isPreset:
+                self.report("Custom character " + str(character.id) + " assigned to the " + place + " gallery", location)
+
+
+@register
+class CEFramePlacementRule(Rule):
+    """CEFrames outside of the statements of a CE group, which fail to compile."""
+    name = "ce-frame-placement"
+
+    def visitFrame(self, location, group, frame):
+        if not isinstance(frame, frames.CEFrame):
+            return
+        if not isinstance(group, CEGroup):
+            self.report("CEFrame in a group that isn't a CEGroup", location)
+        elif location.sequence != "frames" or location.pressIndex is not None:
+            self.report("CEFrame in a " + ("press sequence" if location.pressIndex is not None else location.sequence), location)
+
+
+@register
+class DuplicateTagRule(Rule):
+    """Groups or frames sharing a case tag."""
+    name = "duplicate-tag"
+
+    def __init__(self, objection, issues):
+        super().__init__(objection, issues)
+        self._groupTags: dict[str, int] = {}
+        self._frameTags: dict[str, FrameLocation] = {}
+
+    def visitGroup(self, groupIndex, group):
+        if group.caseTag:
+            if group.caseTag in self._groupTags:
+                self.report(
+                    'Group tag "' + group.caseTag + '" of groups[' + str(groupIndex) + '] is already used by groups['
+                    + str(self._groupTags[group.caseTag]) + ']'
+                )
+            else:
+                self._groupTags[group.caseTag] = groupIndex
+
+    def visitFrame(self, location, group, frame):
+        if frame.caseTag:
+            if frame.caseTag in self._frameTags:
+                self.report('Frame tag "' + frame.caseTag + '" is already used by ' + str(self._frameTags[frame.caseTag]), location)
+            else:
+                self._frameTags[frame.caseTag] = location
+
+
+@register
+class DanglingReferenceRule(Rule):
+    """Case action and contradiction references to frames, groups or court record items that aren't part of the case."""
+    name = "dangling-reference"
+
+    def __init__(self, objection, issues):
+        super().__init__(objection, issues)
+        self._collector = _ReferenceCollector(objection) if isinstance(objection, Case) else None
+
+    def visitFrame(self, location, group, frame):
+        if self._collector is not None:
+            self._collector.visit(location, frame)
+
+    def finish(self):
+        if self._collector is not None:
+            for reference in self._collector.broken():
+                self.report(reference.message, reference.location)
+
+
+@register
+class InvalidMarkupRule(Rule):
+    """Malformed text markup tags."""
+    name = "invalid-markup"
+
+    def visitFrame(self, location, group, frame):
+        if frame.text:
+            for token in markup.validate(frame.text):
+                self.report("Tag " + token.source + " at position " + str(token.start) + ": " + token.reason, location)
+
+
+@register
+class InvalidExpressionRule(Rule):
+    """VarEval expressions that are malformed, or read variables no case action sets."""
+    name = "invalid-expression"
+
+    def __init__(self, objection, issues):
+        super().__init__(objection, issues)
+        self._definedVariables = set()
+        self._expressions: list[tuple[FrameLocation, expressions.Expression]] = []
+
+    def visitAction(self, location, frame, action):
+        if isinstance(action, (
+            frames.CaseActions.VarSet,
+            frames.CaseActions.VarAdd,
+            frames.CaseActions.PromptInt,
+            frames.CaseActions.PromptStr,
+        )):
+            self._definedVariables.add(action.varName)
+        elif isinstance(action, frames.CaseActions.VarEval):
+            try:
+                self._expressions.append((location, expressions.compileExpression(action.expression)))
+            except expressions.ExpressionError as e:
+                self.report(str(e), location)
+
+    def finish(self):
+        for location, expression in self._expressions:
+            for name in sorted(expression.variables - self._definedVariables):
+                self.report('Variable "' + name + '" is never set', location)
+
+
+@register
+class GroupFrameLimitRule(Rule):
+    """Groups with more frames than the objection's MAX_GROUP_FRAMES option."""
+    name = "group-frame-limit"
+
+    def visitGroup(self, groupIndex, group):
+        limit = self.objection.options.MAX_GROUP_FRAMES
+        if limit is not None and len(group.frames) > limit:
+            self.report("groups[" + str(groupIndex) + "] has " + str(len(group.frames)) + " frames, over the limit of " + str(limit))
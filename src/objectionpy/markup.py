@@ -0,0 +1,207 @@
+"""
+Module for working with objection.lol text markup.
+
+Frame text can contain tags in the form of `[#...]`, such as `[#ts50]` for changing the text speed or `[#bgm86956]` for playing music. This module splits texts into typed tokens, validates tags and finds the assets they reference.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator, Optional, Union
+from . import enums, assets
+
+
+@dataclass(frozen=True)
+class Token:
+    """
+    Part of a text.
+
+    Attributes:
+        - `start : int`
+            - Position of the token within the text.
+        - `end : int`
+            - Position right after the token within the text.
+        - `source : str`
+            - The token's text.
+    """
+    start: int
+    end: int
+    source: str
+
+
+@dataclass(frozen=True)
+class TextToken(Token):
+    """Plain text, displayed as-is."""
+
+
+@dataclass(frozen=True)
+class CommandToken(Token):
+    """
+    A valid markup tag.
+
+    Attributes:
+        - `command : TextCommand`
+            - The command of the tag.
+        - `value : Optional[Union[int, str]]`
+            - The tag's parameter - an amount or asset ID, or a color for COLOR tags.
+    """
+    command: enums.TextCommand
+    value: Optional[Union[int, str]] = None
+
+    @property
+    def asset(self) -> Optional[assets._Asset]:
+        """The asset referenced by the tag, if any."""
+        assetType = _assetCommandTypes.get(self.command)
+        return assetType(self.value) if assetType is not None else None
+
+
+@dataclass(frozen=True)
+class InvalidToken(Token):
+    """
+    A malformed markup tag.
+
+    Attributes:
+        - `reason : str`
+            - Description of the problem.
+    """
+    reason: str
+
+
+PARSE_CACHE_SIZE = 4096
+
+_tagPattern = re.compile(r'\[#[^\[\]]*\]|\[/#\]|\[#')
+_commandPattern = re.compile(r'([a-z]+)(\d*)')
+_commandsByTag = {command.value: command for command in enums.TextCommand}
+_valueCommands = frozenset((
+    enums.TextCommand.TEXT_SPEED,
+    enums.TextCommand.PAUSE,
+    enums.TextCommand.MUSIC,
+    enums.TextCommand.SOUND,
+    enums.TextCommand.EVIDENCE,
+    enums.TextCommand.EVIDENCE_ICON,
+))
+_assetCommandTypes: dict[enums.TextCommand, type] = {
+    enums.TextCommand.MUSIC: assets.Music,
+    enums.TextCommand.SOUND: assets.Sound,
+    enums.TextCommand.EVIDENCE: assets.Evidence,
+    enums.TextCommand.EVIDENCE_ICON: assets.Evidence,
+}
+
+
+@lru_cache(PARSE_CACHE_SIZE)
+def _parseTagSource(source: str) -> Union[tuple[enums.TextCommand, Optional[Union[int, str]]], str]:
+    # Returns the command and value of a tag, or the reason it's invalid
+    if source == '[/#]':
+        return enums.TextCommand.COLOR_END, None
+    if not source.endswith(']'):
+        return 'unclosed tag'
+
+    body = source[2:-1]
+    if body.startswith('/'):
+        if len(body) == 1:
+            return 'missing color'
+        return enums.TextCommand.COLOR, body[1:]
+
+    commandMatch = _commandPattern.fullmatch(body)
+    command = _commandsByTag.get(commandMatch[1]) if commandMatch else None
+    if command is None:
+        return 'unknown command "' + body + '"'
+    digits = commandMatch[2]
+    if command in _valueCommands:
+        if not digits:
+            return 'missing value for "' + command.value + '"'
+        return command, int(digits)
+    if digits:
+        return 'unexpected value for "' + command.value + '"'
+    return command, None
+
+
+def _parseTag(match: re.Match) -> Token:
+    start, end = match.span()
+    source = match[0]
+    parsed = _parseTagSource(source)
+    if type(parsed) is str:
+        return InvalidToken(start, end, source, parsed)
+    return CommandToken(start, end, source, *parsed)
+
+
+@lru_cache(PARSE_CACHE_SIZE)
+def tokenize(text: str) -> tuple[Token, ...]:
+    """
+    Split a text into plain text and tag tokens.
+
+    Results are cached by text, so repeated texts are only parsed once.
+
+    Args:
+        - `text : str`
+            - The text to tokenize.
+
+    Returns:
+        Tuple of TextToken, CommandToken and InvalidToken objects, covering the whole text in order.
+    """
+    tokens = []
+    position = 0
+    for match in _tagPattern.finditer(text):
+        if match.start() > position:
+            tokens.append(TextToken(position, match.start(), text[position:match.start()]))
+        tokens.append(_parseTag(match))
+        position = match.end()
+    if position < len(text):
+        tokens.append(TextToken(position, len(text), text[position:]))
+    return tuple(tokens)
+
+
+def validate(text: str) -> list[InvalidToken]:
+    """
+    Find the malformed tags of a text.
+
+    Args:
+        - `text : str`
+            - The text to validate.
+
+    Returns:
+        List of InvalidToken objects, empty if the text is valid.
+    """
+    if '[' not in text:
+        return []
+    invalid = []
+    for match in _tagPattern.finditer(text):
+        parsed = _parseTagSource(match[0])
+        if type(parsed) is str:
+            invalid.append(InvalidToken(match.start(), match.end(), match[0], parsed))
+    return invalid
+
+
+def iterAssetTags(text: str) -> Iterator[tuple[int, assets._Asset]]:
+    """
+    Iterate the asset tags of a text.
+
+    Args:
+        - `text : str`
+            - The text to scan.
+
+    Yields:
+        The position of each tag within the text and the asset it references.
+    """
+    for token in tokenize(text):
+        if type(token) is CommandToken and token.command in _assetCommandTypes:
+            yield token.start, token.asset
+
+
+def textAssets(text: str) -> list[assets._Asset]:
+    """
+    Get the assets referenced by the tags of a text.
+
+    Args:
+        - `text : str`
+            - The text to scan.
+
+    Returns:
+        The referenced assets in order of first appearance, without duplicates.
+    """
+    if '[#' not in text:
+        return []
+    collected = {}
+    for _, asset in iterAssetTags(text):
+        collected.setdefault(id(asset), asset)
+    return list(collected.values())
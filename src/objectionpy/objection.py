@@ -1,14 +1,22 @@
 """Main module containing everything related to objection exporting, importing, and structure (except for frame-related components)."""
 
+from collections import deque
+from contextlib import nullcontext
 from copy import deepcopy
+from itertools import islice
 from re import sub
 from dataclasses import dataclass, field
 from functools import cache
 from json import loads, dumps
 from base64 import b64decode, b64encode
+from binascii import a2b_base64
+from codecs import BOM_UTF8
+from mmap import mmap, ACCESS_READ
+from os import PathLike, fstat
 from warnings import warn
-from typing import Any, Optional, Sized, Union, TypeVar, TYPE_CHECKING
-from . import enums, _utils, frames, assets, preset, __version__
+from collections.abc import MutableSequence
+from typing import IO, Any, Callable, Iterator, NamedTuple, Optional, Sized, Union, TypeVar, TYPE_CHECKING
+from . import enums, _utils, _stream, frames, assets, markup, expressions, preset, reachability, __version__
 
 if TYPE_CHECKING:
     from enum import EnumMeta
@@ -20,9 +28,16 @@ LATEST_OBJECTION_VERSION = 4
 
 MISSING_REFERENCE_TAG = 'exception-missing-reference'
 
+STREAM_REFERENCE_WINDOW = 1000  # Frames dumpStreaming compiles ahead of writing, which forward references must fall within
+
 _Frame = frames.Frame
 
 
+def _frameHint(frame: _Frame) -> tuple:
+    # Equal frames are of the same type and have the same text, so frame maps only compare frames sharing both
+    return type(frame), frame.text
+
+
 @dataclass
 class Group:
     """
@@ -37,6 +52,7 @@ class Group:
             - A unique tag used to identify the group in case actions. (A direct reference to the group object works too)
         - `frames : list[Frame]`
             - The group's frame list. May be of type Frame or CEFrame.
+            - May also be an iterable such as a generator, consumed once by `dumpStreaming()` without holding every frame in memory.
     """
 
     _type: enums.GroupType = field(default=enums.GroupType.NORMAL, init=False)
@@ -97,6 +113,50 @@ class GameOverGroup(Group):
     _type = enums.GroupType.GAME_OVER
 
 
+class FrameLocation(NamedTuple):
+    """
+    Position of a frame within an objection.
+
+    Attributes:
+        - `groupIndex : int`
+            - Index of the frame's group.
+        - `sequence : str`
+            - The group's frame list containing the frame - `"frames"`, `"counselSequence"` or `"failureSequence"`.
+        - `frameIndex : int`
+            - Index of the frame within the sequence.
+        - `pressIndex : Optional[int]`
+            - For press frames, index of the frame within the statement's press sequence.
+    """
+    groupIndex: int
+    sequence: str
+    frameIndex: int
+    pressIndex: Optional[int] = None
+
+    def __str__(self) -> str:
+        path = "groups[" + str(self.groupIndex) + "]." + self.sequence + "[" + str(self.frameIndex) + "]"
+        if self.pressIndex is not None:
+            path += ".pressSequence[" + str(self.pressIndex) + "]"
+        return path
+
+
+@dataclass
+class PairPlan:
+    """
+    The pairs an objection's compilation would generate.
+
+    Attributes:
+        - `pairs : dict[tuple, list[FrameLocation]]`
+            - Maps each pair, as (characterId, characterId2, offset, offset2, front), to the frames using it. In order of first use, which is the order compilation creates pairs in.
+        - `limit : Optional[int]`
+            - The objection's MAX_PAIRS option.
+        - `overBudget : list[FrameLocation]`
+            - The frames using pairs past the limit, which would have to change for the objection to fit. Empty if it fits.
+    """
+    pairs: dict[tuple, list[FrameLocation]]
+    limit: Optional[int]
+    overBudget: list[FrameLocation]
+
+
 @dataclass
 class Options:
     """
@@ -131,15 +191,23 @@ class _ObjectionBase:
             - Default objection options.
         - `aliases : dict[str, str]`
             - Dictionary of aliases, mapping original name to alias.
+        - `lastPruneReport : Optional[PruneReport]`
+            - What the last compilation with `pruneUnreachable` left out.
     """
 
     _type: enums.ObjectionType
+    _compileHiddenFrames: bool = True
 
     options: Options
 
     aliases: dict[str, str]
     _groups: list[Group]
     _nextFrameIID: int
+    _loadContext: Optional["_LoadContext"] = None  # Set when lazily loaded
+    _fallbackBackground: Optional[assets.Background] = None
+    _pairOffsetGrid: Optional[int] = None
+    _streamedFrames: Optional[_utils._LiveIdentityMap] = None  # Set while streaming
+    lastPruneReport: Optional[reachability.PruneReport] = None
 
     def __init__(self, options: Optional[Options] = None) -> None:
         self.options = options if options is not None else Options()
@@ -152,22 +220,61 @@ class _ObjectionBase:
     ) -> frames.FrameCharacter:
         return char if char is not None else frames.noneCharacter
 
-    def _compileFrame(self, frame: _Frame, frameList: list[_Frame]):
-        try:
-            _utils._tupleMapGet(self._frameMap, frame)
-            frame = deepcopy(frame)  # Makes a copy if map get didn't fail
-        except KeyError:
-            pass
-
-        chars = (
-            self._verifyFrameChar(frame.char),
-            self._verifyFrameChar(frame.pairChar),
-        )
+    @classmethod
+    def _orderFrameChars(
+        cls, chars: tuple[frames.FrameCharacter, frames.FrameCharacter]
+    ) -> tuple[frames.FrameCharacter, frames.FrameCharacter]:
         activeIndex = _utils._maxIndex(
             [*map(lambda char: char._getIndividualValue(char.isActive), chars)]
         )
-        activeChar = chars[activeIndex]
-        secondaryChar = chars[1 - activeIndex]
+        return chars[activeIndex], chars[1 - activeIndex]
+
+    def _walkFrames(self, decode: bool = False) -> Iterator[tuple[Group, _Frame]]:
+        """Yield every frame that would be compiled along with its group, including CE sequences and press frames. Undecoded frames of lazy loads are skipped, unless decode is set."""
+        for group in self._groups:
+            sequences = [group.frames]
+            if isinstance(group, CEGroup):
+                sequences += [group.counselSequence, group.failureSequence]
+            for sequence in sequences:
+                for frame in sequence if decode else _compileEntries(sequence):
+                    if type(frame) is dict:
+                        continue
+                    if frame.hidden and not self._compileHiddenFrames:
+                        continue
+                    yield group, frame
+                    if isinstance(frame, frames.CEFrame):
+                        for pressFrame in frame.pressSequence:
+                            yield group, pressFrame
+
+    def _walkFrameLocations(self, decode: bool = False) -> Iterator[tuple[FrameLocation, Group, _Frame]]:
+        """Like _walkFrames, but also yield the location of each frame."""
+        for groupIndex, group in enumerate(self._groups):
+            sequences = [("frames", group.frames)]
+            if isinstance(group, CEGroup):
+                sequences += [("counselSequence", group.counselSequence), ("failureSequence", group.failureSequence)]
+            for sequenceName, sequence in sequences:
+                for frameIndex, frame in enumerate(sequence if decode else _compileEntries(sequence)):
+                    if type(frame) is dict:
+                        continue
+                    if frame.hidden and not self._compileHiddenFrames:
+                        continue
+                    yield FrameLocation(groupIndex, sequenceName, frameIndex), group, frame
+                    if isinstance(frame, frames.CEFrame):
+                        for pressIndex, pressFrame in enumerate(frame.pressSequence):
+                            yield FrameLocation(groupIndex, sequenceName, frameIndex, pressIndex), group, pressFrame
+
+    @classmethod
+    def _pairKey(
+        cls,
+        chars: tuple[frames.FrameCharacter, frames.FrameCharacter],
+        activeChar: frames.FrameCharacter,
+        secondaryChar: frames.FrameCharacter,
+        offsetGrid: Optional[int] = None,
+    ) -> Optional[tuple]:
+        # Key of the pair displaying a frame's characters, or None if no pair is needed.
+        # Characters are ordered by ID, so frames showing the same two characters the other way around share a pair.
+        if secondaryChar.isNone and activeChar.pairOffset == (0, 0):
+            return None
         frontChar = chars[
             _utils._maxIndex(
                 [
@@ -180,10 +287,182 @@ class _ObjectionBase:
                 ]
             )
         ]
+        pairChars = sorted(
+            (activeChar, secondaryChar),
+            key=lambda char: char.character.id
+            if char.character.id is not None
+            else 0,
+            reverse=True,
+        )
+        offsets = [char.pairOffset for char in pairChars]
+        if offsetGrid:
+            offsets = [(round(x / offsetGrid) * offsetGrid, round(y / offsetGrid) * offsetGrid) for x, y in offsets]
+        return (
+            pairChars[0].character.id,
+            pairChars[1].character.id,
+            tuple(offsets[0]),
+            tuple(offsets[1]),
+            pairChars[0] is frontChar,
+        )
+
+    def planPairs(self, pairOffsetGrid: Optional[int] = None) -> "PairPlan":
+        """
+        Find the pairs compilation would generate and the frames using each, without compiling.
+
+        Undecoded frames of lazy loads are left out, as they keep their loaded pairs.
+
+        Args:
+            - `pairOffsetGrid : Optional[int]`
+                - Snap pair offsets to multiples of this many pixels, as in `compile()`.
+
+        Returns:
+            The PairPlan.
+        """
+        pairs: dict[tuple, list[FrameLocation]] = {}
+        for location, _, frame in self._walkFrameLocations():
+            chars = (self._verifyFrameChar(frame.char), self._verifyFrameChar(frame.pairChar))
+            pairKey = self._pairKey(chars, *self._orderFrameChars(chars), pairOffsetGrid)
+            if pairKey is not None:
+                pairs.setdefault(pairKey, []).append(location)
+
+        limit = self.options.MAX_PAIRS
+        overBudget = []
+        if limit is not None:
+            for locations in list(pairs.values())[limit:]:
+                overBudget += locations
+        return PairPlan(pairs, limit, sorted(overBudget))
+
+    @classmethod
+    def _frameAssets(cls, frame: _Frame) -> Iterator[assets._Asset]:
+        for char in (frame.char, frame.pairChar):
+            if char is not None:
+                yield char.character
+        if frame.background is not None:
+            yield frame.background
+        if frame.popup is not None:
+            yield frame.popup
+        for character in frame.options.galleryAssign.__dict__.values():
+            if character is not None:
+                yield character
+        if frame.text:
+            yield from markup.textAssets(frame.text)
+
+    def collectAssets(self) -> list[assets._Asset]:
+        """
+        Collect every asset referenced by the objection's frames.
+
+        Returns:
+            The referenced assets in order of first appearance, without duplicates.
+        """
+        collected = {}
+        for _, frame in self._walkFrames():
+            for asset in self._frameAssets(frame):
+                if asset.id is not None:
+                    collected.setdefault(id(asset), asset)
+        return list(collected.values())
+
+    def requiredAssets(self) -> list[assets._Asset]:
+        """
+        Collect the assets whose data compilation reads, as opposed to only their IDs.
+
+        These are the active characters of frames without a background, whose default background is used instead.
+
+        Returns:
+            The required assets in order of first appearance, without duplicates. Includes already loaded assets.
+        """
+        collected = {}
+        for _, frame in self._walkFrames():
+            character = self._requiredAsset(frame)
+            if character is not None:
+                collected.setdefault(id(character), character)
+        return list(collected.values())
+
+    @classmethod
+    def _requiredAsset(cls, frame: _Frame) -> Optional[assets.Character]:
+        if frame.background is not None:
+            return None
+        activeChar, _ = cls._orderFrameChars(
+            (cls._verifyFrameChar(frame.char), cls._verifyFrameChar(frame.pairChar))
+        )
+        character = activeChar.character
+        return character if character.id is not None else None
+
+    def textAssetUsage(self) -> dict[assets._Asset, list[_Frame]]:
+        """
+        Find the assets referenced by tags in frame text, such as music, sounds and evidence.
+
+        Returns:
+            Dictionary mapping each referenced asset to the frames using it, in order of first appearance.
+        """
+        usage: dict[assets._Asset, list[_Frame]] = {}
+        for _, frame in self._walkFrames():
+            if frame.text:
+                for asset in markup.textAssets(frame.text):
+                    usage.setdefault(asset, []).append(frame)
+        return usage
+
+    def missingTextAssets(self, maxWorkers: int = 8) -> dict[assets._Asset, list[_Frame]]:
+        """
+        Request the assets referenced by tags in frame text concurrently, and find the ones that don't exist.
+
+        Args:
+            - `maxWorkers : int`
+                - The maximum number of concurrent requests per asset type.
+
+        Returns:
+            Dictionary mapping each missing asset to the frames using it.
+        """
+        usage = self.textAssetUsage()
+        assets.prefetch(usage.keys(), maxWorkers)
+        return {asset: frameList for asset, frameList in usage.items() if not asset.exists}
+
+    def invalidMarkup(self) -> list[tuple[_Frame, markup.InvalidToken]]:
+        """
+        Find malformed text markup tags in all frames.
+
+        Returns:
+            List of frames and their malformed tags, in frame order.
+        """
+        return [
+            (frame, token)
+            for _, frame in self._walkFrames()
+            if frame.text
+            for token in markup.validate(frame.text)
+        ]
+
+    def prefetchAssets(self, maxWorkers: int = 8):
+        """
+        Request the data of every asset referenced by the objection in batches, instead of one at a time on first access.
+
+        Args:
+            - `maxWorkers : int`
+                - The maximum number of concurrent requests per asset type.
+        """
+        assets.prefetch(self.collectAssets(), maxWorkers)
+
+    def _compileFrame(self, frame: _Frame, frameList: list[_Frame]):
+        try:
+            self._frameMap.get(frame)
+            frame = deepcopy(frame)  # Makes a copy if map get didn't fail
+        except KeyError:
+            pass
+
+        chars = (
+            self._verifyFrameChar(frame.char),
+            self._verifyFrameChar(frame.pairChar),
+        )
+        activeChar, secondaryChar = self._orderFrameChars(chars)
+
+        iid = getattr(frame, "_loadedIID", None)
+        if iid is None or iid in self._usedLoadedIIDs:
+            iid = self._nextFrameIID
+            self._nextFrameIID += 1
+        else:
+            self._usedLoadedIIDs.add(iid)
 
         frameDict = {
             "id": -1,
-            "iid": self._nextFrameIID,
+            "iid": iid,
             "text": frame.text,
             "characterId": activeChar.character.id
             if not activeChar.character.isPreset
@@ -199,6 +478,8 @@ class _ObjectionBase:
             "popupId": frame.popup.id if frame.popup is not None else None,
             "backgroundId": frame.background.id
             if frame.background is not None
+            else self._fallbackBackground.id
+            if self._fallbackBackground is not None and not activeChar.character._loaded
             else activeChar.character.backgroundId,
             "transition": {},
             "filter": {},
@@ -215,7 +496,6 @@ class _ObjectionBase:
             if frame.caseTag in self._frameTags:
                 raise ObjectionError('Duplicate frame tag "' + frame.caseTag + '"')
             self._frameTags[frame.caseTag] = frameDict
-        self._nextFrameIID += 1
 
         if frame.transition:
             frameDict["transition"]["duration"] = frame.transition.duration
@@ -366,25 +646,9 @@ class _ObjectionBase:
         activeFlip = "1" if activeChar.flip else "0"
         secondaryFlip = "0"
         
-        if not secondaryChar.isNone or activeChar.pairOffset != (0, 0):
-            pairNeeded = True
-        else:
-            pairNeeded = False
-        if pairNeeded:
-            pairChars = [activeChar, secondaryChar]
-            pairChars.sort(
-                key=lambda char: char.character.id
-                if char.character.id is not None
-                else 0,
-                reverse=True,
-            )
-            pair = self._requestPair(
-                pairChars[0].character.id,
-                pairChars[1].character.id,
-                pairChars[0].pairOffset,
-                pairChars[1].pairOffset,
-                True if pairChars[0] is frontChar else False,
-            )
+        pairKey = self._pairKey(chars, activeChar, secondaryChar, self._pairOffsetGrid)
+        if pairKey is not None:
+            pair = self._requestPair(*pairKey)
             frameDict["pairId"] = pair["pairId"]
 
             pairChar0 = activeChar if pair["characterId"] == activeChar.character.id else secondaryChar
@@ -411,18 +675,274 @@ class _ObjectionBase:
 
         return frameDict
 
-    def compile(self) -> dict:
+    def compile(
+        self,
+        offline: bool = False,
+        fallbackBackground: Optional[assets.Background] = None,
+        pruneUnreachable: bool = False,
+        pairOffsetGrid: Optional[int] = None,
+    ) -> dict:
         """
         Compile objection.
 
+        Args:
+            - `offline : bool`
+                - Compile without requesting any asset data. Use `requiredAssets()` to find the assets that must be loaded beforehand.
+            - `fallbackBackground : Optional[Background]`
+                - In offline mode, the background of frames whose background would be taken from a character that isn't loaded.
+            - `pruneUnreachable : bool`
+                - Leave out frames and groups that can never be played, hidden court record items that are never shown, and pairs only they used. What was left out is stored in `lastPruneReport`. Limits are checked after pruning.
+            - `pairOffsetGrid : Optional[int]`
+                - Snap pair offsets to multiples of this many pixels, so that frames with near-identical offsets share a pair. Use `planPairs()` to preview the pairs.
+
         Raises:
             - `ObjectionError`
                 - Duplicate case tag was found.
                 - CEFrame was found in the wrong group.
+                - A frame list is an iterator, which only `dumpStreaming()` can consume.
+            - `BrokenReferenceError`
+                - A case action or contradiction references a frame, group or court record item that isn't part of the case. Checked before anything is compiled or requested.
+            - `AssetOfflineError`
+                - In offline mode, a required asset isn't loaded and no fallback was given.
 
         Returns:
             JSON-serializable dictionary in the .objection format.
         """
+        for sequence in self._frameSequences():
+            if isinstance(sequence, Iterator):
+                raise ObjectionError("A frame list is an iterator that can only be consumed once. Use dumpStreaming() to export it")
+        self._validate()
+        self._pairOffsetGrid = pairOffsetGrid
+        try:
+            if not offline:
+                # Request the assets compilation depends on up front, rather than one at a time mid-compile
+                assets.prefetch(self.requiredAssets())
+                objectionDict = self._compile()
+            else:
+                if fallbackBackground is None:
+                    for asset in self.requiredAssets():
+                        if not asset._loaded:
+                            raise assets.AssetOfflineError(asset)
+                self._fallbackBackground = fallbackBackground
+                try:
+                    with assets.offline():
+                        objectionDict = self._compile()
+                finally:
+                    self._fallbackBackground = None
+        finally:
+            self._pairOffsetGrid = None
+
+        if pruneUnreachable:
+            self.lastPruneReport = reachability.prune(objectionDict)
+        self._checkLimits(objectionDict)
+        return objectionDict
+
+    def _frameSequences(self) -> Iterator:
+        for group in self._groups:
+            yield group.frames
+            if isinstance(group, CEGroup):
+                yield group.counselSequence
+                yield group.failureSequence
+
+    def dumpStreaming(
+        self,
+        fp: IO,
+        raw: bool = False,
+        offline: bool = False,
+        fallbackBackground: Optional[assets.Background] = None,
+        pairOffsetGrid: Optional[int] = None,
+        referenceWindow: int = STREAM_REFERENCE_WINDOW,
+    ):
+        """
+        Compile the objection into a .objection file object frame by frame, holding a bounded number of frames in memory.
+
+        Frame lists may be iterables such as generators, which are consumed once. Frames are compiled referenceWindow frames ahead of being written, so case actions and contradictions can reference frames up to that many frames ahead. References to earlier frames by tag, or to frame objects that are still alive, always resolve. Asset data is requested a window of frames at a time.
+
+        The result loads the same as compile()'s, but groups are written before pairs and the court record, and press frames are numbered as their statements are written.
+
+        Args:
+            - `fp : IO`
+                - File object to write to, opened in text or binary mode.
+            - `raw : bool`
+                - Write raw JSON instead of base64. Defaults to False.
+            - `offline : bool`
+                - Compile without requesting any asset data, as in `compile()`.
+            - `fallbackBackground : Optional[Background]`
+                - In offline mode, the background of frames whose background would be taken from a character that isn't loaded.
+            - `pairOffsetGrid : Optional[int]`
+                - Snap pair offsets to multiples of this many pixels, as in `compile()`.
+            - `referenceWindow : int`
+                - The number of frames compiled ahead of the frame being written.
+
+        Raises:
+            - `ObjectionError`
+                - Duplicate case tag was found.
+                - CEFrame was found in the wrong group.
+                - A frame references a frame, group or court record item that isn't part of the case, or a frame further ahead than referenceWindow.
+            - `BrokenReferenceError`
+                - When no frame list is an iterator, references are checked before anything is written, as in `compile()`.
+            - `AssetOfflineError`
+                - In offline mode, a required asset isn't loaded and no fallback was given.
+        """
+        if not any(isinstance(sequence, Iterator) for sequence in self._frameSequences()):
+            self._validate()
+        self._pairOffsetGrid = pairOffsetGrid
+        self._fallbackBackground = fallbackBackground if offline else None
+        try:
+            with assets.offline() if offline else nullcontext():
+                self._dumpStreaming(_stream.TextWriter(fp, raw), not offline, referenceWindow)
+        finally:
+            self._pairOffsetGrid = None
+            self._fallbackBackground = None
+            self._streamedFrames = None
+            self._frameMap = None
+
+    def _streamedEntries(self, sequence, prefetch: bool, batchSize: int) -> Iterator[_Frame]:
+        # Yields a frame list's frames, requesting the asset data of each batch of them at once
+        iterator = iter(sequence)
+        while True:
+            batch = list(islice(iterator, batchSize))
+            if not batch:
+                return
+            if prefetch:
+                batchFrames = [*batch, *(pressFrame for frame in batch if isinstance(frame, frames.CEFrame) for pressFrame in frame.pressSequence)]
+                assets.prefetch(asset for asset in map(self._requiredAsset, batchFrames) if asset is not None)
+            yield from batch
+
+    def _dumpStreaming(self, writer: _stream.TextWriter, prefetch: bool, referenceWindow: int):
+        objectionDict = self._compileHeader()
+        self._streamedFrames = _utils._LiveIdentityMap()
+
+        groupDicts = []
+        for i, group in enumerate(self._groups):
+            name = group.name
+            if not name:
+                name = "Generated " + str(self._nextGeneratedGroupName)
+                self._nextGeneratedGroupName += 1
+            groupDict = {"iid": i + 1, "name": name, "type": group._type.value}
+            if group.caseTag:
+                if group.caseTag in self._groupTags:
+                    raise ObjectionError('Duplicate group tag "' + group.caseTag + '"')
+                self._groupTags[group.caseTag] = groupDict
+            self._groupMap.append((group, groupDict))  # Registered up front, so later groups can be referenced
+            groupDicts.append(groupDict)
+        LimitWarning.checkList(groupDicts, self.options.MAX_GROUPS, "groups")
+
+        pending = deque()  # Text, and compiled frames whose references aren't resolved yet
+        pendingFrames = 0
+        firstInList = True
+
+        def writeNext():
+            nonlocal pendingFrames, firstInList
+            entry = pending.popleft()
+            if type(entry) is str:
+                writer.write(entry)
+                firstInList = entry.endswith("[")
+                return
+            frame, frameDict = entry
+            pendingFrames -= 1
+            try:
+                self._finishStreamedFrame(frame, frameDict)
+            except KeyError as e:
+                raise ObjectionError(
+                    "Frame iid=" + str(frameDict["iid"]) + " references a frame, group or court record item that isn't part of the case, "
+                    "or a frame more than " + str(referenceWindow) + " frames ahead"
+                ) from e
+            writer.write(dumps(frameDict) if firstInList else ", " + dumps(frameDict))
+            firstInList = False
+            while len(self._frameMap) > 2 * referenceWindow:
+                self._evictStreamedFrame(*self._frameMap.popleft())
+
+        writer.write(dumps({key: objectionDict[key] for key in ("credit", "version", "aliases", "options", "type")})[:-1] + ', "groups": [')
+        for i, group in enumerate(self._groups):
+            pending.append((", " if i else "") + dumps(groupDicts[i])[:-1] + ', "frames": [')
+            sequences = [("frames", group.frames)]
+            if isinstance(group, CEGroup):
+                sequences += [("counselFrames", group.counselSequence), ("failureFrames", group.failureSequence)]
+            for sequenceKey, sequence in sequences:
+                if sequenceKey != "frames":
+                    if isinstance(sequence, Sized) and len(sequence) == 0:
+                        continue
+                    pending.append('], "' + sequenceKey + '": [')
+                frameCount = 0
+                for frame in self._streamedEntries(sequence, prefetch, referenceWindow):
+                    if frame.hidden and not self._compileHiddenFrames:
+                        continue
+                    if isinstance(frame, frames.CEFrame):
+                        if sequenceKey == "counselFrames":
+                            raise ObjectionError("CEFrame found within counsel sequence")
+                        if sequenceKey == "failureFrames":
+                            raise ObjectionError("CEFrame found within failure sequence")
+                        if not isinstance(group, CEGroup):
+                            raise ObjectionError("CEFrame found in non-CE group")
+                    frameDict = self._compileFrame(frame, frameList=[])
+                    self._streamedFrames.setdefault(frame, {"iid": frameDict["iid"]})
+                    self._frameTags.setdefault(MISSING_REFERENCE_TAG, {"iid": frameDict["iid"]})
+                    pending.append((frame, frameDict))
+                    pendingFrames += 1
+                    frameCount += 1
+                    while pendingFrames > referenceWindow:
+                        writeNext()
+                if sequenceKey == "frames" and self.options.MAX_GROUP_FRAMES is not None and frameCount > self.options.MAX_GROUP_FRAMES:
+                    LimitWarning.warn(self.options.MAX_GROUP_FRAMES, "frames in a group (group iid=" + str(i + 1) + ")", frameCount)
+            pending.append("]}")
+        while pending:
+            writeNext()
+
+        writer.write('], "pairs": ' + dumps(objectionDict["pairs"]) + ', "courtRecord": ' + dumps(objectionDict["courtRecord"]) + "}")
+        writer.close()
+
+        LimitWarning.checkList(objectionDict["pairs"], self.options.MAX_PAIRS, "pairs")
+        LimitWarning.checkList(objectionDict["courtRecord"]["evidence"], self.options.MAX_EVIDENCE, "evidence")
+        LimitWarning.checkList(objectionDict["courtRecord"]["profiles"], self.options.MAX_PROFILES, "profiles")
+
+    def _finishStreamedFrame(self, frame: _Frame, frameDict: dict):
+        """Resolve the references of a streamed frame before it's written."""
+
+    def _evictStreamedFrame(self, frame: _Frame, frameDict: dict):
+        # Tags of frames that left the window keep resolving to their IID, without holding on to their dicts
+        if frame.caseTag and self._frameTags.get(frame.caseTag) is frameDict:
+            self._frameTags[frame.caseTag] = {"iid": frameDict["iid"]}
+
+    def _checkLimits(self, objectionDict: dict):
+        for groupDict in objectionDict["groups"]:
+            LimitWarning.checkList(
+                groupDict["frames"],
+                self.options.MAX_GROUP_FRAMES,
+                "frames in a group (group iid=" + str(groupDict["iid"]) + ")",
+            )
+        LimitWarning.checkList(
+            objectionDict["groups"], self.options.MAX_GROUPS, "groups"
+        )
+        pairLimit = self.options.MAX_PAIRS
+        if pairLimit is not None and len(objectionDict["pairs"]) > pairLimit:
+            # Name the frames using the pairs past the limit, in the order pairs were first used
+            excessPairIds = {pair["pairId"] for pair in objectionDict["pairs"][pairLimit:]}
+            excessFrameIids = [
+                frameDict["iid"]
+                for groupDict in objectionDict["groups"]
+                for key in ("frames", "counselFrames", "failureFrames")
+                for parentDict in groupDict.get(key, ())
+                for frameDict in (parentDict, *parentDict.get("pressFrames", ()))
+                if frameDict.get("pairId") in excessPairIds
+            ]
+            LimitWarning.warn(
+                pairLimit,
+                "pairs (frames using pairs past the limit: iid=" + ", ".join(map(str, excessFrameIids)) + ")",
+                len(objectionDict["pairs"]),
+            )
+        LimitWarning.checkList(
+            objectionDict["courtRecord"]["evidence"], self.options.MAX_EVIDENCE, "evidence"
+        )
+        LimitWarning.checkList(
+            objectionDict["courtRecord"]["profiles"], self.options.MAX_PROFILES, "profiles"
+        )
+
+    def _validate(self):
+        """Check the objection before compilation starts."""
+
+    def _compileHeader(self) -> dict:
+        # Creates the objection dict without frames, and resets the state compilation of frames uses
         objectionDict = {
             "credit": "made with objection.py v" + __version__,
             "version": LATEST_OBJECTION_VERSION,
@@ -459,7 +979,8 @@ class _ObjectionBase:
             objectionDict["aliases"], self.options.MAX_ALIASES, "aliases"
         )
 
-        nextPairID = 1
+        loadContext = self._loadContext
+        nextPairID = loadContext.maxPairID + 1 if loadContext else 1
 
         @cache
         def requestPair(
@@ -487,13 +1008,30 @@ class _ObjectionBase:
             return pair
 
         self._requestPair = requestPair
-
-        self._nextFrameIID = 1
+        self._reusedPairIDs = set()
+        self._nextFrameIID = loadContext.maxFrameIID + 1 if loadContext else 1
+        self._usedLoadedIIDs = set()
+        self._reusedFrameDicts = {}
         self._nextGeneratedGroupName = 1
         self._groupMap = []
-        self._frameMap = []
+        self._frameMap = _utils._TupleMap(_frameHint)
         self._groupTags = {}
         self._frameTags = {}
+        return objectionDict
+
+    def _reuseFrameDict(self, frameDict: dict, objectionDict: dict) -> dict:
+        # Keeps the dict of a lazily loaded frame that was never decoded, along with its pair
+        for reusedDict in (frameDict, *frameDict.get("pressFrames", ())):
+            self._usedLoadedIIDs.add(reusedDict["iid"])
+            self._reusedFrameDicts[reusedDict["iid"]] = reusedDict
+            pairId = reusedDict.get("pairId")
+            if pairId is not None and pairId not in self._reusedPairIDs and pairId in self._loadContext.pairs:
+                self._reusedPairIDs.add(pairId)
+                objectionDict["pairs"].append(self._loadContext.pairs[pairId])
+        return frameDict
+
+    def _compile(self) -> dict:
+        objectionDict = self._compileHeader()
         for i, group in enumerate(self._groups):
             name = group.name
             if not name:
@@ -512,7 +1050,13 @@ class _ObjectionBase:
                     raise ObjectionError('Duplicate group tag "' + group.caseTag + '"')
                 self._groupTags[group.caseTag] = groupDict
 
-            for frame in group.frames:
+            for frame in _compileEntries(group.frames):
+                hidden = frame.get("hide") if type(frame) is dict else frame.hidden
+                if hidden and not self._compileHiddenFrames:
+                    continue
+                if type(frame) is dict:
+                    groupDict["frames"].append(self._reuseFrameDict(frame, objectionDict))
+                    continue
                 if isinstance(frame, frames.CEFrame) and not isinstance(group, CEGroup):
                     raise ObjectionError("CEFrame found in non-CE group")
                 frameDict = self._compileFrame(frame, frameList=groupDict["frames"])
@@ -521,7 +1065,10 @@ class _ObjectionBase:
             if isinstance(group, CEGroup):
                 if len(group.counselSequence) > 0:
                     groupDict["counselFrames"] = []
-                    for frame in group.counselSequence:
+                    for frame in _compileEntries(group.counselSequence):
+                        if type(frame) is dict:
+                            groupDict["counselFrames"].append(self._reuseFrameDict(frame, objectionDict))
+                            continue
                         if isinstance(frame, frames.CEFrame):
                             raise ObjectionError(
                                 "CEFrame found within counsel sequence"
@@ -533,7 +1080,10 @@ class _ObjectionBase:
                         )
                 if len(group.failureSequence) > 0:
                     groupDict["failureFrames"] = []
-                    for frame in group.failureSequence:
+                    for frame in _compileEntries(group.failureSequence):
+                        if type(frame) is dict:
+                            groupDict["failureFrames"].append(self._reuseFrameDict(frame, objectionDict))
+                            continue
                         if isinstance(frame, frames.CEFrame):
                             raise ObjectionError(
                                 "CEFrame found within failure sequence"
@@ -546,15 +1096,6 @@ class _ObjectionBase:
 
             self._groupMap.append((group, groupDict))
             objectionDict["groups"].append(groupDict)
-            LimitWarning.checkList(
-                groupDict["frames"],
-                self.options.MAX_GROUP_FRAMES,
-                "frames in a group (group iid=" + str(groupDict["iid"]) + ")",
-            )
-        LimitWarning.checkList(
-            objectionDict["groups"], self.options.MAX_GROUPS, "groups"
-        )
-        LimitWarning.checkList(objectionDict["pairs"], self.options.MAX_PAIRS, "pairs")
 
         return objectionDict
 
@@ -576,9 +1117,11 @@ class Scene(_ObjectionBase):
             - Dictionary of aliases, mapping original name to alias.
         - `frames : list[Frames]`
             - The scene's frame list. Primary way of modifying scenes.
+            - May also be an iterable such as a generator, consumed once by `dumpStreaming()` without holding every frame in memory.
     """
 
     _type = enums.ObjectionType.SCENE
+    _compileHiddenFrames = False  # Hidden frames are never shown in scenes, so they're skipped before compilation
 
     def __init__(self, options: Optional[Options] = None) -> None:
         super().__init__(options)
@@ -589,15 +1132,9 @@ class Scene(_ObjectionBase):
     def frames(self) -> list[_Frame]:
         return self._groups[0].frames
 
-    def compile(self) -> dict:
-        objectionDict = super().compile()
-
-        compiledFrames = self._groupMap[0][1]["frames"]
-        for frameDict in [*compiledFrames]:
-            if frameDict.get("hide"):
-                compiledFrames.remove(frameDict)
-
-        return objectionDict
+    @frames.setter
+    def frames(self, frames: list[_Frame]):
+        self._groups[0].frames = frames
 
 
 class Case(_ObjectionBase):
@@ -665,7 +1202,74 @@ class Case(_ObjectionBase):
             except KeyError:
                 raise KeyError(errorText)
 
+    def invalidExpressions(self) -> list[tuple[_Frame, str]]:
+        """
+        Find VarEval expressions that are malformed or read variables no case action sets.
+
+        Returns:
+            List of frames and descriptions of their problems, in frame order.
+        """
+        definedVariables = set()
+        evalFrames = []
+        for _, frame in self._walkFrames(decode=True):
+            action = frame.caseAction
+            if isinstance(action, (
+                frames.CaseActions.VarSet,
+                frames.CaseActions.VarAdd,
+                frames.CaseActions.PromptInt,
+                frames.CaseActions.PromptStr,
+            )):
+                definedVariables.add(action.varName)
+            elif isinstance(action, frames.CaseActions.VarEval):
+                evalFrames.append(frame)
+
+        problems = []
+        for frame in evalFrames:
+            try:
+                expression = expressions.compileExpression(frame.caseAction.expression)
+            except expressions.ExpressionError as e:
+                problems.append((frame, str(e)))
+                continue
+            for name in sorted(expression.variables - definedVariables):
+                problems.append((frame, 'Variable "' + name + '" is never set'))
+        return problems
+
+    def brokenReferences(self) -> list["BrokenReference"]:
+        """
+        Find every case action and contradiction reference to a frame, group or court record item that isn't part of the case, in a single pass.
+
+        Compilation runs this check first, so that broken references are reported all at once before any frame is compiled.
+
+        Returns:
+            List of BrokenReference objects, in frame order.
+        """
+        collector = _ReferenceCollector(self)
+        for location, _, frame in self._walkFrameLocations():
+            collector.visit(location, frame)
+        return collector.broken()
+
+    def _undecodedFrameIIDs(self) -> set[int]:
+        # IIDs of lazily loaded frames that are still undecoded dicts, including their press frames
+        iids = set()
+        for group in self._groups:
+            sequences = [group.frames]
+            if isinstance(group, CEGroup):
+                sequences += [group.counselSequence, group.failureSequence]
+            for sequence in sequences:
+                for entry in _compileEntries(sequence):
+                    if type(entry) is dict:
+                        iids.add(entry["iid"])
+                        iids.update(pressDict["iid"] for pressDict in entry.get("pressFrames", ()))
+        return iids
+
     def _getFrameDict(self, frameParam: Union[str, _Frame]) -> dict:
+        if isinstance(frameParam, _LazyFrameMixin) and frameParam._loadedIID in self._reusedFrameDicts:
+            return self._reusedFrameDicts[frameParam._loadedIID]  # Decoded after its dict was already reused
+        if self._streamedFrames is not None and type(frameParam) is not str:
+            try:
+                return self._streamedFrames.get(frameParam)
+            except KeyError:
+                pass  # Falls back to frames in the window that are equal to it
         return self._getByTagOrObj(
             frameParam,
             objMap=self._frameMap,
@@ -684,7 +1288,7 @@ class Case(_ObjectionBase):
     def _post_process_frame(self, processedList: list, frame: _Frame, frameDict: dict):
         if frame in processedList:
             return
-        processedList.append(frame)
+        processedList.append((frame, None))
 
         if isinstance(frame, frames.CEFrame):
             if len(frame.pressSequence) > 0:
@@ -711,166 +1315,32 @@ class Case(_ObjectionBase):
         action = frame.caseAction
         if action is None:
             return
-        actionId: int = -1
-        actionValue: Any = None
-
-        if isinstance(action, frames.CaseActions.ToggleEvidence):
-            actionId = 16
-            actionValue = {
-                "show": [],
-                "hide": [],
-            }
-            item: Case.RecordItem
-            for item in action.show:
-                actionValue["show"].append(item._getIid(self._recordMap))
-            for item in action.hide:
-                actionValue["hide"].append(item._getIid(self._recordMap))
-
-        elif isinstance(action, frames.CaseActions.ToggleFrames):
-            actionId = 3
-            actionValue = {
-                "show": "",
-                "hide": "",
-            }
-            for frameParam in action.show:
-                targetframeDict: dict = self._getFrameDict(frameParam)
-                actionValue["show"] += str(targetframeDict["iid"]) + " "
-            for frameParam in action.hide:
-                targetframeDict: dict = self._getFrameDict(frameParam)
-                actionValue["hide"] += str(targetframeDict["iid"]) + " "
-            for key in ("show", "hide"):
-                if len(actionValue[key]) > 0:
-                    actionValue[key] = actionValue[key].strip()
-
-        elif isinstance(action, frames.CaseActions.GoToFrame):
-            actionId = 4
-            actionValue = str(self._getFrameDict(action.frame)["iid"])
-
-        elif isinstance(action, frames.CaseActions.SetGameOverGroup):
-            actionId = 15
-            actionValue = str(self._getGroupDict(action.group)["iid"])
-
-        elif isinstance(action, frames.CaseActions.EndGame):
-            actionId = 5
-
-        elif isinstance(
-            action,
-            (
-                frames.CaseActions.HealthSet,
-                frames.CaseActions.HealthAdd,
-                frames.CaseActions.HealthRemove,
-            ),
-        ):
-            actionId = 6
-            actionValue = {"amount": int(action.amount * 100)}
-            if isinstance(action, frames.CaseActions.HealthSet):
-                actionValue["type"] = 0
-            elif isinstance(action, frames.CaseActions.HealthAdd):
-                actionValue["type"] = 1
-            elif isinstance(action, frames.CaseActions.HealthRemove):
-                actionValue["type"] = 2
-
-        elif isinstance(action, frames.CaseActions.FlashingHealth):
-            actionId = 7
-            actionValue = str(int(action.amount * 100))
-
-        elif isinstance(action, frames.CaseActions.PromptPresent):
-            actionId = 8
-            actionValue = {
-                "evidence": action.presentEvidence,
-                "profiles": action.presentProfiles,
-                "falseFid": str(self._getFrameDict(action.failFrame)["iid"]),
-                "items": [],
-            }
-
-            for recordItem, frameParam in action.choices:
-                actionValue["items"].append(
-                    {
-                        "eid": recordItem._getIid(self._recordMap),
-                        "fid": str(self._getFrameDict(frameParam)["iid"]),
-                    }
-                )
-
-        elif isinstance(action, frames.CaseActions.PromptChoice):
-            actionId = 9
-            actionValue = []
-            for choiceText, frameParam in action.choices:
-                actionValue.append(
-                    {
-                        "text": choiceText,
-                        "fid": str(self._getFrameDict(frameParam)["iid"]),
-                    }
-                )
-
-        elif isinstance(
-            action, (frames.CaseActions.PromptInt, frames.CaseActions.PromptStr)
-        ):
-            actionId = 12
-            actionValue = {
-                "name": action.varName,
-                "type": "int",
-            }
-            if isinstance(action, frames.CaseActions.PromptStr):
-                actionValue["lowercase"] = action.toLower
-                actionValue["type"] = "string"
-                if not action.allowSpaces:
-                    actionValue["type"] = "word"
-
-        elif isinstance(action, frames.CaseActions.PromptCursor):
-            actionId = 17
-            actionValue = {
-                "imageUrl": action.previewImageUrl,
-                "prompt": action.prompt,
-                "color": str(action.cursorColor),
-                "falseFid": str(self._getFrameDict(action.failFrame)["iid"]),
-                "areas": [],
-            }
-
-            for cursorRect, frameParam in action.choices:
-                actionValue["areas"].append(
-                    {
-                        "fid": str(self._getFrameDict(frameParam)["iid"]),
-                        "shape": {
-                            "left": cursorRect.left,
-                            "top": cursorRect.top,
-                            "width": cursorRect.width,
-                            "height": cursorRect.height,
-                        },
-                    }
-                )
-
-        elif isinstance(action, frames.CaseActions.VarSet):
-            actionId = 10
-            actionValue = {
-                "name": action.varName,
-                "value": action.value,
-            }
-
-        elif isinstance(action, frames.CaseActions.VarAdd):
-            actionId = 11
-            actionValue = {
-                "name": action.varName,
-                "value": str(action.value),
-            }
-
-        elif isinstance(action, frames.CaseActions.VarEval):
-            actionId = 14
-            actionValue = {
-                "expression": action.expression,
-                "trueFid": str(self._getFrameDict(action.trueFrame)["iid"]),
-                "falseFid": str(self._getFrameDict(action.falseFrame)["iid"]),
-            }
-
-        if actionId == -1:
+        for actionType in type(action).__mro__:
+            if actionType in _caseActionEncoders:
+                actionId, encoder = _caseActionEncoders[actionType]
+                break
+        else:
             raise TypeError("unknown case action")
 
         actionObject = {
             "id": actionId,
-            "value": actionValue,
+            "value": encoder(self, action),
         }
         frameDict["caseAction"] = actionObject
 
-    def compile(self) -> dict:
+    def _finishStreamedFrame(self, frame: _Frame, frameDict: dict):
+        self._post_process_frame([], frame, frameDict)
+        if isinstance(frame, frames.CEFrame):
+            for pressFrame, pressDict in zip(frame.pressSequence, frameDict.get("pressFrames", ())):
+                self._streamedFrames.setdefault(pressFrame, {"iid": pressDict["iid"]})
+                self._post_process_frame([], pressFrame, pressDict)
+
+    def _validate(self):
+        brokenReferences = self.brokenReferences()
+        if brokenReferences:
+            raise BrokenReferenceError(brokenReferences)
+
+    def _compileHeader(self) -> dict:
         self._recordMap = []
         courtRecord = {
             "evidence": [],
@@ -891,21 +1361,19 @@ class Case(_ObjectionBase):
                 }
                 courtRecord[recordKey].append(recordObject)
                 self._recordMap.append((item, recordObject))
-        LimitWarning.checkList(
-            courtRecord["evidence"], self.options.MAX_EVIDENCE, "evidence"
-        )
-        LimitWarning.checkList(
-            courtRecord["profiles"], self.options.MAX_PROFILES, "profiles"
-        )
 
-        objectionDict = super().compile()
+        objectionDict = super()._compileHeader()
         objectionDict["courtRecord"] = courtRecord
+        return objectionDict
 
-        self._frameTags[MISSING_REFERENCE_TAG] = self._frameMap[0][1]
+    def _compile(self) -> dict:
+        objectionDict = super()._compile()
+        if self._frameMap:
+            self._frameTags[MISSING_REFERENCE_TAG] = self._frameMap[0][1]
 
         frame: _Frame
         frameDict: dict
-        processedList = []
+        processedList = _utils._TupleMap(_frameHint)
         for i in range(2):  # Looping twice to process newly-generated press frames too
             for frame, frameDict in [*self._frameMap]:
                 self._post_process_frame(processedList, frame, frameDict)
@@ -944,72 +1412,688 @@ class ObjectionError(Exception):
     pass
 
 
+@dataclass
+class BrokenReference:
+    """
+    A reference to a frame, group or court record item that isn't part of the case.
+
+    Attributes:
+        - `location : FrameLocation`
+            - Location of the referencing frame.
+        - `source : str`
+            - What holds the reference - the case action's type name, or `"contradiction"`.
+        - `kind : str`
+            - What's referenced - `"frame"`, `"group"` or `"record item"`.
+        - `reference : Any`
+            - The referenced caseTag or object.
+    """
+    location: FrameLocation
+    source: str
+    kind: str
+    reference: Any
+
+    @property
+    def message(self) -> str:
+        if type(self.reference) is str:
+            return self.source + " references missing " + self.kind + ' tag "' + self.reference + '"'
+        return self.source + " references a " + self.kind + " that isn't part of the case"
+
+    def __str__(self) -> str:
+        return str(self.location) + ": " + self.message
+
+
+class BrokenReferenceError(ObjectionError):
+    """
+    Raised when compiling a case with references to frames, groups or court record items that aren't part of it.
+
+    Attributes:
+        - `references : list[BrokenReference]`
+            - Every broken reference of the case.
+    """
+
+    def __init__(self, references: list[BrokenReference]) -> None:
+        super().__init__(
+            str(len(references)) + " broken reference" + ("s" if len(references) != 1 else "") + ":\n"
+            + "\n".join(map(str, references))
+        )
+        self.references = references
+
+
+def _iterFrameReferences(frame: _Frame) -> Iterator[tuple[str, str, Any]]:
+    # Yields the source, kind and target of each reference a frame holds
+    action = frame.caseAction
+    if action is not None:
+        source = type(action).__name__
+        if isinstance(action, frames.CaseActions.ToggleFrames):
+            for frameParam in (*action.show, *action.hide):
+                yield source, "frame", frameParam
+        elif isinstance(action, frames.CaseActions.ToggleEvidence):
+            for recordItem in (*action.show, *action.hide):
+                yield source, "record item", recordItem
+        elif isinstance(action, frames.CaseActions.GoToFrame):
+            yield source, "frame", action.frame
+        elif isinstance(action, frames.CaseActions.SetGameOverGroup):
+            yield source, "group", action.group
+        elif isinstance(action, frames.CaseActions.PromptPresent):
+            yield source, "frame", action.failFrame
+            for recordItem, frameParam in action.choices:
+                yield source, "record item", recordItem
+                yield source, "frame", frameParam
+        elif isinstance(action, (frames.CaseActions.PromptChoice, frames.CaseActions.PromptCursor)):
+            if isinstance(action, frames.CaseActions.PromptCursor):
+                yield source, "frame", action.failFrame
+            for _, frameParam in action.choices:
+                yield source, "frame", frameParam
+        elif isinstance(action, frames.CaseActions.VarEval):
+            yield source, "frame", action.trueFrame
+            yield source, "frame", action.falseFrame
+    if isinstance(frame, frames.CEFrame):
+        for recordItem, frameParam in frame.contradictions:
+            yield "contradiction", "record item", recordItem
+            yield "contradiction", "frame", frameParam
+
+
+class _ReferenceCollector:
+    """Collects the tags, frames and references of a case frame by frame, then resolves every reference at once in linear time."""
+
+    def __init__(self, case: "Case") -> None:
+        self.case = case
+        self.frameTags = set()
+        self.frameIds = set()
+        self.frames = []
+        self.references: list[BrokenReference] = []  # Every reference, until resolved
+        # Lazily loaded frames are matched by IID, as frames that are still undecoded are never visited, and are decoded into
+        # new objects when referenced
+        self.frameIIDs = case._undecodedFrameIIDs() if case._loadContext is not None and case._loadContext.lazy else set()
+
+    def visit(self, location: FrameLocation, frame: _Frame):
+        if frame.caseTag:
+            self.frameTags.add(frame.caseTag)
+        self.frameIds.add(id(frame))
+        if isinstance(frame, _LazyFrameMixin):
+            self.frameIIDs.add(frame._loadedIID)
+        self.frames.append(frame)
+        for source, kind, reference in _iterFrameReferences(frame):
+            self.references.append(BrokenReference(location, source, kind, reference))
+
+    def broken(self) -> list[BrokenReference]:
+        if self.frames:
+            self.frameTags.add(MISSING_REFERENCE_TAG)  # Stands in for references that were missing when loading
+        groups = self.case._groups
+        recordItems = [*self.case.evidence, *self.case.profiles]
+        targets = {
+            "frame": (self.frameTags, self.frameIds, self.frames),
+            "group": ({group.caseTag for group in groups if group.caseTag}, {id(group) for group in groups}, groups),
+            "record item": ((), {id(item) for item in recordItems}, recordItems),
+        }
+        broken = []
+        for reference in self.references:
+            tags, ids, objects = targets[reference.kind]
+            if type(reference.reference) is str:
+                if reference.reference not in tags:
+                    broken.append(reference)
+            elif reference.kind == "frame" and getattr(reference.reference, "_loadedIID", None) in self.frameIIDs:
+                continue
+            elif id(reference.reference) not in ids and reference.reference not in objects:
+                broken.append(reference)  # Only compared by equality when not found by identity, as compilation matches by equality
+        return broken
+
+
+@dataclass
+class _LoadContext:
+    """State shared across a single .objection load."""
+
+    suppressWarnings: bool = False
+    frameMap: list = field(default_factory=list)
+    frameIIDs: dict = field(default_factory=dict)
+    groupIIDs: dict = field(default_factory=dict)
+    recordMap: dict = field(default_factory=dict)
+    pairs: dict = field(default_factory=dict)
+
+    lazy: bool = False
+    frameDicts: dict = field(default_factory=dict)
+    decodeOnCompile: set = field(default_factory=set)
+    maxFrameIID: int = 0
+    maxPairID: int = 0
+
+    def __post_init__(self):
+        if self.lazy:
+            self.frameIIDs = _LazyFrameIIDs(self)
+
+    def frameReference(self, param, key=None):
+        default = MISSING_REFERENCE_TAG
+        if key is not None:
+            return self.frameIIDs[int(param[key])] if key in param and param[key] else default
+        else:
+            return self.frameIIDs[int(param)] if param else default
+
+    def loadFrame(self, frameDict: dict, frameClass: type) -> _Frame:
+        if self.lazy:
+            return self.frameIIDs[frameDict["iid"]]
+        return _loadJSONFrame(frameDict, frameClass, self)
+
+    def registerFrames(self, frameDicts: list, frameClass: type) -> list:
+        """Index frame dicts by IID so they can be decoded on demand in lazy mode."""
+        for frameDict in frameDicts:
+            if _referencesRenumberedIds(frameDict):
+                self.decodeOnCompile.add(frameDict["iid"])
+            for indexedDict, indexedClass in (
+                (frameDict, frameClass),
+                *((pressDict, _Frame) for pressDict in frameDict.get("pressFrames", ())),
+            ):
+                self.frameDicts[indexedDict["iid"]] = (indexedDict, indexedClass)
+                if indexedDict["iid"] > self.maxFrameIID:
+                    self.maxFrameIID = indexedDict["iid"]
+        return frameDicts
+
+
+_renumberedActionIds = (8, 15, 16)  # Case actions referencing court record items or groups
+
+
+def _referencesRenumberedIds(frameDict: dict) -> bool:
+    # Court record and group IIDs are reassigned on compile, so frames referencing them can't be reused as-is
+    if frameDict.get("contradictions"):
+        return True
+    for actionDict in (frameDict, *frameDict.get("pressFrames", ())):
+        caseAction = actionDict.get("caseAction")
+        if type(caseAction) is dict and caseAction.get("id") in _renumberedActionIds:
+            return True
+    return False
+
+
+class _LazyFrameIIDs(dict):
+    """Frame IID map of a lazy load, decoding frames on first lookup."""
+
+    def __init__(self, context: _LoadContext):
+        super().__init__()
+        self._context = context
+
+    def __missing__(self, iid: int) -> _Frame:
+        frameDict, frameClass = self._context.frameDicts[iid]
+        frame = _loadJSONFrame(frameDict, _lazyFrameClasses[frameClass], self._context)
+        frame._loadedIID = iid
+        frame._lazyContext = self._context
+        frame._lazyFrameDict = frameDict
+        return frame
+
+
+class _LazyFrameMixin:
+    """Frame loaded in lazy mode. Its case action and cross-examination data are decoded on first access."""
+
+    _loadedIID: Optional[int] = None
+    _lazyContext: Optional[_LoadContext] = None
+    _lazyFrameDict: Optional[dict] = None
+
+    def __getattribute__(self, __name: str):
+        if __name in _lazyFrameKeys and object.__getattribute__(self, "_lazyFrameDict") is not None:
+            frameDict = self._lazyFrameDict
+            self._lazyFrameDict = None
+            _resolveFrameReferences(self, frameDict, self._lazyContext)  # type: ignore
+        return object.__getattribute__(self, __name)
+
+
+class _LazyFrame(_LazyFrameMixin, frames.Frame):
+    pass
+
+
+class _LazyCEFrame(_LazyFrameMixin, frames.CEFrame):
+    pass
+
+
+_lazyFrameKeys = ("caseAction", "contradictions", "pressSequence")
+_lazyFrameClasses = {
+    frames.Frame: _LazyFrame,
+    frames.CEFrame: _LazyCEFrame,
+}
+
+
+class _LazyFrameList(MutableSequence):
+    """
+    Frame list of a lazily loaded group.
+
+    Holds the original frame dicts and decodes each into a Frame only when it's accessed.
+    """
+
+    def __init__(self, frameDicts: list, context: _LoadContext):
+        self._items = list(frameDicts)
+        self._context = context
+
+    def _decode(self, index: int) -> _Frame:
+        item = self._items[index]
+        if type(item) is dict:
+            item = self._context.frameIIDs[item["iid"]]
+            self._items[index] = item
+        return item
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(len(self._items)))]
+        return self._decode(index)
+
+    def __setitem__(self, index, value):
+        self._items[index] = value
+
+    def __delitem__(self, index):
+        del self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def insert(self, index: int, value: _Frame):
+        self._items.insert(index, value)
+
+    def _compileEntries(self):
+        """Yield frames to compile, or the original dicts of frames that were never decoded."""
+        decoded = self._context.frameIIDs
+        for item in self._items:
+            if type(item) is dict:
+                iid = item["iid"]
+                if iid in decoded or iid in self._context.decodeOnCompile:
+                    yield decoded[iid]
+                else:
+                    yield item
+            else:
+                yield item
+
+
+def _compileEntries(frameList: list) -> Any:
+    if isinstance(frameList, _LazyFrameList):
+        return frameList._compileEntries()
+    return frameList
+
+
+def _resolveFrameReferences(frame: _Frame, frameDict: dict, context: _LoadContext):
+    """Decode a loaded frame's case action, contradictions and press sequence."""
+    caseAction = frameDict.get("caseAction", None)
+    if type(caseAction) is dict and "id" in caseAction:
+        decoder = _caseActionDecoders.get(caseAction["id"])
+        if decoder is not None:
+            frame.caseAction = decoder(context, caseAction.get("value", None), frameDict)
+
+    if isinstance(frame, frames.CEFrame):
+        for contraDict in frameDict.get("contradictions", ()):
+            frame.contradictions.append(
+                (
+                    context.recordMap[contraDict["eid"]],
+                    context.frameIIDs[int(contraDict["fid"])],
+                )
+            )
+        for pressDict in frameDict.get("pressFrames", ()):
+            frame.pressSequence.append(context.loadFrame(pressDict, _Frame))
+
+
+_caseActionEncoders: dict[type, tuple[int, Callable[[Case, Any], Any]]] = {}
+_caseActionDecoders: dict[int, Callable[[_LoadContext, Any, dict], Any]] = {}
+
+
+def _caseActionEncoder(actionId: int, *actionTypes: type):
+    """Register a function encoding the given case action types into the action value of `actionId`."""
+    def register(encoder):
+        for actionType in actionTypes:
+            _caseActionEncoders[actionType] = (actionId, encoder)
+        return encoder
+    return register
+
+
+def _caseActionDecoder(*actionIds: int):
+    """Register a function decoding the action values of `actionIds` into a case action."""
+    def register(decoder):
+        for actionId in actionIds:
+            _caseActionDecoders[actionId] = decoder
+        return decoder
+    return register
+
+
+def _frameIid(case: Case, frameParam: Union[str, _Frame]) -> str:
+    return str(case._getFrameDict(frameParam)["iid"])
+
+
+@_caseActionEncoder(16, frames.CaseActions.ToggleEvidence)
+def _encodeToggleEvidence(case: Case, action: frames.CaseActions.ToggleEvidence):
+    return {
+        "show": [item._getIid(case._recordMap) for item in action.show],
+        "hide": [item._getIid(case._recordMap) for item in action.hide],
+    }
+
+
+@_caseActionDecoder(16)
+def _decodeToggleEvidence(context: _LoadContext, param, frameDict: dict):
+    return frames.CaseActions.ToggleEvidence(
+        show=[context.recordMap[iid] for iid in param["show"]],
+        hide=[context.recordMap[iid] for iid in param["hide"]],
+    )
+
+
+@_caseActionEncoder(3, frames.CaseActions.ToggleFrames)
+def _encodeToggleFrames(case: Case, action: frames.CaseActions.ToggleFrames):
+    return {
+        "show": " ".join([_frameIid(case, frameParam) for frameParam in action.show]),
+        "hide": " ".join([_frameIid(case, frameParam) for frameParam in action.hide]),
+    }
+
+
+@_caseActionDecoder(3)
+def _decodeToggleFrames(context: _LoadContext, param, frameDict: dict):
+    return frames.CaseActions.ToggleFrames(
+        show=[context.frameIIDs[int(iid)] for iid in param["show"].split()],
+        hide=[context.frameIIDs[int(iid)] for iid in param["hide"].split()],
+    )
+
+
+@_caseActionEncoder(4, frames.CaseActions.GoToFrame)
+def _encodeGoToFrame(case: Case, action: frames.CaseActions.GoToFrame):
+    return _frameIid(case, action.frame)
+
+
+@_caseActionDecoder(4)
+def _decodeGoToFrame(context: _LoadContext, param, frameDict: dict):
+    return frames.CaseActions.GoToFrame(context.frameReference(param))
+
+
+@_caseActionEncoder(15, frames.CaseActions.SetGameOverGroup)
+def _encodeSetGameOverGroup(case: Case, action: frames.CaseActions.SetGameOverGroup):
+    return str(case._getGroupDict(action.group)["iid"])
+
+
+@_caseActionDecoder(15)
+def _decodeSetGameOverGroup(context: _LoadContext, param, frameDict: dict):
+    return frames.CaseActions.SetGameOverGroup(context.groupIIDs[int(param)])
+
+
+@_caseActionEncoder(5, frames.CaseActions.EndGame)
+def _encodeEndGame(case: Case, action: frames.CaseActions.EndGame):
+    return None
+
+
+@_caseActionDecoder(5)
+def _decodeEndGame(context: _LoadContext, param, frameDict: dict):
+    return frames.CaseActions.EndGame()
+
+
+_healthActionTypes = (
+    frames.CaseActions.HealthSet,
+    frames.CaseActions.HealthAdd,
+    frames.CaseActions.HealthRemove,
+)
+
+
+@_caseActionEncoder(6, *_healthActionTypes)
+def _encodeHealth(case: Case, action):
+    return {
+        "amount": int(action.amount * 100),
+        "type": next(_healthActionTypes.index(actionType) for actionType in type(action).__mro__ if actionType in _healthActionTypes),
+    }
+
+
+@_caseActionDecoder(6)
+def _decodeHealth(context: _LoadContext, param, frameDict: dict):
+    if param["type"] in (0, 1, 2):
+        return _healthActionTypes[param["type"]](float(param["amount"]) / 100)
+
+
+@_caseActionEncoder(7, frames.CaseActions.FlashingHealth)
+def _encodeFlashingHealth(case: Case, action: frames.CaseActions.FlashingHealth):
+    return str(int(action.amount * 100))
+
+
+@_caseActionDecoder(7)
+def _decodeFlashingHealth(context: _LoadContext, param, frameDict: dict):
+    return frames.CaseActions.FlashingHealth(int(param) / 100)
+
+
+@_caseActionEncoder(8, frames.CaseActions.PromptPresent)
+def _encodePromptPresent(case: Case, action: frames.CaseActions.PromptPresent):
+    return {
+        "evidence": action.presentEvidence,
+        "profiles": action.presentProfiles,
+        "falseFid": _frameIid(case, action.failFrame),
+        "items": [
+            {
+                "eid": recordItem._getIid(case._recordMap),
+                "fid": _frameIid(case, frameParam),
+            }
+            for recordItem, frameParam in action.choices
+        ],
+    }
+
+
+@_caseActionDecoder(8)
+def _decodePromptPresent(context: _LoadContext, param, frameDict: dict):
+    return frames.CaseActions.PromptPresent(
+        failFrame=context.frameReference(param, "falseFid"),
+        presentEvidence=param["evidence"],
+        presentProfiles=param["profiles"],
+        choices=[
+            (context.recordMap[item["eid"]], context.frameIIDs[int(item["fid"])])
+            for item in param["items"]
+        ],
+    )
+
+
+@_caseActionEncoder(9, frames.CaseActions.PromptChoice)
+def _encodePromptChoice(case: Case, action: frames.CaseActions.PromptChoice):
+    return [
+        {
+            "text": choiceText,
+            "fid": _frameIid(case, frameParam),
+        }
+        for choiceText, frameParam in action.choices
+    ]
+
+
+@_caseActionDecoder(9)
+def _decodePromptChoice(context: _LoadContext, param, frameDict: dict):
+    return frames.CaseActions.PromptChoice(
+        [(choice["text"], context.frameReference(choice, "fid")) for choice in param]
+    )
+
+
+@_caseActionEncoder(12, frames.CaseActions.PromptInt, frames.CaseActions.PromptStr)
+def _encodePrompt(case: Case, action):
+    if isinstance(action, frames.CaseActions.PromptStr):
+        return {
+            "name": action.varName,
+            "type": "string" if action.allowSpaces else "word",
+            "lowercase": action.toLower,
+        }
+    return {
+        "name": action.varName,
+        "type": "int",
+    }
+
+
+@_caseActionDecoder(12)
+def _decodePrompt(context: _LoadContext, param, frameDict: dict):
+    if param["type"] == "int":
+        return frames.CaseActions.PromptInt(param["name"])
+    return frames.CaseActions.PromptStr(
+        varName=param["name"],
+        allowSpaces=param["type"] == "string",
+        toLower=param["lowercase"],
+    )
+
+
+@_caseActionEncoder(17, frames.CaseActions.PromptCursor)
+def _encodePromptCursor(case: Case, action: frames.CaseActions.PromptCursor):
+    return {
+        "imageUrl": action.previewImageUrl,
+        "prompt": action.prompt,
+        "color": str(action.cursorColor),
+        "falseFid": _frameIid(case, action.failFrame),
+        "areas": [
+            {
+                "fid": _frameIid(case, frameParam),
+                "shape": {
+                    "left": cursorRect.left,
+                    "top": cursorRect.top,
+                    "width": cursorRect.width,
+                    "height": cursorRect.height,
+                },
+            }
+            for cursorRect, frameParam in action.choices
+        ],
+    }
+
+
+@_caseActionDecoder(17)
+def _decodePromptCursor(context: _LoadContext, param, frameDict: dict):
+    return frames.CaseActions.PromptCursor(
+        failFrame=context.frameReference(param, "falseFid"),
+        previewImageUrl=param["imageUrl"],
+        prompt=param["prompt"],
+        cursorColor=frames.Color(param["color"]),
+        choices=[
+            (
+                frames.CursorRect(
+                    area["shape"]["left"],
+                    area["shape"]["top"],
+                    area["shape"]["width"],
+                    area["shape"]["height"],
+                ),
+                context.frameIIDs[int(area["fid"])],
+            )
+            for area in param["areas"]
+        ],
+    )
+
+
+@_caseActionEncoder(10, frames.CaseActions.VarSet)
+def _encodeVarSet(case: Case, action: frames.CaseActions.VarSet):
+    return {
+        "name": action.varName,
+        "value": action.value,
+    }
+
+
+@_caseActionDecoder(10)
+def _decodeVarSet(context: _LoadContext, param, frameDict: dict):
+    return frames.CaseActions.VarSet(param["name"], param["value"])
+
+
+@_caseActionEncoder(11, frames.CaseActions.VarAdd)
+def _encodeVarAdd(case: Case, action: frames.CaseActions.VarAdd):
+    return {
+        "name": action.varName,
+        "value": str(action.value),
+    }
+
+
+@_caseActionDecoder(11)
+def _decodeVarAdd(context: _LoadContext, param, frameDict: dict):
+    return frames.CaseActions.VarAdd(param["name"], param["value"])
+
+
+@_caseActionEncoder(14, frames.CaseActions.VarEval)
+def _encodeVarEval(case: Case, action: frames.CaseActions.VarEval):
+    return {
+        "expression": action.expression,
+        "trueFid": _frameIid(case, action.trueFrame),
+        "falseFid": _frameIid(case, action.falseFrame),
+    }
+
+
+@_caseActionDecoder(14)
+def _decodeVarEval(context: _LoadContext, param, frameDict: dict):
+    return frames.CaseActions.VarEval(
+        trueFrame=context.frameIIDs[int(param["trueFid"])],
+        falseFrame=context.frameIIDs[int(param["falseFid"])],
+        expression=param["expression"],
+    )
+
+
+_legacyEvalOperators = {
+    "equals": "==",
+    "notEquals": "!=",
+    "greaterThan": ">",
+    "lessThan": "<",
+}
+
+
+@_caseActionDecoder(13)
+def _decodeLegacyVarEval(context: _LoadContext, param, frameDict: dict):
+    try:
+        operator = _legacyEvalOperators[param["type"]]
+    except KeyError:
+        raise IOError(
+            f"Unknown variable evaluation operator \"{param['type']}\" at frame {frameDict['iid']} (\"{frameDict['text']}\")"
+        )
+    return frames.CaseActions.VarEval(
+        trueFrame=context.frameReference(param, "trueFid"),
+        falseFrame=context.frameIIDs[int(param["falseFid"])],
+        expression=param["name"] + operator + param["value"],
+    )
+
+
 def _checkPresetId(characterId: int) -> Optional[int]:
     if type(characterId) is int and characterId >= 1000:
         return characterId
     return None
 
 
+@cache
+def _presetCharacterMaps() -> tuple[dict, dict]:
+    # Preset characters by ID and by pose ID
+    byId = {}
+    byPoseId = {}
+    presetChar: assets.Character
+    for presetChar in preset.collectionValues(preset.Characters):
+        byId.setdefault(presetChar.id, presetChar)
+        for pose in presetChar.poses:
+            byPoseId[pose["id"]] = presetChar
+    return byId, byPoseId
+
+
 def _getEnumByValue(enum: "EnumMeta", value: Any, enumType: "EnumT") -> "EnumT":
     if value is None:
         return value
-    for member in enum:  # type: ignore
-        if member.value == value:  # type: ignore
-            return member  # type: ignore
-    raise KeyError(f'Value "{value}" not found in {enum}')
-
-
-def _getFrameDictAction(frameDict: dict, actionId: int, suppressWarnings: bool) -> Any:
-    actions = frameDict.get("frameActions")
-    if actions:
-        param: Any = None
-        found = False
-        for action in actions:
-            if action["actionId"] == actionId:
-                if found:
-                    if suppressWarnings:
-                        warn(
-                            f"Duplicate case action of id {actionId} found at frame {frameDict['iid']} (\"{frameDict['text']}\")",
-                            IOWarning,
-                        )
-                    continue
-                param = action.get("actionParam")
-                if param is None:
-                    param = ""  # A random placeholder
-                found = True
-        return param
+    try:
+        return enums._valueTables[enum][value]  # type: ignore
+    except (KeyError, TypeError):
+        raise KeyError(f'Value "{value}" not found in {enum}') from None
+
+
+_repeatableFrameActions = (2, 3, 10, 11)  # Gallery actions, one per character location
+
+
+def _getFrameDictActions(frameDict: dict, suppressWarnings: bool) -> dict[int, Any]:
+    """Map each frame action ID to its param in a single pass. Repeatable actions map to a list of params."""
+    actions: dict[int, Any] = {}
+    for action in frameDict.get("frameActions") or ():
+        actionId = action["actionId"]
+        param = action.get("actionParam")
+        if param is None:
+            param = ""  # A random placeholder
+        if actionId in _repeatableFrameActions:
+            actions.setdefault(actionId, []).append(param)
+        elif actionId in actions:
+            if suppressWarnings:
+                warn(
+                    f"Duplicate case action of id {actionId} found at frame {frameDict['iid']} (\"{frameDict['text']}\")",
+                    IOWarning,
+                )
+        else:
+            actions[actionId] = param
+    return actions
 
 
 def _loadJSONFrame(
     frameDict: dict,
     frameClass: type,
-    pairList: list,
-    frameMap: list,
-    frameIIDs: dict,
-    suppressWarnings: bool,
+    context: _LoadContext,
 ) -> _Frame:
-    pair: Optional[dict] = None
+    suppressWarnings = context.suppressWarnings
+    pair: Optional[dict] = context.pairs.get(frameDict["pairId"])
     pairedIs1: bool = False
-    for pairDict in pairList:
-        if pairDict["pairId"] == frameDict["pairId"]:
-            pair = pairDict
-            pairedIs1 = frameDict["characterId"] != _checkPresetId(pairDict["characterId2"])
-            break
+    if pair is not None:
+        pairedIs1 = frameDict["characterId"] != _checkPresetId(pair["characterId2"])
 
     flipString = frameDict["flipped"] if frameDict["flipped"] else "000"
 
-    charAsset: assets.Character = assets.Character(0)
+    charAsset: assets.Character
     if frameDict["characterId"] is None:
-        presetChar: assets.Character
-        for presetChar in preset.collectionValues(preset.Characters):
-            for pose in presetChar.poses:
-                if pose["id"] == frameDict["poseId"]:
-                    charAsset = presetChar
-                    break
+        charAsset = _presetCharacterMaps()[1].get(frameDict["poseId"]) or assets.Character(0)
     else:
-        charAsset = assets.Character(
-            frameDict["characterId"], _loaded=(frameDict["characterId"] is None)
-        )
+        charAsset = assets.Character(frameDict["characterId"])
     
     char: frames.FrameCharacter
     if charAsset.id == 0:
@@ -1039,14 +2123,11 @@ def _loadJSONFrame(
         )
 
         if pairCharId is not None:
-            pairCharAsset = assets.Character(0)
+            pairCharAsset: assets.Character
             if _checkPresetId(pairCharId) is not None:
                 pairCharAsset = assets.Character(pairCharId)
             else:
-                for presetChar in preset.collectionValues(preset.Characters):
-                    if presetChar.id == pairCharId:
-                        charAsset = presetChar
-                        break
+                pairCharAsset = _presetCharacterMaps()[0].get(pairCharId) or assets.Character(0)
             pairChar = frames.FrameCharacter(
                 character=pairCharAsset,
                 poseId=frameDict["pairPoseId"],
@@ -1058,6 +2139,8 @@ def _loadJSONFrame(
                 isFront=not pair["front"] if pairedIs1 else pair["front"],
             )
 
+    actions = _getFrameDictActions(frameDict, suppressWarnings)
+
     frame: _Frame = frameClass(
         char=char,
         pairChar=pairChar,
@@ -1076,21 +2159,21 @@ def _loadJSONFrame(
         poseAnim=frameDict["poseAnimation"],
         goNext=frameDict["goNext"],
         merge=frameDict["mergeNext"],
-        offScreen=_getFrameDictAction(frameDict, 6, suppressWarnings) is not None,
-        centerText=_getFrameDictAction(frameDict, 9, suppressWarnings) is not None,
+        offScreen=6 in actions,
+        centerText=9 in actions,
         presetBlip=_getEnumByValue(
             enums.PresetBlip,
-            int(_getFrameDictAction(frameDict, 4, suppressWarnings)),
+            int(actions[4]),
             enums.PresetBlip.KATONK,
         )
-        if _getFrameDictAction(frameDict, 4, suppressWarnings)
+        if actions.get(4)
         else None,
         presetPopup=_getEnumByValue(
             enums.PresetPopup,
-            int(_getFrameDictAction(frameDict, 7, suppressWarnings)),
+            int(actions[7]),
             enums.PresetPopup.CROSS_EXAMINATION,
         )
-        if _getFrameDictAction(frameDict, 7, suppressWarnings)
+        if actions.get(7)
         else None,
         fade=frames.Fade(
             direction=_getEnumByValue(
@@ -1137,25 +2220,24 @@ def _loadJSONFrame(
         if frameDict["transition"]
         else None,
         options=frames.OptionModifiers(
-            autoplaySpeed=_getFrameDictAction(frameDict, 15, suppressWarnings),
+            autoplaySpeed=actions.get(15),
             dialogueBox=_getEnumByValue(
                 enums.PresetDialogueBox,
-                int(_getFrameDictAction(frameDict, 12, suppressWarnings)),
+                int(actions[12]),
                 enums.PresetDialogueBox.CLASSIC,
-            ) if _getFrameDictAction(frameDict, 12, suppressWarnings) else None,
-            dialogueBoxVisible=bool(
-                int(_getFrameDictAction(frameDict, 1, suppressWarnings))
-            )
-            if _getFrameDictAction(frameDict, 1, suppressWarnings)
+            ) if actions.get(12) else None,
+            dialogueBoxVisible=bool(int(actions[1]))
+            if actions.get(1)
             else None,
-            defaultTextSpeed=_getFrameDictAction(frameDict, 13, suppressWarnings),
-            blipFrequency=_getFrameDictAction(frameDict, 14, suppressWarnings),
-            frameSkip=bool(int(_getFrameDictAction(frameDict, 16, suppressWarnings)))
-            if _getFrameDictAction(frameDict, 16, suppressWarnings)
+            defaultTextSpeed=actions.get(13),
+            blipFrequency=actions.get(14),
+            frameSkip=bool(int(actions[16]))
+            if actions.get(16)
             else None,
         ),
+        hidden=bool(frameDict.get("hide")),
     )
-    if _getFrameDictAction(frameDict, 5, suppressWarnings) is not None:
+    if 5 in actions:
         if frame.presetBlip is not None:
             frame.presetBlip = enums.PresetBlip.MUTE
         else:
@@ -1164,7 +2246,7 @@ def _loadJSONFrame(
                     f"Conflicting speech blip Set and Mute actions at frame {frameDict['iid']} (\"{frameDict['text']}\")",
                     IOWarning,
                 )
-    if _getFrameDictAction(frameDict, 8, suppressWarnings) is not None:
+    if 8 in actions:
         if frame.presetPopup is not None:
             frame.presetPopup = enums.PresetPopup.TESTIMONY_LABEL_HIDE
         else:
@@ -1174,28 +2256,26 @@ def _loadJSONFrame(
                     IOWarning,
                 )
 
-    for action in frameDict["frameActions"]:
-        id, param = action["actionId"], action.get("actionParam")
-        if id == 2 or id == 10:
-            if suppressWarnings:
-                warn(
-                    f"Importing Gallery Assign actions is not yet supported at frame {frameDict['iid']} (\"{frameDict['text']}\")",
-                    IOWarning,
-                )
-        elif id == 3 or id == 11:
-            location = _getEnumByValue(
-                enums.CharacterLocation, param, enums.CharacterLocation.DEFENSE
+    for _ in actions.get(2, []) + actions.get(10, []):
+        if suppressWarnings:
+            warn(
+                f"Importing Gallery Assign actions is not yet supported at frame {frameDict['iid']} (\"{frameDict['text']}\")",
+                IOWarning,
             )
-            if location not in frame.options.galleryRemove:
-                frame.options.galleryRemove.append(location)
+    for param in actions.get(3, []) + actions.get(11, []):
+        location = _getEnumByValue(
+            enums.CharacterLocation, param, enums.CharacterLocation.DEFENSE
+        )
+        if location not in frame.options.galleryRemove:
+            frame.options.galleryRemove.append(location)
 
-    frameMap.append((frame, frameDict))
-    frameIIDs[frameDict["iid"]] = frame
+    context.frameMap.append((frame, frameDict))
+    context.frameIIDs[frameDict["iid"]] = frame
     return frame
 
 
 def loadJSONDict(
-    objectionDict: dict, suppressWarnings: bool = False
+    objectionDict: dict, suppressWarnings: bool = False, lazy: bool = False
 ) -> Union[Scene, Case]:
     """
     Load objectionpy objection from existing .objection in form of a JSON string.
@@ -1205,6 +2285,10 @@ def loadJSONDict(
             - Parsed JSON dictionary of an objection.lol .objection
         - `suppressWarnings : bool`
             - Defaults to False.
+        - `lazy : bool`
+            - If True, group frame lists only decode a frame when it's accessed, and case actions are decoded on access too.
+            - On compile, frames that were never accessed are reused as-is from objectionDict, keeping their iids.
+            - Defaults to False.
 
     Raises:
         - `IOError`
@@ -1242,7 +2326,12 @@ def loadJSONDict(
     for alias in objectionDict["aliases"]:
         objection.aliases[alias["from"]] = alias["to"]
 
-    recordMap = {}
+    context = _LoadContext(suppressWarnings=suppressWarnings, lazy=lazy)
+    for pair in objectionDict["pairs"]:
+        context.pairs.setdefault(pair["pairId"], pair)
+        if type(pair["pairId"]) is int and pair["pairId"] > context.maxPairID:
+            context.maxPairID = pair["pairId"]
+    recordMap = context.recordMap
     if type(objection) is Case:
         for recordName, recordList, recordType in (
             ("evidence", objection.evidence, enums.RecordType.EVIDENCE),
@@ -1255,21 +2344,14 @@ def loadJSONDict(
                     iconUrl=item.get("iconUrl"),
                     checkUrl=item.get("url"),
                     description=item.get("description"),
-                    hidden=item.get("hidden"),
+                    hidden=item.get("hide"),
                 )
                 recordList.append(recordItem)
                 recordMap[recordItem._getIid(objMap=[(recordItem, item)])] = recordItem
 
-    frameMap = []
-    frameIIDs = {}
-    groupIIDs = {}
-
-    def _checkFrameReference(param, key = None):
-        default = MISSING_REFERENCE_TAG
-        if key is not None:
-            return frameIIDs[int(param[key])] if key in param and param[key] else default
-        else:
-            return frameIIDs[int(param)] if param else default
+    frameMap = context.frameMap
+    frameIIDs = context.frameIIDs
+    groupIIDs = context.groupIIDs
 
     for groupDict in objectionDict["groups"]:
         group: Group
@@ -1289,26 +2371,32 @@ def loadJSONDict(
 
         groupIIDs[groupDict["iid"]] = group
 
+        if lazy:
+            if type(group) is CEGroup:
+                group.counselSequence = _LazyFrameList(context.registerFrames(groupDict.get("counselFrames", []), frames.Frame), context)
+                group.failureSequence = _LazyFrameList(context.registerFrames(groupDict.get("failureFrames", []), frames.Frame), context)
+            frameClass = frames.CEFrame if type(group) is CEGroup else frames.Frame
+            frameDicts = context.registerFrames(groupDict["frames"], frameClass)
+            if isinstance(group.frames, _LazyFrameList):
+                group.frames._items.extend(frameDicts)
+            else:
+                group.frames = _LazyFrameList(frameDicts, context)
+            continue
+
         mainFrameClass = frames.Frame
         if type(group) is CEGroup:
-            for frameDict in groupDict["counselFrames"]:
+            for frameDict in groupDict.get("counselFrames", []):
                 frame = _loadJSONFrame(
                     frameDict,
                     frames.Frame,
-                    objectionDict["pairs"],
-                    frameMap,
-                    frameIIDs,
-                    suppressWarnings,
+                    context,
                 )
                 group.counselSequence.append(frame)
-            for frameDict in groupDict["failureFrames"]:
+            for frameDict in groupDict.get("failureFrames", []):
                 frame = _loadJSONFrame(
                     frameDict,
                     frames.Frame,
-                    objectionDict["pairs"],
-                    frameMap,
-                    frameIIDs,
-                    suppressWarnings,
+                    context,
                 )
                 group.failureSequence.append(frame)
             mainFrameClass = frames.CEFrame
@@ -1317,170 +2405,26 @@ def loadJSONDict(
             frame = _loadJSONFrame(
                 frameDict,
                 mainFrameClass,
-                objectionDict["pairs"],
-                frameMap,
-                frameIIDs,
-                suppressWarnings,
+                context,
             )
             group.frames.append(frame)
 
-    if type(objection) is Case:
-        processedList = []
+    if lazy:
+        objection._loadContext = context
+    elif type(objection) is Case:
+        processedList = _utils._TupleMap(_frameHint)
         frame: _Frame
         for i in range(2):
             for frame, frameDict in frameMap:
                 if frame in processedList:
                     continue
-                processedList.append(frame)
-                if type(frameDict.get("caseAction", None)) is dict and "id" in frameDict["caseAction"]:
-                    id, param = (
-                        frameDict["caseAction"]["id"],
-                        frameDict["caseAction"].get("value", None),
-                    )
-
-                    if id == 16:
-                        frame.caseAction = frames.CaseActions.ToggleEvidence(
-                            show=[recordMap[iid] for iid in param["show"]],
-                            hide=[recordMap[iid] for iid in param["hide"]],
-                        )
-                    elif id == 3:
-                        frame.caseAction = frames.CaseActions.ToggleFrames(
-                            show=[frameIIDs[int(iid)] for iid in param["show"].split()],
-                            hide=[frameIIDs[int(iid)] for iid in param["hide"].split()],
-                        )
-                    elif id == 4:
-                        frame.caseAction = frames.CaseActions.GoToFrame(
-                            _checkFrameReference(param)
-                        )
-                    elif id == 15:
-                        frame.caseAction = frames.CaseActions.SetGameOverGroup(
-                            groupIIDs[int(param)]
-                        )
-                    elif id == 5:
-                        frame.caseAction = frames.CaseActions.EndGame()
-                    elif id == 6:
-                        if param["type"] == 0:
-                            frame.caseAction = frames.CaseActions.HealthSet(
-                                float(param["amount"]) / 100
-                            )
-                        elif param["type"] == 1:
-                            frame.caseAction = frames.CaseActions.HealthAdd(
-                                float(param["amount"]) / 100
-                            )
-                        elif param["type"] == 2:
-                            frame.caseAction = frames.CaseActions.HealthRemove(
-                                float(param["amount"]) / 100
-                            )
-                    elif id == 7:
-                        frame.caseAction = frames.CaseActions.FlashingHealth(
-                            int(param) / 100
-                        )
-                    elif id == 8:
-                        frame.caseAction = frames.CaseActions.PromptPresent(
-                            failFrame=_checkFrameReference(param, "falseFid"),
-                            presentEvidence=param["evidence"],
-                            presentProfiles=param["profiles"],
-                            choices=[
-                                (recordMap[item["eid"]], frameIIDs[int(item["fid"])])
-                                for item in param["items"]
-                            ],
-                        )
-                    elif id == 9:
-                        frame.caseAction = frames.CaseActions.PromptChoice(
-                            [
-                                (choice["text"], _checkFrameReference(choice, "fid"))
-                                for choice in param
-                            ]
-                        )
-                    elif id == 12:
-                        if param["type"] == "int":
-                            frame.caseAction = frames.CaseActions.PromptInt(
-                                param["name"]
-                            )
-                        else:
-                            frame.caseAction = frames.CaseActions.PromptStr(
-                                varName=param["name"],
-                                allowSpaces=param["type"] == "string",
-                                toLower=param["lowercase"],
-                            )
-                    elif id == 17:
-                        frame.caseAction = frames.CaseActions.PromptCursor(
-                            failFrame=_checkFrameReference(param, "falseFid"),
-                            previewImageUrl=param["imageUrl"],
-                            prompt=param["prompt"],
-                            cursorColor=frames.Color(param["color"]),
-                        )
-                        for area in param["areas"]:
-                            frame.caseAction.choices.append(
-                                (
-                                    frames.CursorRect(
-                                        area["shape"]["left"],
-                                        area["shape"]["top"],
-                                        area["shape"]["width"],
-                                        area["shape"]["height"],
-                                    ),
-                                    frameIIDs[int(area["fid"])],
-                                )
-                            )
-                    elif id == 10:
-                        frame.caseAction = frames.CaseActions.VarSet(
-                            param["name"], param["value"]
-                        )
-                    elif id == 11:
-                        frame.caseAction = frames.CaseActions.VarAdd(
-                            param["name"], param["value"]
-                        )
-                    elif id == 14:
-                        frame.caseAction = frames.CaseActions.VarEval(
-                            trueFrame=frameIIDs[int(param["trueFid"])],
-                            falseFrame=frameIIDs[int(param["falseFid"])],
-                            expression=param["expression"],
-                        )
-                    elif id == 13:
-                        operator: str
-                        if param["type"] == "equals":
-                            operator = "=="
-                        elif param["type"] == "notEquals":
-                            operator = "!="
-                        elif param["type"] == "greaterThan":
-                            operator = ">"
-                        elif param["type"] == "lessThan":
-                            operator = "<"
-                        else:
-                            raise IOError(
-                                f"Unknown variable evaluation operator \"{param['type']}\" at frame {frameDict['iid']} (\"{frameDict['text']}\")"
-                            )
-                        frame.caseAction = frames.CaseActions.VarEval(
-                            trueFrame=_checkFrameReference(param, "trueFid"),
-                            falseFrame=frameIIDs[int(param["falseFid"])],
-                            expression=param["name"] + operator + param["value"],
-                        )
-
-                if type(frame) is frames.CEFrame:
-                    if "contradictions" in frameDict:
-                        for contraDict in frameDict["contradictions"]:
-                            frame.contradictions.append(
-                                (
-                                    recordMap[contraDict["eid"]],
-                                    frameIIDs[int(contraDict["fid"])],
-                                )
-                            )
-                    if "pressFrames" in frameDict:
-                        for pressDict in frameDict["pressFrames"]:
-                            pressFrame = _loadJSONFrame(
-                                pressDict,
-                                _Frame,
-                                objectionDict["pairs"],
-                                frameMap,
-                                frameIIDs,
-                                suppressWarnings,
-                            )
-                            frame.pressSequence.append(pressFrame)
+                processedList.append((frame, None))
+                _resolveFrameReferences(frame, frameDict, context)
 
     return objection
 
 
-def loadJSONStr(objection: str, suppressWarnings: bool = False) -> Union[Scene, Case]:
+def loadJSONStr(objection: str, suppressWarnings: bool = False, lazy: bool = False) -> Union[Scene, Case]:
     """
     Load objectionpy objection from existing .objection in form of a JSON string.
 
@@ -1489,6 +2433,8 @@ def loadJSONStr(objection: str, suppressWarnings: bool = False) -> Union[Scene,
             - JSON string of an objection.lol .objection
         - `suppressWarnings : bool`
             - Defaults to False.
+        - `lazy : bool`
+            - Decode frames only when they're accessed. See loadJSONDict. Defaults to False.
 
     Raises:
         - `IOError`
@@ -1497,10 +2443,10 @@ def loadJSONStr(objection: str, suppressWarnings: bool = False) -> Union[Scene,
     Returns:
         Scene or case parsed from the .objection JSON.
     """
-    return loadJSONDict(loads(objection))
+    return loadJSONDict(loads(objection), suppressWarnings, lazy)
 
 
-def loadB64(objection: str, suppressWarnings: bool = False) -> Union[Scene, Case]:
+def loadB64(objection: str, suppressWarnings: bool = False, lazy: bool = False) -> Union[Scene, Case]:
     """
     Load objectionpy objection from existing .objection in form of base64-encoded JSON.
 
@@ -1509,6 +2455,8 @@ def loadB64(objection: str, suppressWarnings: bool = False) -> Union[Scene, Case
             - Base64-encoded JSON string of an objection.lol .objection
         - `suppressWarnings : bool`
             - Defaults to False.
+        - `lazy : bool`
+            - Decode frames only when they're accessed. See loadJSONDict. Defaults to False.
 
     Raises:
         - `IOError`
@@ -1517,4 +2465,158 @@ def loadB64(objection: str, suppressWarnings: bool = False) -> Union[Scene, Case
     Returns:
         Scene or case parsed from the .objection JSON.
     """
-    return loadJSONStr(b64decode(objection).decode("utf-8"))
+    return loadJSONStr(b64decode(objection).decode("utf-8"), suppressWarnings, lazy)
+
+
+MMAP_THRESHOLD = 1 << 20  # Files of at least this many bytes are memory-mapped by load
+
+
+def _loadBuffer(data: memoryview, suppressWarnings: bool, lazy: bool) -> Union[Scene, Case]:
+    if data[:len(BOM_UTF8)] == BOM_UTF8:
+        data = data[len(BOM_UTF8):]
+    # Detected like _stream._textChunks does, from the first non-whitespace byte
+    isBase64 = None
+    for offset in range(0, len(data), 64):
+        isBase64 = _stream._isBase64(bytes(data[offset:offset + 64]))
+        if isBase64 is not None:
+            break
+    if not isBase64:
+        return loadJSONDict(loads(str(data, "utf-8")), suppressWarnings, lazy)
+    return loadJSONDict(loads(a2b_base64(data)), suppressWarnings, lazy)
+
+
+def load(
+    source: Union[str, PathLike, IO, bytes, bytearray, memoryview],
+    suppressWarnings: bool = False,
+    lazy: bool = False,
+) -> Union[Scene, Case]:
+    """
+    Load objectionpy objection from a .objection file path, file object or bytes.
+
+    Base64-encoded and raw JSON contents are detected automatically, with or without a UTF-8 byte order mark. Files of at least
+    MMAP_THRESHOLD bytes are memory-mapped, and base64 contents are decoded without first being copied into a string.
+
+    Args:
+        - `source : str | PathLike | IO | bytes-like`
+            - Path to a .objection file, a file object opened in binary or text mode, or the file's contents as bytes.
+            - To load the contents of a .objection from a string, use loadB64 or loadJSONStr instead.
+        - `suppressWarnings : bool`
+            - Defaults to False.
+        - `lazy : bool`
+            - Decode frames only when they're accessed. See loadJSONDict. Defaults to False.
+
+    Raises:
+        - `IOError`
+            - A JSON object's type is unknown or unsupported
+
+    Returns:
+        Scene or case parsed from the .objection JSON.
+    """
+    if isinstance(source, (str, PathLike)):
+        with open(source, "rb") as fp:
+            return load(fp, suppressWarnings, lazy)
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return _loadBuffer(memoryview(source), suppressWarnings, lazy)
+
+    try:
+        fileno = source.fileno()
+        size = fstat(fileno).st_size
+    except (AttributeError, OSError, ValueError):
+        size = 0
+    if size >= MMAP_THRESHOLD and source.tell() == 0 and "b" in getattr(source, "mode", "b"):
+        with mmap(fileno, 0, access=ACCESS_READ) as mapped:
+            with memoryview(mapped) as data:
+                return _loadBuffer(data, suppressWarnings, lazy)
+
+    contents = source.read()
+    if isinstance(contents, str):
+        contents = contents.encode("utf-8")
+    return _loadBuffer(memoryview(contents), suppressWarnings, lazy)
+
+
+_FRAME_SEQUENCE_KEYS = ("frames", "counselFrames", "failureFrames")
+
+
+def _iterObjectionStream(
+    reader: _stream.JSONReader, objectionDict: dict
+) -> Iterator[tuple[dict, Optional[str], Optional[dict]]]:
+    # Fills objectionDict with all top-level keys except groups, and yields frames as (groupDict, sequenceKey, frameDict).
+    # Yields (groupDict, None, None) once a group is fully parsed.
+    for key in reader.items():
+        if key != "groups":
+            objectionDict[key] = reader.value()
+            continue
+        for _ in reader.elements():
+            groupDict = {}
+            for groupKey in reader.items():
+                if groupKey in _FRAME_SEQUENCE_KEYS:
+                    for _ in reader.elements():
+                        yield groupDict, groupKey, reader.value()
+                else:
+                    groupDict[groupKey] = reader.value()
+            yield groupDict, None, None
+
+
+def iterFrames(fp: IO, chunkSize: int = _stream.CHUNK_SIZE) -> Iterator[tuple[dict, str, dict]]:
+    """
+    Incrementally parse a .objection file, yielding its frames one at a time without loading the whole file.
+
+    Args:
+        - `fp : IO`
+            - File object of a .objection, either base64-encoded or raw JSON. May be opened in text or binary mode.
+        - `chunkSize : int`
+            - Amount of data read from fp at a time.
+
+    Yields:
+        Tuples of `(groupDict, sequenceKey, frameDict)`:
+            - `groupDict` holds the group's other keys parsed so far (usually iid, name and type), and is shared by all frames of a group.
+            - `sequenceKey` is the group key the frame is listed under - "frames", "counselFrames" or "failureFrames".
+            - `frameDict` is the frame's parsed JSON dictionary, including its press frames.
+    """
+    reader = _stream.JSONReader.fromFile(fp, chunkSize)
+    for groupDict, sequenceKey, frameDict in _iterObjectionStream(reader, {}):
+        if sequenceKey is not None:
+            yield groupDict, sequenceKey, frameDict  # type: ignore
+
+
+def loadStreaming(
+    fp: IO,
+    suppressWarnings: bool = False,
+    lazy: bool = False,
+    chunkSize: int = _stream.CHUNK_SIZE,
+) -> Union[Scene, Case]:
+    """
+    Load objectionpy objection from a .objection file object, parsing it incrementally.
+
+    Unlike loadB64, the file's base64 and JSON text are never held in memory as a whole.
+
+    Args:
+        - `fp : IO`
+            - File object of a .objection, either base64-encoded or raw JSON. May be opened in text or binary mode.
+        - `suppressWarnings : bool`
+            - Defaults to False.
+        - `lazy : bool`
+            - Decode frames only when they're accessed. See loadJSONDict. Defaults to False.
+        - `chunkSize : int`
+            - Amount of data read from fp at a time.
+
+    Raises:
+        - `IOError`
+            - A JSON object's type is unknown or unsupported
+
+    Returns:
+        Scene or case parsed from the .objection JSON.
+    """
+    reader = _stream.JSONReader.fromFile(fp, chunkSize)
+    objectionDict = {}
+    groups = []
+    for groupDict, sequenceKey, frameDict in _iterObjectionStream(reader, objectionDict):
+        if sequenceKey is None:
+            groups.append(groupDict)
+        else:
+            groupDict.setdefault(sequenceKey, []).append(frameDict)
+    for groupDict in groups:
+        groupDict.setdefault("frames", [])
+    objectionDict["groups"] = groups
+    return loadJSONDict(objectionDict, suppressWarnings, lazy)
@@ -0,0 +1,169 @@
+"""
+Module for splitting objections that exceed objection.lol's limits into parts that fit.
+
+Scenes are split into several scenes, each compiled into its own .objection file, with the option state at each boundary carried into the next part. Cases are split in place, by breaking oversized groups into groups linked with GoToFrame actions. Both run in a single pass over the frames.
+"""
+
+from copy import copy
+from dataclasses import replace
+from typing import Optional
+from . import frames
+from .objection import CEGroup, Case, GameOverGroup, Group, ObjectionError, Scene
+
+
+def _startPart(scene: Scene, state: dict) -> Scene:
+    part = Scene(replace(scene.options, **state))
+    part.aliases = dict(scene.aliases)
+    part._loadContext = scene._loadContext  # Keeps frame and pair IDs of lazy loads from clashing
+    return part
+
+
+def _hideDialogueBox(frame: frames.Frame) -> frames.Frame:
+    frame = copy(frame)
+    frame.options = copy(frame.options)
+    frame.options.dialogueBoxVisible = False
+    return frame
+
+
+def splitScene(scene: Scene, pairOffsetGrid: Optional[int] = None) -> list[Scene]:
+    """
+    Split a scene into consecutive scenes that each fit within MAX_GROUP_FRAMES frames and MAX_PAIRS pairs.
+
+    Each part starts with the dialogue box, text speed, blip frequency and autoplay speed the previous part left off with, and with the dialogue box hidden if it was hidden. Aliases are copied to every part. The scene itself is left unchanged, and frames are shared with the parts rather than copied, except for frames that have to hide the dialogue box.
+
+    Args:
+        - `scene : Scene`
+            - The scene to split.
+        - `pairOffsetGrid : Optional[int]`
+            - The pair offset grid the parts will be compiled with, as in `compile()`.
+
+    Returns:
+        List of scenes to compile into separate .objection files. Only contains one scene if the scene already fits.
+    """
+    options = scene.options
+    frameLimit = options.MAX_GROUP_FRAMES
+    pairLimit = options.MAX_PAIRS
+    state = {
+        "dialogueBox": options.dialogueBox,
+        "defaultTextSpeed": options.defaultTextSpeed,
+        "blipFrequency": options.blipFrequency,
+        "autoplaySpeed": options.autoplaySpeed,
+    }
+    dialogueBoxVisible = True
+
+    part = _startPart(scene, state)
+    parts = [part]
+    frameCount = 0
+    pairKeys = set()
+    for frame in scene.frames:
+        if frame.hidden:
+            part.frames.append(frame)  # Never compiled in scenes, so it doesn't count towards limits
+            continue
+
+        chars = (scene._verifyFrameChar(frame.char), scene._verifyFrameChar(frame.pairChar))
+        pairKey = scene._pairKey(chars, *scene._orderFrameChars(chars), pairOffsetGrid)
+        newPair = pairKey is not None and pairKey not in pairKeys
+        if (frameLimit is not None and frameCount >= frameLimit) or (
+            newPair and pairLimit is not None and len(pairKeys) >= pairLimit
+        ):
+            part = _startPart(scene, state)
+            parts.append(part)
+            frameCount = 0
+            pairKeys = set()
+            if not dialogueBoxVisible and frame.options.dialogueBoxVisible is None:
+                frame = _hideDialogueBox(frame)
+
+        part.frames.append(frame)
+        frameCount += 1
+        if pairKey is not None:
+            pairKeys.add(pairKey)
+
+        modifiers = frame.options
+        for key in state:
+            value = getattr(modifiers, key)
+            if value is not None:
+                state[key] = value
+        if modifiers.dialogueBoxVisible is not None:
+            dialogueBoxVisible = modifiers.dialogueBoxVisible
+
+    return parts
+
+
+def _linkFrameIndex(group: Group, groupFrames: list, start: int, end: int) -> int:
+    # Last frame of the chunk that can carry a GoToFrame action: visible, without a case action of its own, and followed by a
+    # visible frame, as jumping to a frame plays it even if it's hidden
+    for index in range(end - 1, start - 1, -1):
+        frame = groupFrames[index]
+        if frame.caseAction is None and not frame.hidden and not groupFrames[index + 1].hidden:
+            return index
+    raise ObjectionError(
+        'Group "' + str(group.name) + '" can\'t be split, as none of its frames ' + str(start) + " to " + str(end - 1) + " can link to the next part"
+    )
+
+
+def splitCase(case: Case) -> list[Group]:
+    """
+    Split the normal and game over groups of a case that exceed MAX_GROUP_FRAMES frames, in place.
+
+    An oversized group keeps its first frames, and the rest are moved to new groups inserted right after it. The last frame of each part gets a GoToFrame action to the first frame of the next part, so the parts play as one. Parts end on a visible frame without a case action of its own, followed by a visible frame, so they may end a few frames before the limit. Frame references stay valid, as the frames themselves are moved.
+
+    Pairs are shared by the whole case, so splitting doesn't reduce them. Use `planPairs()` to find the frames using pairs past the limit.
+
+    Args:
+        - `case : Case`
+            - The case to split.
+
+    Raises:
+        - `ObjectionError`
+            - A cross-examination group exceeds the limit, as its statements can't be split.
+            - A part has no frame that can link to the next part.
+            - The case would exceed MAX_GROUPS groups.
+            Nothing is changed if an error is raised.
+
+    Returns:
+        List of the groups that were added.
+    """
+    frameLimit = case.options.MAX_GROUP_FRAMES
+    if frameLimit is None:
+        return []
+
+    splits = []
+    groupCount = len(case.groups)
+    for group in case.groups:
+        if len(group.frames) <= frameLimit:
+            continue
+        if isinstance(group, CEGroup):
+            raise ObjectionError('Cross-examination group "' + str(group.name) + '" exceeds the limit of ' + str(frameLimit) + " frames")
+
+        groupFrames = list(group.frames)
+        chunks = []
+        start = 0
+        while len(groupFrames) - start > frameLimit:
+            linkIndex = _linkFrameIndex(group, groupFrames, start, start + frameLimit)
+            chunks.append(groupFrames[start:linkIndex + 1])
+            start = linkIndex + 1
+        chunks.append(groupFrames[start:])
+        splits.append((group, chunks))
+        groupCount += len(chunks) - 1
+
+    groupLimit = case.options.MAX_GROUPS
+    if groupLimit is not None and groupCount > groupLimit:
+        raise ObjectionError("Splitting the case would exceed the limit of " + str(groupLimit) + " groups (at " + str(groupCount) + ")")
+
+    addedGroups = {}
+    for group, chunks in splits:
+        for chunk, nextChunk in zip(chunks, chunks[1:]):
+            chunk[-1].caseAction = frames.CaseActions.GoToFrame(nextChunk[0])
+        group.frames = chunks[0]
+        groupType = GameOverGroup if isinstance(group, GameOverGroup) else Group
+        addedGroups[id(group)] = [
+            groupType(name=group.name + " " + str(partNumber) if group.name else None, frames=chunk)
+            for partNumber, chunk in enumerate(chunks[1:], 2)
+        ]
+
+    groups = []
+    for group in case.groups:
+        groups.append(group)
+        groups += addedGroups.get(id(group), [])
+    case.groups[:] = groups
+    return [newGroup for newGroups in addedGroups.values() for newGroup in newGroups]
@@ -0,0 +1,362 @@
+"""
+Module for finding the parts of a compiled objection that can never be played, and removing them.
+
+The analysis runs on .objection dictionaries, in time linear in the number of frames and references between them. It's conservative: a frame only counts as unreachable if no combination of frame flow, jumps, prompts, cross-examination loops, game overs and frame toggles leads to it, whatever the variables and health are.
+"""
+
+from dataclasses import dataclass, field
+from json import dumps
+from typing import Optional
+from . import enums
+
+
+@dataclass
+class Reachability:
+    """
+    Result of a reachability analysis.
+
+    Attributes:
+        - `reachedFrames : set[int]`
+            - IIDs of the frames that can be played.
+        - `unreachableFrames : list[int]`
+            - IIDs of the frames that can never be played, in frame order.
+        - `unreachableGroups : list[int]`
+            - IIDs of the groups none of whose frames can be played, and that no reachable SetGameOverGroup action uses.
+        - `unusedRecordItems : list[str]`
+            - IIDs of the evidence and profiles that start hidden and are never shown, such as "e-1".
+    """
+    reachedFrames: set[int] = field(default_factory=set)
+    unreachableFrames: list[int] = field(default_factory=list)
+    unreachableGroups: list[int] = field(default_factory=list)
+    unusedRecordItems: list[str] = field(default_factory=list)
+
+
+@dataclass
+class PruneReport:
+    """
+    What pruning removed from an objection.
+
+    Attributes:
+        - `removedFrames : list[int]`
+            - IIDs of the removed frames.
+        - `removedGroups : list[str]`
+            - Names of the removed groups.
+        - `removedEvidence : list[str]`
+            - Names of the removed evidence.
+        - `removedProfiles : list[str]`
+            - Names of the removed profiles.
+        - `removedPairs : list[int]`
+            - Pair IDs of the removed pairs.
+        - `sizeBefore : int`
+            - Length of the objection's JSON before pruning.
+        - `sizeAfter : int`
+            - Length of the objection's JSON after pruning.
+    """
+    removedFrames: list[int] = field(default_factory=list)
+    removedGroups: list[str] = field(default_factory=list)
+    removedEvidence: list[str] = field(default_factory=list)
+    removedProfiles: list[str] = field(default_factory=list)
+    removedPairs: list[int] = field(default_factory=list)
+    sizeBefore: int = 0
+    sizeAfter: int = 0
+
+    @property
+    def savedBytes(self) -> int:
+        return self.sizeBefore - self.sizeAfter
+
+
+_jumpActions = frozenset((4, 8, 9, 14, 17))  # Actions that always leave the frame for another
+
+
+class _FrameGraph:
+    # Frames are indexed by their sequence, and flow along sequences, skipping hidden frames unless a reachable toggle shows them
+    def __init__(self, objectionDict: dict) -> None:
+        self.groups = objectionDict["groups"]
+        self.sequences: list[list[dict]] = []
+        self.sequenceEnds: list[Optional[tuple[int, int]]] = []  # Where flow continues after each sequence
+        self.groupStarts: dict[int, int] = {}  # Group IID -> sequence of its frames
+        self.locations: dict[int, tuple[int, int]] = {}  # Frame IID -> (sequence, index)
+        self.statements: dict[int, tuple[Optional[int], Optional[int]]] = {}  # Statement IID -> (press sequence, failure sequence)
+        self.initiallyHidden = set()
+
+        for groupDict in self.groups:
+            isCE = groupDict["type"] == enums.GroupType.CE.value
+            framesSequence = self._addSequence(groupDict["frames"])
+            self.groupStarts[groupDict["iid"]] = framesSequence
+            counselSequence = self._addSequence(groupDict.get("counselFrames", ()))
+            failureSequence = self._addSequence(groupDict.get("failureFrames", ()))
+            if isCE:
+                hasCounsel = bool(groupDict.get("counselFrames"))
+                self.sequenceEnds[framesSequence] = (counselSequence if hasCounsel else framesSequence, 0)
+                self.sequenceEnds[counselSequence] = (framesSequence, 0)
+            for i, frameDict in enumerate(groupDict["frames"]):
+                pressSequence = self._addSequence(frameDict.get("pressFrames", ()))
+                self.sequenceEnds[pressSequence] = (framesSequence, i + 1)
+                if isCE:
+                    self.statements[frameDict["iid"]] = (
+                        pressSequence if frameDict.get("pressFrames") else None,
+                        failureSequence if groupDict.get("failureFrames") else None,
+                    )
+
+    def _addSequence(self, sequence: list) -> int:
+        sequenceIndex = len(self.sequences)
+        self.sequences.append(sequence)
+        self.sequenceEnds.append(None)
+        for i, frameDict in enumerate(sequence):
+            self.locations[frameDict["iid"]] = (sequenceIndex, i)
+            if frameDict.get("hide"):
+                self.initiallyHidden.add(frameDict["iid"])
+        return sequenceIndex
+
+    def reach(self) -> set[int]:
+        reached = set()
+        passed = set()  # Hidden frames that flow skipped over, which become reached once shown
+        shown = set()
+        endedSequences = set()
+        stack = []
+        gameOverGroups = set()
+        canLoseHealth = False
+
+        def visit(iid):
+            if iid not in reached and iid in self.locations:
+                reached.add(iid)
+                stack.append(iid)
+
+        def arrive(sequenceIndex: int, index: int):
+            # Follows flow into a sequence position, skipping hidden frames like playback does
+            while True:
+                sequence = self.sequences[sequenceIndex]
+                if index >= len(sequence):
+                    if sequenceIndex in endedSequences:
+                        return
+                    endedSequences.add(sequenceIndex)
+                    if self.sequenceEnds[sequenceIndex] is None:
+                        return
+                    sequenceIndex, index = self.sequenceEnds[sequenceIndex]
+                    continue
+                iid = sequence[index]["iid"]
+                if iid not in self.initiallyHidden or iid in shown:
+                    visit(iid)
+                    return
+                if iid in passed:
+                    return
+                passed.add(iid)
+                index += 1
+
+        def reachGameOverGroups(groupIids):
+            for groupIid in groupIids:
+                if groupIid in self.groupStarts:
+                    arrive(self.groupStarts[groupIid], 0)
+
+        defaultGameOverGroup = next(
+            (groupDict["iid"] for groupDict in self.groups if groupDict["type"] == enums.GroupType.GAME_OVER.value), None
+        )
+        if defaultGameOverGroup is not None:
+            gameOverGroups.add(defaultGameOverGroup)
+        if self.groups:
+            arrive(self.groupStarts[self.groups[0]["iid"]], 0)
+        while stack:
+            iid = stack.pop()
+            sequenceIndex, index = self.locations[iid]
+            frameDict = self.sequences[sequenceIndex][index]
+            action = frameDict.get("caseAction")
+            actionId = action.get("id") if action else None
+            value = action.get("value") if action else None
+            if actionId == 5:
+                continue
+            if actionId == 3:
+                for shownIid in value["show"].split():
+                    shownIid = int(shownIid)
+                    shown.add(shownIid)
+                    if shownIid in passed:
+                        visit(shownIid)
+            elif actionId == 4:
+                visit(_frameId(value))
+            elif actionId == 14:
+                visit(_frameId(value["trueFid"]))
+                visit(_frameId(value["falseFid"]))
+            elif actionId == 9:
+                for choice in value:
+                    visit(_frameId(choice["fid"]))
+            elif actionId in (8, 17):
+                for target in value["items" if actionId == 8 else "areas"]:
+                    visit(_frameId(target["fid"]))
+                visit(_frameId(value["falseFid"]))
+            elif actionId == 15:
+                groupIid = _frameId(value)
+                if groupIid not in gameOverGroups:
+                    gameOverGroups.add(groupIid)
+                    if canLoseHealth:
+                        reachGameOverGroups((groupIid,))
+            elif actionId == 6 and value["type"] != 1 and not canLoseHealth:
+                canLoseHealth = True
+                reachGameOverGroups(gameOverGroups)
+            if actionId in _jumpActions:
+                continue
+
+            if iid in self.statements:
+                pressSequence, failureSequence = self.statements[iid]
+                if pressSequence is not None:
+                    arrive(pressSequence, 0)
+                if failureSequence is not None:
+                    arrive(failureSequence, 0)
+                for contradiction in frameDict.get("contradictions", ()):
+                    visit(_frameId(contradiction["fid"]))
+            arrive(sequenceIndex, index + 1)
+        return reached
+
+    def iterFrames(self):
+        for sequence in self.sequences:
+            yield from sequence
+
+
+def _frameId(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def analyze(objectionDict: dict) -> Reachability:
+    """
+    Find the frames, groups and court record items of an objection that can never be played or used.
+
+    Args:
+        - `objectionDict : dict`
+            - The compiled objection, as returned by `compile()`.
+
+    Returns:
+        The Reachability.
+    """
+    graph = _FrameGraph(objectionDict)
+    reached = graph.reach()
+
+    shownRecords = set()
+    gameOverTargets = set()
+    for frameDict in graph.iterFrames():
+        action = frameDict.get("caseAction")
+        if action and frameDict["iid"] in reached:
+            if action.get("id") == 16:
+                shownRecords.update(action["value"]["show"])
+            elif action.get("id") == 15:
+                gameOverTargets.add(_frameId(action["value"]))
+
+    courtRecord = objectionDict.get("courtRecord", {})
+    return Reachability(
+        reachedFrames=reached,
+        unreachableFrames=[frameDict["iid"] for frameDict in graph.iterFrames() if frameDict["iid"] not in reached],
+        unreachableGroups=[
+            groupDict["iid"]
+            for groupDict in graph.groups
+            if groupDict["iid"] not in gameOverTargets
+            and not any(frameDict["iid"] in reached for frameDict in _groupFrames(groupDict))
+        ],
+        unusedRecordItems=[
+            prefix + str(item["iid"])
+            for key, prefix in (("evidence", "e-"), ("profiles", "p-"))
+            for item in courtRecord.get(key, ())
+            if item.get("hide") and prefix + str(item["iid"]) not in shownRecords
+        ],
+    )
+
+
+def _groupFrames(groupDict: dict):
+    for key in "frames", "counselFrames", "failureFrames":
+        for frameDict in groupDict.get(key, ()):
+            yield frameDict
+            yield from frameDict.get("pressFrames", ())
+
+
+def prune(objectionDict: dict) -> PruneReport:
+    """
+    Remove the frames, groups and court record items of an objection that can never be played or used, and the pairs only they used.
+
+    References to removed frames and record items, such as in ToggleFrames actions, are removed along with them. Remaining IIDs aren't renumbered.
+
+    Args:
+        - `objectionDict : dict`
+            - The compiled objection, modified in place.
+
+    Returns:
+        A PruneReport of what was removed.
+    """
+    report = PruneReport(sizeBefore=len(dumps(objectionDict)))
+    reachability = analyze(objectionDict)
+    reached = reachability.reachedFrames
+
+    def keepFrame(frameDict: dict) -> bool:
+        # Statements stay if their press frames are jumped to directly
+        if frameDict["iid"] in reached or any(pressDict["iid"] in reached for pressDict in frameDict.get("pressFrames", ())):
+            return True
+        report.removedFrames.append(frameDict["iid"])
+        report.removedFrames.extend(pressDict["iid"] for pressDict in frameDict.get("pressFrames", ()))
+        return False
+
+    unreachableGroups = set(reachability.unreachableGroups)
+    keptGroups = []
+    for groupDict in objectionDict["groups"]:
+        if groupDict["iid"] in unreachableGroups:
+            report.removedGroups.append(groupDict["name"])
+            report.removedFrames.extend(frameDict["iid"] for frameDict in _groupFrames(groupDict))
+            continue
+        keptGroups.append(groupDict)
+        for key in "frames", "counselFrames", "failureFrames":
+            if key not in groupDict:
+                continue
+            groupDict[key] = [frameDict for frameDict in groupDict[key] if keepFrame(frameDict)]
+            if not groupDict[key] and key != "frames":
+                del groupDict[key]
+        for frameDict in groupDict["frames"]:
+            if "pressFrames" in frameDict:
+                frameDict["pressFrames"] = [pressDict for pressDict in frameDict["pressFrames"] if keepFrame(pressDict)]
+                if not frameDict["pressFrames"]:
+                    del frameDict["pressFrames"]
+    objectionDict["groups"] = keptGroups
+
+    courtRecord = objectionDict.get("courtRecord", {})
+    unusedRecordItems = set(reachability.unusedRecordItems)
+    for key, prefix, removedNames in ("evidence", "e-", report.removedEvidence), ("profiles", "p-", report.removedProfiles):
+        if key not in courtRecord:
+            continue
+        keptItems = []
+        for item in courtRecord[key]:
+            if prefix + str(item["iid"]) in unusedRecordItems:
+                removedNames.append(item["name"])
+            else:
+                keptItems.append(item)
+        courtRecord[key] = keptItems
+
+    removedFrames = set(report.removedFrames)
+    usedPairIds = set()
+    for groupDict in keptGroups:
+        for frameDict in _groupFrames(groupDict):
+            if frameDict.get("pairId") is not None:
+                usedPairIds.add(frameDict["pairId"])
+            if "contradictions" in frameDict:
+                frameDict["contradictions"] = [
+                    contradiction for contradiction in frameDict["contradictions"]
+                    if contradiction["eid"] not in unusedRecordItems
+                ]
+            action = frameDict.get("caseAction")
+            if not action:
+                continue
+            value = action.get("value")
+            if action.get("id") == 3:
+                for key in "show", "hide":
+                    value[key] = " ".join(iid for iid in value[key].split() if int(iid) not in removedFrames)
+            elif action.get("id") == 16:
+                for key in "show", "hide":
+                    value[key] = [iid for iid in value[key] if iid not in unusedRecordItems]
+            elif action.get("id") == 8:
+                value["items"] = [item for item in value["items"] if item["eid"] not in unusedRecordItems]
+
+    keptPairs = []
+    for pair in objectionDict.get("pairs", ()):
+        if pair["pairId"] in usedPairIds:
+            keptPairs.append(pair)
+        else:
+            report.removedPairs.append(pair["pairId"])
+    objectionDict["pairs"] = keptPairs
+
+    report.sizeAfter = len(dumps(objectionDict))
+    return report
@@ -0,0 +1,429 @@
+"""
+Module for playing through cases without a browser, driven by scripted inputs.
+
+The simulator runs on compiled .objection dictionaries, so it plays both in-memory and loaded cases exactly as they would be uploaded.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional, Union
+from . import enums, expressions
+from .objection import Case
+
+
+@dataclass
+class Press:
+    """Input pressing the current cross-examination statement."""
+
+
+@dataclass
+class Present:
+    """
+    Input presenting a court record item, to a PromptPresent action or a cross-examination statement.
+
+    Attributes:
+        - `item : str | Case.RecordItem`
+            - The item, or its name.
+    """
+    item: Union[str, Case.RecordItem]
+
+
+@dataclass
+class Playthrough:
+    """
+    The state of a simulated playthrough.
+
+    Attributes:
+        - `path : list[int]`
+            - The IIDs of the played frames, in order.
+        - `variables : dict[str, Any]`
+            - Case variables.
+        - `health : float`
+            - Fraction of the max health left, from 0 to 1.
+        - `flashingHealth : float`
+            - Fraction of the health last set to flash.
+        - `hiddenRecordItems : set[str]`
+            - IIDs of hidden evidence and profiles, such as "e-1".
+        - `endReason : Optional[str]`
+            - Why the playthrough stopped:
+                - `"end"` - an EndGame action was played.
+                - `"gameOver"` - the game over group finished, or the health ran out without one.
+                - `"endOfGroup"` - the last frame of a normal group was played.
+                - `"waitingForInput"` - a prompt or cross-examination statement was reached with no inputs left.
+                - `"maxSteps"` - the step limit was reached.
+    """
+    path: list[int] = field(default_factory=list)
+    variables: dict[str, Any] = field(default_factory=dict)
+    health: float = 1.0
+    flashingHealth: float = 0.0
+    hiddenRecordItems: set[str] = field(default_factory=set)
+    endReason: Optional[str] = None
+
+
+class SimulationError(Exception):
+    """Raised when a scripted input doesn't fit the prompt it was given to."""
+
+
+_FRAMES, _PRESS, _FAILURE, _COUNSEL = range(4)
+
+
+class CaseSimulator:
+    """
+    Plays through a case, using scripted inputs whenever the player would act.
+
+    The case is indexed once, so that each playthrough takes constant time per frame.
+
+    Inputs are consumed in order:
+        - PromptChoice - the index of the choice, or its text.
+        - PromptPresent - a Present input.
+        - PromptInt and PromptStr - the entered value.
+        - PromptCursor - a pointed (x, y) position.
+        - Cross-examination statements - a Press or Present input. Statements without either are continued from.
+
+    Args:
+        - `case : Case | dict`
+            - The case, or its compiled dictionary.
+    """
+
+    def __init__(self, case: Union[Case, dict]) -> None:
+        objectionDict = case.compile() if isinstance(case, Case) else case
+        self._groups = objectionDict["groups"]
+        self._locations: dict[int, tuple] = {}
+        self._initiallyHidden = set()
+        self._sequences: dict[tuple, list] = {}
+        for groupIndex, groupDict in enumerate(self._groups):
+            self._sequences[_FRAMES, groupIndex] = groupDict["frames"]
+            self._sequences[_COUNSEL, groupIndex] = groupDict.get("counselFrames", [])
+            self._sequences[_FAILURE, groupIndex] = groupDict.get("failureFrames", [])
+            for sequenceType, key in (_FRAMES, "frames"), (_COUNSEL, "counselFrames"), (_FAILURE, "failureFrames"):
+                for i, frameDict in enumerate(groupDict.get(key, ())):
+                    self._indexFrame(frameDict, (sequenceType, groupIndex), i)
+            for i, frameDict in enumerate(groupDict["frames"]):
+                pressFrames = frameDict.get("pressFrames")
+                if pressFrames:
+                    self._sequences[_PRESS, groupIndex, i] = pressFrames
+                    for j, pressDict in enumerate(pressFrames):
+                        self._indexFrame(pressDict, (_PRESS, groupIndex, i), j)
+
+        self._groupIndices = {groupDict["iid"]: i for i, groupDict in enumerate(self._groups)}
+        self._defaultGameOverGroup = next(
+            (i for i, groupDict in enumerate(self._groups) if groupDict["type"] == enums.GroupType.GAME_OVER.value),
+            None,
+        )
+        self._recordItems: dict[str, tuple[str, str]] = {}  # IID -> (name, prefix)
+        self._initiallyHiddenRecords = set()
+        courtRecord = objectionDict.get("courtRecord", {})
+        for key, prefix in ("evidence", "e-"), ("profiles", "p-"):
+            for item in courtRecord.get(key, ()):
+                iid = prefix + str(item["iid"])
+                self._recordItems[iid] = (item["name"], prefix)
+                if item.get("hide"):
+                    self._initiallyHiddenRecords.add(iid)
+
+    def _indexFrame(self, frameDict: dict, sequenceKey: tuple, index: int):
+        self._locations[frameDict["iid"]] = (sequenceKey, index)
+        if frameDict.get("hide"):
+            self._initiallyHidden.add(frameDict["iid"])
+
+    def run(self, inputs: Iterable = (), maxSteps: int = 100000) -> Playthrough:
+        """
+        Play through the case from its first frame.
+
+        Args:
+            - `inputs : Iterable`
+                - The scripted inputs.
+            - `maxSteps : int`
+                - The maximum number of frames to play, to stop endless loops.
+
+        Raises:
+            - `SimulationError`
+                - An input doesn't fit the prompt, or a frame references a missing frame.
+            - `ExpressionError`
+                - A VarEval expression is malformed.
+
+        Returns:
+            The Playthrough at the point where it stopped.
+        """
+        state = self._initialState()
+        playthrough = state.playthrough
+        inputs = iter(inputs)
+        pending = []  # Input peeked at a cross-examination statement
+        decision = self._play(state, maxSteps)
+        while True:
+            if decision is None:
+                return playthrough
+            userInput = pending.pop() if pending else next(inputs, _noInput)
+            if userInput is _noInput:
+                playthrough.endReason = "waitingForInput"
+                return playthrough
+            if decision.actionId is None and not isinstance(userInput, (Press, Present)):
+                # Only pressing and presenting lead out of a statement, so anything else is kept for later
+                pending.append(userInput)
+                userInput = None
+            decision = self._answer(state, decision, userInput) or self._play(state, maxSteps - len(playthrough.path))
+
+    def _initialState(self) -> "_State":
+        return _State(
+            Playthrough(hiddenRecordItems=set(self._initiallyHiddenRecords)),
+            set(self._initiallyHidden),
+            self._defaultGameOverGroup,
+        )
+
+    def _jump(self, fid, frameDict: dict) -> tuple:
+        try:
+            return (*self._locations[int(fid)], True)
+        except (KeyError, TypeError, ValueError):
+            raise SimulationError("Frame " + str(frameDict["iid"]) + " references missing frame " + repr(fid))
+
+    def _play(self, state: "_State", maxSteps: int) -> Optional["_Decision"]:
+        # Plays until the player has to act, returning what they're asked, or None once the playthrough ends
+        playthrough = state.playthrough
+        if not self._groups:
+            playthrough.endReason = "endOfGroup"
+            return None
+
+        path = playthrough.path
+        variables = playthrough.variables
+        hidden = state.hidden
+        sequences = self._sequences
+        sequenceKey, index, exact = state.sequenceKey, state.index, state.exact
+        steps = 0
+        while True:
+            sequence = sequences.get(sequenceKey, ())
+            if not exact:
+                while index < len(sequence) and sequence[index]["iid"] in hidden:
+                    index += 1
+            exact = False
+            if index >= len(sequence):
+                # Reached the end of a sequence
+                sequenceType, groupIndex = sequenceKey[0], sequenceKey[1]
+                groupType = self._groups[groupIndex]["type"]
+                if sequenceType == _PRESS:
+                    sequenceKey, index = (_FRAMES, groupIndex), sequenceKey[2] + 1
+                elif sequenceType == _FAILURE:
+                    sequenceKey, index = (_FRAMES, groupIndex), state.failedStatement
+                elif sequenceType == _COUNSEL:
+                    sequenceKey, index = (_FRAMES, groupIndex), 0
+                elif groupType == enums.GroupType.CE.value:
+                    sequenceKey, index = (_COUNSEL, groupIndex), 0
+                    if not sequences[sequenceKey]:
+                        sequenceKey = (_FRAMES, groupIndex)
+                    if not any(frameDict["iid"] not in hidden for frameDict in sequence):
+                        playthrough.endReason = "endOfGroup"  # Nothing left to loop over
+                        return None
+                elif groupType == enums.GroupType.GAME_OVER.value:
+                    playthrough.endReason = "gameOver"
+                    return None
+                else:
+                    playthrough.endReason = "endOfGroup"
+                    return None
+                continue
+
+            if steps >= maxSteps:
+                playthrough.endReason = "maxSteps"
+                state.sequenceKey, state.index, state.exact = sequenceKey, index, True
+                return None
+            steps += 1
+            frameDict = sequence[index]
+            path.append(frameDict["iid"])
+
+            target = None
+            action = frameDict.get("caseAction")
+            if action:
+                actionId = action.get("id")
+                value = action.get("value")
+                if actionId == 3:
+                    hidden.difference_update(int(iid) for iid in value["show"].split())
+                    hidden.update(int(iid) for iid in value["hide"].split())
+                elif actionId == 16:
+                    playthrough.hiddenRecordItems.difference_update(value["show"])
+                    playthrough.hiddenRecordItems.update(value["hide"])
+                elif actionId == 4:
+                    target = self._jump(value, frameDict)
+                elif actionId == 15:
+                    state.gameOverGroup = self._groupIndices.get(int(value))
+                elif actionId == 5:
+                    playthrough.endReason = "end"
+                    return None
+                elif actionId == 6:
+                    amount = float(value["amount"]) / 100
+                    if value["type"] == 0:
+                        playthrough.health = amount
+                    elif value["type"] == 1:
+                        playthrough.health = min(playthrough.health + amount, 1.0)
+                    else:
+                        playthrough.health = max(playthrough.health - amount, 0.0)
+                    if playthrough.health <= 0:
+                        if state.gameOverGroup is None:
+                            playthrough.endReason = "gameOver"
+                            return None
+                        target = ((_FRAMES, state.gameOverGroup), 0, False)
+                elif actionId == 7:
+                    playthrough.flashingHealth = int(value) / 100
+                elif actionId == 10:
+                    variables[value["name"]] = value["value"]
+                elif actionId == 11:
+                    variables[value["name"]] = expressions._number(variables.get(value["name"], 0)) + expressions._number(value["value"])
+                elif actionId == 14:
+                    result = expressions.compileExpression(value["expression"]).evaluate(variables)
+                    target = self._jump(value["trueFid"] if result else value["falseFid"], frameDict)
+                elif actionId in (8, 9, 12, 17):
+                    state.sequenceKey, state.index = sequenceKey, index
+                    return _Decision(frameDict, actionId, value)
+
+            if target is None and sequenceKey[0] == _FRAMES and self._groups[sequenceKey[1]]["type"] == enums.GroupType.CE.value:
+                state.sequenceKey, state.index = sequenceKey, index
+                return _Decision(frameDict, None, None)
+
+            if target is not None:
+                sequenceKey, index, exact = target
+            else:
+                index += 1
+
+    def _answer(self, state: "_State", decision: "_Decision", userInput) -> Optional["_Decision"]:
+        # Moves past a decision returned by _play. A None input continues from a cross-examination statement.
+        # Returns the statement decision that follows a prompt on a statement, if any.
+        frameDict = decision.frame
+        sequenceKey, index = state.sequenceKey, state.index
+        target = None
+        if decision.actionId is not None:
+            target = self._answerPrompt(state.playthrough, decision.actionId, decision.value, userInput, frameDict)
+            if target is None and sequenceKey[0] == _FRAMES and self._groups[sequenceKey[1]]["type"] == enums.GroupType.CE.value:
+                # A statement with a prompt still waits to be pressed or presented to
+                return _Decision(frameDict, None, None)
+        elif isinstance(userInput, Press):
+            if (_PRESS, sequenceKey[1], index) in self._sequences:
+                target = ((_PRESS, sequenceKey[1], index), 0, False)
+        elif isinstance(userInput, Present):
+            iid = self._recordIid(state.playthrough, userInput)
+            for contradiction in frameDict.get("contradictions", ()):
+                if contradiction["eid"] == iid:
+                    target = self._jump(contradiction["fid"], frameDict)
+                    break
+            else:
+                state.failedStatement = index
+                target = ((_FAILURE, sequenceKey[1]), 0, False)
+
+        if target is not None:
+            state.sequenceKey, state.index, state.exact = target
+        else:
+            state.index, state.exact = index + 1, False
+        return None
+
+    def _recordIid(self, playthrough: Playthrough, userInput: Present) -> str:
+        item = userInput.item
+        if isinstance(item, Case.RecordItem):
+            name = item.name
+            prefix = "e-" if item.type is enums.RecordType.EVIDENCE else "p-"
+        else:
+            name, prefix = item, None
+        for iid, (itemName, itemPrefix) in self._recordItems.items():
+            if itemName == name and prefix in (None, itemPrefix) and iid not in playthrough.hiddenRecordItems:
+                return iid
+        raise SimulationError('No court record item "' + name + '" to present')
+
+    def _answerPrompt(self, playthrough: Playthrough, actionId: int, value, userInput, frameDict: dict) -> Optional[tuple]:
+        if actionId == 9:
+            if isinstance(userInput, int) and not isinstance(userInput, bool):
+                if not 0 <= userInput < len(value):
+                    raise SimulationError("Choice " + str(userInput) + " out of range")
+                return self._jump(value[userInput]["fid"], frameDict)
+            for choice in value:
+                if choice["text"] == userInput:
+                    return self._jump(choice["fid"], frameDict)
+            raise SimulationError("No choice " + repr(userInput))
+
+        if actionId == 8:
+            if not isinstance(userInput, Present):
+                raise SimulationError("Expected a Present input, got " + repr(userInput))
+            iid = self._recordIid(playthrough, userInput)
+            allowed = "e-" if value["evidence"] else ""
+            if value["profiles"]:
+                allowed += "p-"
+            if iid[:2] not in allowed:
+                raise SimulationError(repr(userInput.item) + " can't be presented to this prompt")
+            for item in value["items"]:
+                if item["eid"] == iid:
+                    return self._jump(item["fid"], frameDict)
+            return self._jump(value["falseFid"], frameDict)
+
+        if actionId == 12:
+            if value["type"] == "int":
+                try:
+                    playthrough.variables[value["name"]] = int(userInput)
+                except (TypeError, ValueError):
+                    raise SimulationError("Expected an integer, got " + repr(userInput))
+            else:
+                text = str(userInput)
+                if value["type"] == "word" and any(char.isspace() for char in text):
+                    raise SimulationError("Expected a single word, got " + repr(userInput))
+                playthrough.variables[value["name"]] = text.lower() if value.get("lowercase") else text
+            return None
+
+        # PromptCursor
+        try:
+            x, y = userInput
+        except (TypeError, ValueError):
+            raise SimulationError("Expected an (x, y) position, got " + repr(userInput))
+        for area in value["areas"]:
+            shape = area["shape"]
+            if shape["left"] <= x < shape["left"] + shape["width"] and shape["top"] <= y < shape["top"] + shape["height"]:
+                return self._jump(area["fid"], frameDict)
+        return self._jump(value["falseFid"], frameDict)
+
+
+class _State:
+    # Position and progress of a playthrough between decisions, copyable to branch off alternatives
+    __slots__ = ("playthrough", "hidden", "gameOverGroup", "failedStatement", "sequenceKey", "index", "exact")
+
+    def __init__(self, playthrough: Playthrough, hidden: set, gameOverGroup: Optional[int]) -> None:
+        self.playthrough = playthrough
+        self.hidden = hidden
+        self.gameOverGroup = gameOverGroup
+        self.failedStatement = 0
+        self.sequenceKey = (_FRAMES, 0)
+        self.index = 0
+        self.exact = False  # Whether the frame was jumped to directly, in which case it plays even if hidden
+
+    def copy(self) -> "_State":
+        playthrough = self.playthrough
+        state = _State(
+            Playthrough(
+                [], dict(playthrough.variables), playthrough.health, playthrough.flashingHealth, set(playthrough.hiddenRecordItems)
+            ),
+            set(self.hidden),
+            self.gameOverGroup,
+        )
+        state.failedStatement = self.failedStatement
+        state.sequenceKey, state.index, state.exact = self.sequenceKey, self.index, self.exact
+        return state
+
+
+class _Decision:
+    # A prompt, or a cross-examination statement if actionId is None
+    __slots__ = ("frame", "actionId", "value")
+
+    def __init__(self, frame: dict, actionId: Optional[int], value) -> None:
+        self.frame = frame
+        self.actionId = actionId
+        self.value = value
+
+
+_noInput = object()
+
+
+def simulate(case: Union[Case, dict], inputs: Iterable = (), maxSteps: int = 100000) -> Playthrough:
+    """
+    Play through a case once. To replay a case many times, create a CaseSimulator instead.
+
+    Args:
+        - `case : Case | dict`
+            - The case, or its compiled dictionary.
+        - `inputs : Iterable`
+            - The scripted inputs. See CaseSimulator.
+        - `maxSteps : int`
+            - The maximum number of frames to play.
+
+    Returns:
+        The Playthrough at the point where it stopped.
+    """
+    return CaseSimulator(case).run(inputs, maxSteps)
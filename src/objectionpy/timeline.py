@@ -0,0 +1,164 @@
+"""
+Module for estimating when each frame of a scene plays, without playing it.
+
+Timings are in milliseconds and account for pose animations, text speed, `[#ts]` and `[#p]` tags, autoplay and frames continuing with goNext or merge. Speech bubbles, fades and transitions aren't accounted for.
+"""
+
+from dataclasses import dataclass
+from functools import cache
+from itertools import accumulate
+from typing import Optional
+from . import assets, enums, frames, markup, preset
+from .objection import Scene, _ObjectionBase, _Frame
+
+
+@dataclass
+class FrameTiming:
+    """
+    Playback timing of a frame.
+
+    Attributes:
+        - `frame : _Frame`
+            - The frame.
+        - `start : int`
+            - When the frame starts.
+        - `textStart : int`
+            - When the text starts being typed out, after the pose animation.
+        - `textEnd : int`
+            - When the text is fully typed out.
+        - `end : int`
+            - When the next frame starts.
+    """
+    frame: _Frame
+    start: int
+    textStart: int
+    textEnd: int
+    end: int
+
+    @property
+    def duration(self) -> int:
+        return self.end - self.start
+
+
+@cache
+def _presetPoses() -> dict[int, dict]:
+    return {
+        pose['id']: pose
+        for presetChar in preset.collectionValues(preset.Characters)
+        for pose in presetChar.poses
+    }
+
+
+def _findPose(char: frames.FrameCharacter) -> Optional[dict]:
+    if char.isNone:
+        return None
+    if char.character.isPreset:
+        return _presetPoses().get(char.poseId)
+    for pose in char.character.poses:
+        if pose['id'] == char.poseId:
+            return pose
+    return None
+
+
+def poseDelays(pose: dict) -> tuple[int, int]:
+    """
+    Get the timing of a pose's animation.
+
+    Args:
+        - `pose : dict`
+            - Pose data, as in `Character.poses`.
+
+    Returns:
+        The delay before the character can start speaking, and the length of the whole animation.
+    """
+    speakDelay = None
+    elapsed = 0
+    for state in pose.get('states', ()):
+        if speakDelay is None and state.get('speakDelay') is not None:
+            speakDelay = elapsed + state['speakDelay']
+        elapsed += state.get('nextPoseDelay') or 0
+    return (speakDelay if speakDelay is not None else elapsed), elapsed
+
+
+def textDuration(text: str, textSpeed: int) -> int:
+    """
+    Get how long a text takes to be typed out.
+
+    Args:
+        - `text : str`
+            - The text, including markup tags.
+        - `textSpeed : int`
+            - Delay between each character, until changed by a `[#ts]` tag.
+
+    Returns:
+        The duration in milliseconds.
+    """
+    if '[' not in text:
+        return len(text) * textSpeed
+    duration = 0
+    position = 0
+    for match in markup._tagPattern.finditer(text):
+        duration += (match.start() - position) * textSpeed
+        position = match.end()
+        parsed = markup._parseTagSource(match[0])
+        if type(parsed) is str:  # Invalid tags are displayed as text
+            duration += (match.end() - match.start()) * textSpeed
+        elif parsed[0] is enums.TextCommand.TEXT_SPEED:
+            textSpeed = parsed[1]
+        elif parsed[0] is enums.TextCommand.PAUSE:
+            duration += parsed[1]
+    return duration + (len(text) - position) * textSpeed
+
+
+def sceneTimeline(scene: Scene) -> list[FrameTiming]:
+    """
+    Compute the playback timing of every frame of a scene, in a single pass.
+
+    Hidden frames are skipped. Text speed and autoplay speed changes of frame OptionModifiers apply from their frame onwards. The poses of custom characters are requested beforehand, all at once.
+
+    Args:
+        - `scene : Scene`
+            - The scene to time.
+
+    Returns:
+        List of FrameTiming objects, in playback order.
+    """
+    textSpeed = scene.options.defaultTextSpeed
+    autoplaySpeed = scene.options.autoplaySpeed
+    playedFrames = [frame for frame in scene.frames if not frame.hidden]
+    activeChars = [
+        _ObjectionBase._orderFrameChars(
+            (_ObjectionBase._verifyFrameChar(frame.char), _ObjectionBase._verifyFrameChar(frame.pairChar))
+        )[0]
+        if frame.poseAnim
+        else None
+        for frame in playedFrames
+    ]
+    assets.prefetch(
+        char.character for char in activeChars if char is not None and not char.isNone and not char.character.isPreset
+    )
+
+    offsets = []  # (text start, text end, end) relative to the frame start
+    for frame, activeChar in zip(playedFrames, activeChars):
+        if frame.options.defaultTextSpeed is not None:
+            textSpeed = frame.options.defaultTextSpeed
+        if frame.options.autoplaySpeed is not None:
+            autoplaySpeed = frame.options.autoplaySpeed
+
+        speakDelay = animationLength = 0
+        if activeChar is not None:
+            pose = _findPose(activeChar)
+            if pose is not None:
+                speakDelay, animationLength = poseDelays(pose)
+
+        textEnd = speakDelay + textDuration(frame.text, textSpeed)
+        end = max(textEnd, animationLength)
+        if not (frame.goNext or frame.merge):
+            end += autoplaySpeed
+        offsets.append((speakDelay, textEnd, end))
+
+    starts = accumulate((end for _, _, end in offsets), initial=0)
+    return [
+        FrameTiming(frame, start, start + textStart, start + textEnd, start + end)
+        for frame, start, (textStart, textEnd, end) in zip(playedFrames, starts, offsets)
+    ]
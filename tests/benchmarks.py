@@ -0,0 +1,183 @@
+"""Rough timings of objection compilation and loading. Doesn't require network access."""
+
+from time import perf_counter
+from objectionpy import preset, markup, timeline, simulator, explorer, lint, builder, enums
+from objectionpy import objection as objectionModule
+from objectionpy.objection import *
+from objectionpy.frames import *
+
+
+def timeit(function, repeat: int = 5) -> float:
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        elapsed = perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def report(name: str, seconds: float, count: int):
+    print(f'{name:<40} {seconds * 1000:>9.2f} ms   {seconds / count * 1e6:>8.2f} us/item ({count} items)')
+
+
+def caseActionBenchmark(frameCount: int = 2000):
+    thonk = FrameCharacter(
+        character=preset.Characters.Defense.PhoenixWright,
+        poseSubstr='think',
+    )
+    case = Case(Options(MAX_GROUP_FRAMES=None))
+    group = Group(case, 'Main')
+    for i in range(frameCount):
+        if i % 2 == 0:
+            action = CaseActions.PromptChoice(choices=[
+                ('Left', 'frame-' + str((i + 1) % frameCount)),
+                ('Right', 'frame-' + str((i + 2) % frameCount)),
+                ('Back', 'frame-' + str((i - 1) % frameCount)),
+            ])
+        else:
+            action = CaseActions.VarEval(
+                expression='x > ' + str(i),
+                trueFrame='frame-' + str((i + 1) % frameCount),
+                falseFrame='frame-' + str((i + 3) % frameCount),
+            )
+        group.frames.append(Frame(
+            char=thonk,
+            text='Frame ' + str(i),
+            caseTag='frame-' + str(i),
+            caseAction=action,
+        ))
+
+    objectionDict = case.compile()
+    report('Case.compile (PromptChoice/VarEval)', timeit(case.compile), frameCount)
+    report('loadJSONDict (PromptChoice/VarEval)', timeit(lambda: loadJSONDict(objectionDict)), frameCount)
+
+    context = objectionModule._LoadContext(frameIIDs={
+        frameDict['iid']: frame for frame, frameDict in case._frameMap
+    })
+    for actionType in (CaseActions.PromptChoice, CaseActions.VarEval):
+        actions = [frame.caseAction for frame in group.frames if type(frame.caseAction) is actionType]
+        actionId, encoder = objectionModule._caseActionEncoders[actionType]
+        decoder = objectionModule._caseActionDecoders[actionId]
+        values = [encoder(case, action) for action in actions]
+        report(
+            'encode ' + actionType.__name__,
+            timeit(lambda: [encoder(case, action) for action in actions]),
+            len(actions),
+        )
+        report(
+            'decode ' + actionType.__name__,
+            timeit(lambda: [decoder(context, value, {}) for value in values]),
+            len(values),
+        )
+
+
+def pairBenchmark(pairCount: int = 300, frameCount: int = 3000):
+    phoenix = preset.Characters.Defense.PhoenixWright
+    edgeworth = preset.Characters.Prosecution.MilesEdgeworth
+    scene = Scene(Options(MAX_GROUP_FRAMES=None, MAX_PAIRS=None))
+    pairChars = [
+        (
+            FrameCharacter(character=phoenix, poseSubstr='think', pairOffset=(i, 0), isActive=True),
+            FrameCharacter(character=edgeworth, poseSubstr='crossed', pairOffset=(-i, 0)),
+        )
+        for i in range(pairCount)
+    ]
+    for i in range(frameCount):
+        char, pairChar = pairChars[i % pairCount]
+        scene.frames.append(Frame(
+            char=char,
+            pairChar=pairChar,
+            text='Frame ' + str(i),
+        ))
+
+    objectionDict = scene.compile()
+    report(
+        f'loadJSONDict ({len(objectionDict["pairs"])} pairs)',
+        timeit(lambda: loadJSONDict(objectionDict)),
+        frameCount,
+    )
+
+
+def markupBenchmark(frameCount: int = 10000):
+    phoenix = FrameCharacter(character=preset.Characters.Defense.PhoenixWright, poseSubstr='think')
+    scene = Scene(Options(MAX_GROUP_FRAMES=None))
+    for i in range(frameCount):
+        scene.frames.append(Frame(
+            char=phoenix,
+            text='Line ' + str(i) + ' [#ts' + str(i % 90) + ']hold it[#p300][#fm] [#/r]red[/#]' + (' [#ts]' if i % 100 == 0 else ''),
+        ))
+
+    report('invalidMarkup', timeit(scene.invalidMarkup), frameCount)
+    texts = [frame.text for frame in scene.frames]
+
+    def tokenizeUncached():
+        markup.tokenize.cache_clear()
+        for text in texts:
+            markup.tokenize(text)
+    report('markup.tokenize (uncached)', timeit(tokenizeUncached), frameCount)
+    report('timeline.sceneTimeline', timeit(lambda: timeline.sceneTimeline(scene)), frameCount)
+    report('lint.lint (all rules)', timeit(lambda: lint.lint(scene)), frameCount)
+
+
+def simulatorBenchmark(loopCount: int = 1000):
+    thonk = FrameCharacter(character=preset.Characters.Defense.PhoenixWright, poseSubstr='think')
+    case = Case()
+    group = Group(case, 'Main')
+    group.frames.append(Frame(char=thonk, text='Loop', caseTag='loop', caseAction=CaseActions.VarAdd('x', 1)))
+    group.frames.append(Frame(char=thonk, text='Choose', caseAction=CaseActions.PromptChoice(choices=[
+        ('Continue', 'check'),
+        ('Quit', 'end'),
+    ])))
+    group.frames.append(Frame(char=thonk, text='Check', caseTag='check', caseAction=CaseActions.VarEval(
+        expression='x < ' + str(loopCount),
+        trueFrame='loop',
+        falseFrame='end',
+    )))
+    group.frames.append(Frame(char=thonk, text='End', caseTag='end', caseAction=CaseActions.EndGame()))
+
+    caseSimulator = simulator.CaseSimulator(case)
+    inputs = [0] * loopCount
+    steps = len(caseSimulator.run(inputs).path)
+    report('CaseSimulator.run', timeit(lambda: caseSimulator.run(inputs)), steps)
+
+    objectionDict = case.compile()
+    states = explorer.explore(objectionDict).stateCount
+    report('explorer.explore', timeit(lambda: explorer.explore(objectionDict)), states)
+
+
+def builderBenchmark(frameCount: int = 2000):
+    speakers = (preset.Characters.Defense.PhoenixWright, preset.Characters.Prosecution.MilesEdgeworth)
+    sceneBuilder = builder.SceneBuilder(Options(MAX_GROUP_FRAMES=None))
+    sceneBuilder.addRows(
+        (speakers[i % 2], 'think' if i % 2 == 0 else 'crossed', 'Line ' + str(i), enums.FrameFlag.FLIP if i % 3 == 0 else enums.FrameFlag.NONE)
+        for i in range(frameCount)
+    )
+    scene = sceneBuilder.toScene()
+    assert sceneBuilder.compile() == scene.compile()
+    report('SceneBuilder.compile', timeit(sceneBuilder.compile), frameCount)
+    report('Scene.compile (same frames)', timeit(scene.compile), frameCount)
+
+
+def streamingBenchmark(frameCount: int = 20000):
+    thonk = FrameCharacter(character=preset.Characters.Defense.PhoenixWright, poseSubstr='think')
+
+    class NullFile:
+        def write(self, data):
+            pass
+
+    def dump():
+        scene = Scene(Options(MAX_GROUP_FRAMES=None))
+        scene.frames = (Frame(char=thonk, text='Line ' + str(i)) for i in range(frameCount))
+        scene.dumpStreaming(NullFile())
+    report('Scene.dumpStreaming (generator)', timeit(dump, repeat=1), frameCount)
+
+
+if __name__ == '__main__':
+    caseActionBenchmark()
+    pairBenchmark()
+    markupBenchmark()
+    simulatorBenchmark()
+    builderBenchmark()
+    streamingBenchmark()
@@ -1,4 +1,4 @@
-from objectionpy import preset, enums, assets
+from objectionpy import preset, enums, assets, reachability
 from objectionpy.objection import *
 from objectionpy.frames import *
 
@@ -380,3 +380,15 @@ goGroupReal.frames.append(Frame(
 
 with open('./cases.objection', 'w') as f:
     f.write(case.makeObjectionFile(case.compile()))
+
+# A lazily loaded case compiles like a fully loaded one, including references to frames that were never decoded
+with open('./cases.objection') as f:
+    objectionFile = f.read()
+assert loadB64(objectionFile, lazy=True).compile(offline=True) == loadB64(objectionFile).compile(offline=True)
+
+# Pruning removes exactly the frames reachability analysis finds unreachable, and leaves a case that still loads
+loadedCase = loadB64(objectionFile)
+unreachableFrames = reachability.analyze(loadedCase.compile(offline=True)).unreachableFrames
+prunedDict = loadedCase.compile(offline=True, pruneUnreachable=True)
+assert unreachableFrames and sorted(loadedCase.lastPruneReport.removedFrames) == sorted(unreachableFrames)
+assert isinstance(loadJSONDict(prunedDict), Case)